@@ -1,21 +1,57 @@
-import re
-import subprocess
-
-from . import duration
-from . import fileio
-from . import files
-from . import memory
-from . import ps
-from . import rich
-from . import sacct
-from . import scripts
-from . import sinfo
-from . import squeue
-from . import table
+import importlib
+
 from ._version import version
 from ._version import version_tuple
-from .cli_Gstat import main as Gstat
-from .cli_Gsub import main as Gsub
+
+# submodules (and functions) are imported on first use, to keep the command-line tools fast
+_submodules = [
+    "aggregate",
+    "completion",
+    "duration",
+    "export",
+    "fileio",
+    "files",
+    "filters",
+    "health",
+    "journal",
+    "memory",
+    "monitor",
+    "output",
+    "ps",
+    "retry",
+    "rich",
+    "sacct",
+    "scripts",
+    "sinfo",
+    "sort",
+    "squeue",
+    "stale",
+    "status",
+    "submit",
+    "table",
+    "workflow",
+]
+
+_functions = {
+    "Gstat": "cli_Gstat.main",
+    "Gsub": "cli_Gsub.main",
+    "wait": "monitor.wait",
+}
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+
+    if name in _functions:
+        module, function = _functions[name].split(".")
+        return getattr(importlib.import_module(f".{module}", __name__), function)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + _submodules + list(_functions))
 
 
 def sbatch(options, verbose=False, dry_run=False):
@@ -23,6 +59,9 @@ def sbatch(options, verbose=False, dry_run=False):
     Submit job and return the job-id.
     """
 
+    import re
+    import subprocess
+
     assert isinstance(options, list)
 
     if dry_run or verbose:
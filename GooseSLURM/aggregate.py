@@ -0,0 +1,125 @@
+r"""
+Group lines of a table by (a combination of) columns, and aggregate the other columns per group.
+All lines are distributed over the groups in a single pass (using a hash table),
+after which each column is aggregated per group using one of the following functions:
+
+*   ``"sum"``: sum of the numeric values (non-numeric values are ignored).
+*   ``"mean"``: mean of the numeric values (``None`` if there are no numeric values).
+*   ``"count"``: number of lines.
+*   ``"distinct"``: comma-separated, sorted, list of the distinct values.
+
+Alternatively a function can be specified that takes the list of values of the group.
+"""
+
+from collections import defaultdict
+
+from . import rich
+
+
+def _number(value):
+    r"""
+    Numeric value of a cell, ``None`` if the cell is not numeric.
+    """
+
+    if isinstance(value, rich.String):
+        return value.data if value.isnumeric() else None
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+
+    return None
+
+
+def _sum(values):
+    return sum(value for value in values if value is not None)
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+
+    if len(values) == 0:
+        return None
+
+    return sum(values) / len(values)
+
+
+def _count(values):
+    return len(values)
+
+
+def _distinct(values):
+    return ",".join(sorted({str(value) for value in values}))
+
+
+functions = {
+    "sum": _sum,
+    "mean": _mean,
+    "count": _count,
+    "distinct": _distinct,
+}
+
+_numeric = [_sum, _mean]
+
+
+def groups(lines, keys):
+    r"""
+    Group lines.
+
+    :param lines:
+        List of lines, with each line stored as a dictionary.
+        For example: ``[ {'USER': 'foo', ...}, ...]``.
+
+    :param keys: List of keys to group by, e.g. ``['USER', 'PARTITION']``.
+
+    :return:
+        Dictionary with the indices of the lines of each group, in the order of first appearance.
+        The group is identified by the (unformatted) value of each key.
+        For example: ``{('foo', 'gpu'): [0, 3], ...}``.
+    """
+
+    if len(keys) == 0:
+        return {(): list(range(len(lines)))} if len(lines) > 0 else {}
+
+    ret = defaultdict(list)
+    columns = [[str(line[key]) for line in lines] for key in keys]
+
+    for i, group in enumerate(zip(*columns)):
+        ret[group].append(i)
+
+    return dict(ret)
+
+
+def groupby(lines, keys, aggregate):
+    r"""
+    Group lines and aggregate columns per group.
+
+    :param lines:
+        List of lines, with each line stored as a dictionary.
+        For example: ``[ {'USER': 'foo', 'CPUS': 4, ...}, ...]``.
+
+    :param keys: List of keys to group by, e.g. ``['USER', 'PARTITION']``.
+
+    :param aggregate:
+        Function to apply to each column, e.g. ``{'CPUS': 'sum', 'ACCOUNT': 'distinct'}``.
+        See ``GooseSLURM.aggregate.functions``, or specify a function that acts on a list.
+
+    :return:
+        List with one line per group, in the order of first appearance.
+        The keys are stored as (unformatted) strings, the aggregated columns as raw values.
+        For example: ``[ {'USER': 'foo', 'PARTITION': 'gpu', 'CPUS': 8, 'ACCOUNT': 'bar'}, ...]``.
+    """
+
+    index = groups(lines, keys)
+    ret = [dict(zip(keys, group)) for group in index]
+
+    for key, func in aggregate.items():
+        func = functions.get(func, func)
+        values = [line[key] for line in lines]
+
+        if func in _numeric:
+            values = list(map(_number, values))
+
+        for line, idx in zip(ret, index.values()):
+            line[key] = func([values[i] for i in idx])
+
+    return ret
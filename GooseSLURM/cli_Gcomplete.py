@@ -0,0 +1,88 @@
+r"""Gcomplete
+    Shell completion of job-ids, users, partitions, accounts, and nodes
+    for ``Gstat``, ``Gdel``, ``Ginfo``, ``Gps``, and ``Gacct``.
+
+    To enable add to your ``~/.bashrc``::
+
+        eval "$(Gcomplete --shell bash)"
+
+    or to your ``~/.zshrc``::
+
+        eval "$(Gcomplete --shell zsh)"
+
+    Completions are answered from an index that is updated by every ``squeue`` and ``sinfo`` read
+    (e.g. by ``Gstat`` or ``Ginfo``), such that no call to Slurm is needed.
+    If the index is older than ``--ttl`` seconds, it is refreshed in the background.
+    Only the job-ids of the current user are completed.
+
+Usage:
+    Gcomplete [options] <kind> [<prefix>]
+    Gcomplete --shell=<NAME>
+    Gcomplete --refresh
+
+Arguments:
+    Kind of completion: "jobid", "user", "partition", "account", or "node".
+    Prefix to complete. [default: ""]
+
+Options:
+    --shell=<NAME>
+        Print the completion script for "bash" or "zsh".
+
+    --refresh
+        Refresh the index (calls ``squeue`` and ``sinfo``).
+
+    --ttl=<SECONDS>
+        Refresh the index (in the background) if it is older than this. [default: 30]
+
+    -h, --help
+        Show help.
+
+    --version
+        Show version.
+
+(c - MIT) T.W.J. de Geus | tom@geus.me | www.geus.me | github.com/tdegeus/GooseSLURM
+"""
+
+import argparse
+import sys
+
+from . import completion
+from . import version
+
+
+def main():
+    # -- parse command line arguments --
+
+    class Parser(argparse.ArgumentParser):
+        def print_help(self):
+            print(__doc__)
+
+    parser = Parser()
+    parser.add_argument("--shell", type=str, choices=["bash", "zsh"])
+    parser.add_argument("--refresh", action="store_true")
+    parser.add_argument("--ttl", type=float, default=completion.ttl)
+    parser.add_argument("--version", action="version", version=version)
+    parser.add_argument("kind", type=str, nargs="?", choices=completion.kinds)
+    parser.add_argument("prefix", type=str, nargs="?", default="")
+    args = vars(parser.parse_args())
+
+    # -- print completion script --
+
+    if args["shell"]:
+        print(completion.script(args["shell"]), end="")
+        return 0
+
+    # -- refresh index --
+
+    if args["refresh"]:
+        completion.refresh()
+        return 0
+
+    if args["kind"] is None:
+        parser.error("Specify the kind of completion")
+
+    # -- print completions --
+
+    ret = completion.complete(args["kind"], args["prefix"], ttl=args["ttl"])
+    sys.stdout.write("".join(value + "\n" for value in ret))
+    return 0
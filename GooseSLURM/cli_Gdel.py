@@ -25,8 +25,6 @@ Options:
 import subprocess
 import sys
 
-import click
-
 from .cli_Gstat import Gstat
 
 
@@ -50,6 +48,8 @@ def main():
 
     gstat.print()
 
+    import click
+
     if not click.confirm("Delete above listed jobs?"):
         return 1
 
@@ -30,9 +30,9 @@ Options:
         Limit output to host(s).
         Option may be repeated. Search by regex.
 
-    -f, --cfree=<NAME>
+    -c, --cfree=<NAME>
         Limit output to free CPU(s).
-        Option may be repeated. Search by regex.
+        Option may be repeated. Search by regex or by comparison (e.g. ">=4").
 
     -p, --partition=<NAME>
         Limit output to partition(s).
@@ -50,7 +50,11 @@ Options:
         Option may be repeated. Use header names.
 
     -S, --summary
-        Print only summary.
+        Print only summary (per partition).
+
+    --summary-by=<NAME>
+        Print only summary, per (combination of) column(s), e.g. "Partition,State".
+        Option may be repeated. Use header names.
 
     --no-header
         Suppress header.
@@ -64,6 +68,12 @@ Options:
     --colors=<NAME>
         Select color scheme from: "none", "dark". [default: "dark"]
 
+    --format=<NAME>
+        Print in format: "csv", "tsv", "json", "ndjson" (raw values, e.g. seconds and bytes),
+        or "plain" (human-readable values as in the table, but no alignment or colors).
+        Default: "plain" if the output is not a terminal
+        (unless ``--width`` or ``--no-truncate`` is specified), otherwise a table.
+
     -l, --list
         Print selected column as list.
 
@@ -91,10 +101,12 @@ import pwd
 import re
 import sys
 
-import numpy as np
-
+from . import aggregate
+from . import export
+from . import filters
 from . import rich
 from . import sinfo
+from . import sort
 from . import squeue
 from . import table
 from . import version
@@ -118,10 +130,12 @@ def main():
     parser.add_argument("-r", "--reverse", action="store_true")
     parser.add_argument("-o", "--output", type=str, action="append")
     parser.add_argument("-S", "--summary", action="store_true")
+    parser.add_argument("--summary-by", type=str, action="append", default=[])
     parser.add_argument("--no-header", action="store_true")
     parser.add_argument("--no-truncate", action="store_true")
     parser.add_argument("--width", type=int)
     parser.add_argument("--colors", type=str, default="dark")
+    parser.add_argument("--format", type=str, choices=export.formats)
     parser.add_argument("-l", "--list", action="store_true")
     parser.add_argument("--sep", type=str, default=" ")
     parser.add_argument("--long", action="store_true")
@@ -189,6 +203,22 @@ def main():
         {"key": "MEM_RELJOB", "width": 4, "align": ">", "priority": True},
     ]
 
+    # group by (default: partition), the group's columns are printed first
+    args["summary_by"] = [key for keys in args["summary_by"] for key in keys.split(",")]
+    unknown = [key for key in args["summary_by"] if key.upper() not in aliasInv]
+
+    if unknown:
+        parser.error(f"--summary-by: unknown field(s): {', '.join(unknown)}")
+
+    by = [aliasInv[key.upper()] for key in args["summary_by"]] or ["PARTITION"]
+    settings = {column["key"]: column for column in columns + columns_summary}
+    columns_summary = [settings[key] for key in by] + [
+        column for column in columns_summary if column["key"] not in by
+    ]
+
+    if args["summary_by"]:
+        args["summary"] = True
+
     # header
     header_summary = {
         column["key"]: rich.String(alias[column["key"]], align=column["align"])
@@ -198,34 +228,39 @@ def main():
     # select color theme
     theme = sinfo.colors(args["colors"].lower())
 
+    # machine-readable output: plain values, no colors or unit conversions
+    # (the "plain" layout keeps the human-readable values of the table)
+    fmt = export.select(args["format"], args["width"] is not None or args["no_truncate"])
+    fmt = fmt if args["summary"] or not (args["long"] or args["list"]) else None
+    typed = fmt not in [None, "plain"]
+
     # -- load the output of "sinfo" --
 
     if not args["debug"]:
-        lines = sinfo.read_interpret(theme=theme)
+        lines = sinfo.read()
+    else:
+        lines = sinfo.read(data=open(args["debug"][0]).read())
 
+    if typed:
+        lines = sinfo.typed(lines)
     else:
-        lines = sinfo.read_interpret(
-            data=open(args["debug"][0]).read(),
-            theme=theme,
-        )
+        lines = sinfo.interpret(lines, theme=theme)
 
     # ----------------------------- limit based on command-line options ------
 
-    for key in ["HOSTNAMES", "PARTITION", "CPUS_I"]:
-        if args[key]:
-            # limit data
-            lines = [
-                line
-                for line in lines
-                if sum(1 if re.match(n, str(line[key])) else 0 for n in args[key])
-            ]
-
-            # color-highlight selected columns
-            # - apply to all remaining lines
+    keys = [key for key in ["HOSTNAMES", "PARTITION", "CPUS_I"] if args[key]]
+
+    # limit data
+    lines = filters.apply(lines, {key: args[key] for key in keys})
+
+    for key in keys:
+        # color-highlight selected columns
+        # - apply to all remaining lines (not for machine-readable output)
+        if not typed:
             for line in lines:
                 line[key].color = theme["selection"]
-            # - apply to the header
-            header[key].color = theme["selection"]
+        # - apply to the header
+        header[key].color = theme["selection"]
 
     # -- support function used below --
 
@@ -282,34 +317,16 @@ def main():
         # get list of jobs
         # ----------------
 
-        # read
+        # read (only strings are needed)
         if not args["debug"]:
-            jobs = squeue.read_interpret()
+            jobs = squeue.read()
 
         else:
-            jobs = squeue.read_interpret(
-                data=open(args["debug"][1]).read(),
-                now=os.path.getctime(args["debug"][1]),
-            )
+            jobs = squeue.read(data=open(args["debug"][1]).read())
 
-        # limit to running jobs
-        jobs = [j for j in jobs if str(j["ST"]) == "R"]
-
-        # limit to users' jobs
-        if args["user"]:
-            jobs = [
-                str(j["NODELIST"])
-                for j in jobs
-                if sum(1 if re.match(n, str(j["USER"])) else 0 for n in args["user"])
-            ]
-
-        # limit to specific jobs
-        if args["jobid"]:
-            jobs = [
-                str(j["NODELIST"])
-                for j in jobs
-                if sum(1 if re.match(n, str(j["JOBID"])) else 0 for n in args["jobid"])
-            ]
+        # limit to running jobs, and to users' and/or specific jobs
+        jobs = filters.apply(jobs, {"ST": ["^R$"], "USER": args["user"], "JOBID": args["jobid"]})
+        jobs = [str(j["NODELIST"]) for j in jobs]
 
         # get list of nodes for the users' jobs
         # --
@@ -344,9 +361,10 @@ def main():
         lines = [line for line in lines if str(line["HOSTNAMES"]) in nodes]
 
         # color-highlight selected columns
-        # - apply to all remaining lines
-        for line in lines:
-            line["HOSTNAMES"].color = theme["selection"]
+        # - apply to all remaining lines (not for machine-readable output)
+        if not typed:
+            for line in lines:
+                line["HOSTNAMES"].color = theme["selection"]
         # - apply to the header
         header["HOSTNAMES"].color = theme["selection"]
 
@@ -357,10 +375,7 @@ def main():
     else:
         sortkeys = ["HOSTNAMES", "PARTITION"]
 
-    idx = np.lexsort([[i[key] for i in lines] for key in sortkeys])
-    if args["reverse"]:
-        idx = idx[::-1]
-    lines = [lines[i] for i in idx]
+    lines = sort.sort(lines, sortkeys, args["reverse"])
 
     # -- select columns --
 
@@ -390,6 +405,19 @@ def main():
 
             sys.exit(0)
 
+        # optional: print in other format and quit
+        elif fmt:
+            export.write(
+                lines,
+                [column["key"] for column in columns],
+                fmt,
+                header=alias,
+                sep=args["sep"],
+                print_header=not args["no_header"],
+            )
+
+            sys.exit(0)
+
         # default: print columns
         else:
             table.print_columns(
@@ -406,69 +434,63 @@ def main():
 
     # -- summarize information --
 
-    # get names of the different partitions
-    partitions = sorted({str(line["PARTITION"]) for line in lines})
-
-    # start a new list of "node information", summed on the relevant nodes
-    partitions = [{"PARTITION": rich.String(key)} for key in partitions]
-
-    # loop over partitions
-    for partition in partitions:
-        # - isolate nodes for this partition
-        N = [line for line in lines if str(line["PARTITION"]) == str(partition["PARTITION"])]
-
-        # - get the CPU count
-        partition["CPUS_T"] = rich.Integer(sum(int(line["CPUS_T"]) for line in N))
-        partition["CPUS_O"] = rich.Integer(sum(int(line["CPUS_O"]) for line in N))
-        partition["CPUS_D"] = rich.Integer(sum(int(line["CPUS_D"]) for line in N))
-        partition["CPUS_I"] = rich.Integer(sum(int(line["CPUS_I"]) for line in N))
-
-        # - initialize scores
-        partition["CPU_RELJOB"] = rich.Float("")
-        partition["MEM_RELJOB"] = rich.Float("")
-
-        # - average load
-        if len([1 for line in N if line["CPU_RELJOB"].isnumeric()]) > 0:
-            partition["CPU_RELJOB"] = rich.Float(
-                sum(float(line["CPU_RELJOB"]) for line in N if line["CPU_RELJOB"].isnumeric())
-                / sum(1.0 for line in N if line["CPU_RELJOB"].isnumeric())
-            )
-
-        # - average memory consumption
-        if len([1 for line in N if line["MEM_RELJOB"].isnumeric()]) > 0:
-            partition["MEM_RELJOB"] = rich.Float(
-                sum(float(line["MEM_RELJOB"]) for line in N if line["MEM_RELJOB"].isnumeric())
-                / sum(1.0 for line in N if line["MEM_RELJOB"].isnumeric())
-            )
-
-        # - highlight 'scores'
-        if int(partition["CPUS_I"]) > 0:
-            partition["CPUS_I"].color = theme["free"]
-        if float(partition["CPU_RELJOB"]) > 1.05:
-            partition["CPU_RELJOB"].color = theme["warning"]
-        elif float(partition["CPU_RELJOB"]) < 0.95:
-            partition["CPU_RELJOB"].color = theme["low"]
+    # - get the CPU count, average load and memory consumption
+    funcs = {
+        "PARTITION": "distinct",
+        "CPUS_T": "sum",
+        "CPUS_O": "sum",
+        "CPUS_D": "sum",
+        "CPUS_I": "sum",
+        "CPU_RELJOB": "mean",
+        "MEM_RELJOB": "mean",
+    }
+    funcs = {key: func for key, func in funcs.items() if key not in by}
+    lines = aggregate.groupby(lines, by, funcs)
 
-    # rename field
-    lines = partitions
+    # - table and plain layout only (machine-readable output keeps the plain numbers)
+    if not typed:
+        for line in lines:
+            for key in line:
+                if key in by or funcs[key] == "distinct":
+                    line[key] = rich.String(line[key])
+                elif funcs[key] == "sum":
+                    line[key] = rich.Integer(line[key])
+                else:
+                    line[key] = rich.Float("" if line[key] is None else line[key])
+
+            # - highlight 'scores'
+            if "CPUS_I" in funcs and int(line["CPUS_I"]) > 0:
+                line["CPUS_I"].color = theme["free"]
+            if "CPU_RELJOB" in funcs and float(line["CPU_RELJOB"]) > 1.05:
+                line["CPU_RELJOB"].color = theme["warning"]
+            elif "CPU_RELJOB" in funcs and float(line["CPU_RELJOB"]) < 0.95:
+                line["CPU_RELJOB"].color = theme["low"]
 
     # -- sort --
 
-    # default sort
-    lines.sort(key=lambda line: line["PARTITION"], reverse=args["reverse"])
+    # default sort: on the group's columns, optional: sort by key(s)
+    sortkeys = by[::-1]
 
-    # optional: sort by key(s)
     if args["sort"]:
         keys = [alias[column["key"]].upper() for column in columns_summary]
         args["sort"] = [key for key in args["sort"] if key.upper() in keys]
+        sortkeys += [aliasInv[key.upper()] for key in args["sort"]]
 
-        idx = np.lexsort([[i[aliasInv[k.upper()]] for i in lines] for k in args["sort"]])
-        if args["reverse"]:
-            idx = idx[::-1]
-        lines = [lines[i] for i in idx]
+    lines = sort.sort(lines, sortkeys, args["reverse"])
 
     # -- print --
 
+    if fmt:
+        export.write(
+            lines,
+            [column["key"] for column in columns_summary],
+            fmt,
+            header=alias,
+            sep=args["sep"],
+            print_header=not args["no_header"],
+        )
+        return
+
     table.print_columns(
         lines=lines,
         columns=columns_summary,
@@ -53,6 +53,13 @@ Options:
     -r, --reverse
         Reverse sort.
 
+    --head=<N>
+        Print only the first N lines (after sorting).
+        Only these lines are fully interpreted, making this fast for a long list.
+
+    --tail=<N>
+        Print only the last N lines (after sorting).
+
     -o, --output=<NAME>
         Select output columns.
         Option may be repeated. See description for header names.
@@ -76,6 +83,12 @@ Options:
     --colors=<NAME>
         Select color scheme from: "none", "dark". [default: "dark"]
 
+    --format=<NAME>
+        Print in format: "csv", "tsv", "json", "ndjson" (raw values, e.g. seconds and bytes),
+        or "plain" (human-readable values as in the table, but no alignment or colors).
+        Default: "plain" if the output is not a terminal
+        (unless ``--width`` or ``--no-truncate`` is specified), otherwise a table.
+
     -l, --list
         Print selected column as list.
 
@@ -100,12 +113,14 @@ Options:
 import argparse
 import os
 import pwd
-import re
 import subprocess
 import sys
 
+from . import export
+from . import filters
 from . import ps
 from . import rich
+from . import sort
 from . import table
 from . import version
 
@@ -124,11 +139,15 @@ def main():
     parser.add_argument("-c", "--command", type=str, action="append")
     parser.add_argument("-s", "--sort", type=str, action="append")
     parser.add_argument("-r", "--reverse", action="store_true")
+    select = parser.add_mutually_exclusive_group()
+    select.add_argument("--head", type=int)
+    select.add_argument("--tail", type=int)
     parser.add_argument("-o", "--output", type=str, action="append")
     parser.add_argument("--no-header", action="store_true")
     parser.add_argument("--no-truncate", action="store_true")
     parser.add_argument("--width", type=int)
     parser.add_argument("--colors", type=str, default="dark")
+    parser.add_argument("--format", type=str, choices=export.formats)
     parser.add_argument("-l", "--list", action="store_true")
     parser.add_argument("--sep", type=str, default=" ")
     parser.add_argument("--long", action="store_true")
@@ -189,45 +208,56 @@ def main():
     # -- load the output of "ps" --
 
     if not args["debug"]:
-        lines = ps.read_interpret(theme=theme)
+        lines = ps.read()
 
         if not args["include_me"]:
             pid = os.getpid()
-            lines = [line for line in lines if int(line["PID"].data) != pid]
+            lines = [line for line in lines if int(line["PID"]) != pid]
 
     else:
-        lines = ps.read_interpret(
-            data=open(args["debug"]).read(),
-            theme=theme,
-        )
+        lines = ps.read(data=open(args["debug"]).read())
+
+    # -- keys used to select and sort --
+
+    keys = [key for key in ["USER", "PID", "COMMAND"] if args[key]]
+
+    # default sort, optional: sort by key(s) (the last key is the primary key)
+    sortkeys = ["RSS"]
+    reverse = [False]
+
+    if args["sort"]:
+        sortkeys += [aliasInv[key.upper()] for key in args["sort"]]
+        reverse += [args["reverse"]] * len(args["sort"])
+
+    # -- interpret --
+
+    # with "--head" or "--tail": interpret only the fields needed to select the lines,
+    # the remaining fields are interpreted for the selected lines only
+    if args["head"] is not None or args["tail"] is not None:
+        lines = ps.interpret(lines, theme, keys=keys + sortkeys)
+    else:
+        lines = ps.interpret(lines, theme)
 
     # ----------------------------- limit based on command-line options ------
 
-    for key in ["USER", "PID", "COMMAND"]:
-        if args[key]:
-            # limit data
-            lines = [
-                line
-                for line in lines
-                if sum(1 if re.match(n, str(line[key])) else 0 for n in args[key])
-            ]
-
-            # color-highlight selected columns
-            # - apply to all remaining lines
-            for line in lines:
-                line[key].color = theme["selection"]
-            # - apply to the header
-            header[key].color = theme["selection"]
+    lines = filters.apply(lines, {key: args[key] for key in keys})
 
     # -- sort --
 
-    # default sort
-    lines.sort(key=lambda line: line["RSS"], reverse=False)
+    if args["head"] is not None:
+        lines = ps.interpret(sort.head(lines, sortkeys, args["head"], reverse), theme)
+    elif args["tail"] is not None:
+        lines = ps.interpret(sort.tail(lines, sortkeys, args["tail"], reverse), theme)
+    else:
+        lines = sort.sort(lines, sortkeys, reverse)
 
-    # optional: sort by key(s)
-    if args["sort"]:
-        for key in args["sort"]:
-            lines.sort(key=lambda line: line[aliasInv[key.upper()]], reverse=args["reverse"])
+    for key in keys:
+        # color-highlight selected columns
+        # - apply to all remaining lines
+        for line in lines:
+            line[key].color = theme["selection"]
+        # - apply to the header
+        header[key].color = theme["selection"]
 
     # -- print PID only --
 
@@ -253,6 +283,8 @@ def main():
 
     # -- print --
 
+    fmt = export.select(args["format"], args["width"] is not None or args["no_truncate"])
+
     if True:
         # optional: print all fields and quit
         if args["long"]:
@@ -272,6 +304,19 @@ def main():
 
             sys.exit(0)
 
+        # optional: print in other format and quit
+        elif fmt:
+            export.write(
+                lines,
+                [column["key"] for column in columns],
+                fmt,
+                header=alias,
+                sep=args["sep"],
+                print_header=not args["no_header"],
+            )
+
+            sys.exit(0)
+
         # default: print columns
         else:
             table.print_columns(
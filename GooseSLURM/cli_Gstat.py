@@ -89,6 +89,13 @@ Options:
     -r, --reverse
         Reverse sort.
 
+    --head=<N>
+        Print only the first N lines (after sorting).
+        Only these lines are fully interpreted, making this fast for a long list.
+
+    --tail=<N>
+        Print only the last N lines (after sorting).
+
     -o, --output=<NAME>
         Select output columns.
         Option may be repeated. See description for header names.
@@ -101,7 +108,11 @@ Options:
         Show full user names.
 
     -S, --summary
-        Print only summary.
+        Print only summary (per user).
+
+    --summary-by=<NAME>
+        Print only summary, per (combination of) column(s), e.g. "User,Partition" or "ST".
+        Option may be repeated. Use header names.
 
     --no-header
         Suppress header.
@@ -115,6 +126,12 @@ Options:
     --colors=<NAME>
         Select color scheme from: "none", "dark". [default: "dark"]
 
+    --format=<NAME>
+        Print in format: "csv", "tsv", "json", "ndjson" (raw values, e.g. seconds and bytes),
+        or "plain" (human-readable values as in the table, but no alignment or colors).
+        Default: "plain" if the output is not a terminal
+        (unless ``--width`` or ``--no-truncate`` is specified), otherwise a table.
+
     -l, --list
         Print selected column as list.
 
@@ -152,15 +169,38 @@ Options:
 import argparse
 import os
 import pwd
-import re
-
-import numpy as np
+import time
 
+from . import aggregate
+from . import export
+from . import filters
 from . import rich
+from . import sort
 from . import squeue
 from . import table
 from . import version
 
+# conversion map: default field-names -> custom field-names
+_alias = {
+    "JOBID": "JobID",
+    "USER": "User",
+    "ACCOUNT": "Account",
+    "NAME": "Name",
+    "START_TIME": "Tstart",
+    "TIME_LEFT": "Tleft",
+    "NODES": "#node",
+    "CPUS": "#CPU",
+    "CPUS_R": "#CPU(R)",
+    "CPUS_PD": "#CPU(PD)",
+    "MIN_MEMORY": "MEM",
+    "ST": "ST",
+    "NODELIST(REASON)": "Host",
+    "PARTITION": "Partition",
+    "DEPENDENCY": "Dependency",
+    "WORK_DIR": "WorkDir",
+    "COMMAND": "Command",
+}
+
 
 class Gstat:
     def __init__(self):
@@ -193,14 +233,19 @@ class Gstat:
         parser.add_argument("-p", "--partition", type=str, action="append")
         parser.add_argument("-s", "--sort", type=str, action="append")
         parser.add_argument("-r", "--reverse", action="store_true")
+        select = parser.add_mutually_exclusive_group()
+        select.add_argument("--head", type=int)
+        select.add_argument("--tail", type=int)
         parser.add_argument("-o", "--output", type=str, action="append")
         parser.add_argument("-e", "--extra", type=str, action="append")
         parser.add_argument("--full-name", action="store_true")
         parser.add_argument("-S", "--summary", action="store_true")
+        parser.add_argument("--summary-by", type=str, action="append", default=[])
         parser.add_argument("--no-header", action="store_true")
         parser.add_argument("--no-truncate", action="store_true")
         parser.add_argument("--width", type=int)
         parser.add_argument("--colors", type=str, default="dark")
+        parser.add_argument("--format", type=str, choices=export.formats)
         parser.add_argument("-l", "--list", action="store_true")
         parser.add_argument("-J", "--joblist", action="store_true")
         parser.add_argument("--abspath", action="store_true")
@@ -230,6 +275,16 @@ class Gstat:
 
         args["jobid"] += [f"^{i:d}$" for i in args["jobs"]]
 
+        args["summary_by"] = [key for keys in args["summary_by"] for key in keys.split(",")]
+        fields = [name.upper() for name in _alias.values()] + ["STATUS"]
+        unknown = [key for key in args["summary_by"] if key.upper() not in fields]
+
+        if unknown:
+            parser.error(f"--summary-by: unknown field(s): {', '.join(unknown)}")
+
+        if args["summary_by"]:
+            args["summary"] = True
+
         if args["root"] or args["max_depth"]:
             if args["extra"] is None:
                 args["extra"] = ["WorkDir"]
@@ -249,25 +304,7 @@ class Gstat:
         # -- field-names and print settings --
 
         # conversion map: default field-names -> custom field-names
-        alias = {
-            "JOBID": "JobID",
-            "USER": "User",
-            "ACCOUNT": "Account",
-            "NAME": "Name",
-            "START_TIME": "Tstart",
-            "TIME_LEFT": "Tleft",
-            "NODES": "#node",
-            "CPUS": "#CPU",
-            "CPUS_R": "#CPU(R)",
-            "CPUS_PD": "#CPU(PD)",
-            "MIN_MEMORY": "MEM",
-            "ST": "ST",
-            "NODELIST(REASON)": "Host",
-            "PARTITION": "Partition",
-            "DEPENDENCY": "Dependency",
-            "WORK_DIR": "WorkDir",
-            "COMMAND": "Command",
-        }
+        alias = dict(_alias)
 
         # conversion map: custom field-names -> default field-names
         aliasInv = {alias[key].upper(): key for key in alias}
@@ -320,56 +357,15 @@ class Gstat:
         # -- load the output of "squeue" --
 
         if not self.args["debug"]:
-            lines = squeue.read_interpret(theme=theme)
-
+            lines = squeue.read()
+            now = time.mktime(time.localtime())
         else:
-            lines = squeue.read_interpret(
-                data=open(self.args["debug"]).read(),
-                now=os.path.getctime(self.args["debug"]),
-                theme=theme,
-            )
-
-        # -- convert paths ---
-
-        if self.args["root"]:
-            root = self.args["root"]
-            lines = [
-                i for i in lines if not os.path.relpath(i["WORK_DIR"].data, root).startswith("..")
-            ]
-            for line in lines:
-                line["WORK_DIR"].data = os.path.relpath(line["WORK_DIR"].data, root)
-                line["COMMAND"].data = os.path.relpath(line["COMMAND"].data, root)
-            if self.args["max_depth"]:
-                lines = [
-                    line
-                    for line in lines
-                    if len(line["WORK_DIR"].data.split(os.path.sep)) <= self.args["max_depth"]
-                ]
-        elif self.args["max_depth"]:
-            lines = [
-                line
-                for line in lines
-                if len(line["WORK_DIR"].data.split(os.path.sep)) <= self.args["max_depth"] + 1
-            ]
-
-        if not self.args["root"]:
-            if self.args["abspath"]:
-                for line in lines:
-                    line["WORK_DIR"].data = os.path.abspath(line["WORK_DIR"].data)
-                    line["COMMAND"].data = os.path.abspath(line["COMMAND"].data)
-            elif self.args["relpath"]:
-                for line in lines:
-                    line["WORK_DIR"].data = os.path.relpath(line["WORK_DIR"].data)
-                    line["COMMAND"].data = os.path.relpath(line["COMMAND"].data)
-            else:
-                for line in lines:
-                    if len(os.path.relpath(line["WORK_DIR"].data).split("../")) < 3:
-                        line["WORK_DIR"].data = os.path.relpath(line["WORK_DIR"].data)
-                        line["COMMAND"].data = os.path.relpath(line["COMMAND"].data)
+            lines = squeue.read(data=open(self.args["debug"]).read())
+            now = os.path.getctime(self.args["debug"])
 
-        # -- limit based on command-line options --
+        # -- keys used to select and sort --
 
-        for key in [
+        keys = [
             "USER",
             "ACCOUNT",
             "NAME",
@@ -378,48 +374,71 @@ class Gstat:
             "NODELIST(REASON)",
             "PARTITION",
             "WORK_DIR",
-        ]:
-            if not self.args[key]:
-                continue
+        ]
+        keys = [key for key in keys if self.args[key]]
 
-            # limit data
-            lines = [
-                line
-                for line in lines
-                if sum(1 if re.match(n, str(line[key])) else 0 for n in self.args[key])
-            ]
+        if self.args["sort"]:
+            sortkeys = [aliasInv[key.upper()] for key in self.args["sort"]]
+        else:
+            sortkeys = ["JOBID", "PARTITION"]
 
-            # color-highlight selected columns
-            # - apply to all remaining lines
-            for line in lines:
-                line[key].color = theme["selection"]
-            # - apply to the header
-            header[key].color = theme["selection"]
+        # -- interpret --
+
+        # machine-readable output: plain values, no colors or unit conversions
+        # (the "plain" layout keeps the human-readable values of the table)
+        self.fmt = self._format()
+        typed = self.fmt not in [None, "plain"]
+
+        # with "--head" or "--tail": interpret only the fields needed to select the lines,
+        # the remaining fields are interpreted for the selected lines only
+        select = self.args["head"] is not None or self.args["tail"] is not None
+        select = select and not self.args["summary"]
+        paths = ["WORK_DIR", "COMMAND"]
+        paths_first = typed or not select or self.args["root"] or self.args["max_depth"]
+        paths_first = paths_first or any(key in paths for key in keys + sortkeys)
+
+        if typed:
+            lines = squeue.typed(lines, now)
+        elif select:
+            lines = squeue.interpret(lines, now, theme, keys=keys + sortkeys + paths)
+        else:
+            lines = squeue.interpret(lines, now, theme)
 
-        if self.args["root"] or self.args["max_depth"]:
-            key = "WORK_DIR"
+        if paths_first:
+            lines = self._convert_paths(lines)
 
-            for line in lines:
-                line[key].color = theme["selection"]
+        # -- limit based on command-line options --
 
-            header[key].color = theme["selection"]
+        lines = filters.apply(lines, {key: self.args[key] for key in keys})
 
         # -- sort --
 
-        if self.args["sort"]:
-            sortkeys = [aliasInv[key.upper()] for key in self.args["sort"]]
-            reversed = False
+        if not select:
+            lines = sort.sort(lines, sortkeys, self.args["reverse"])
         else:
-            sortkeys = ["JOBID", "PARTITION"]
-            reversed = False
+            if self.args["head"] is not None:
+                lines = sort.head(lines, sortkeys, self.args["head"], self.args["reverse"])
+            else:
+                lines = sort.tail(lines, sortkeys, self.args["tail"], self.args["reverse"])
+
+            if not typed:
+                lines = squeue.interpret(lines, now, theme)
 
-        if self.args["reverse"]:
-            reversed = not reversed
+            if not paths_first:
+                lines = self._convert_paths(lines)
 
-        idx = np.lexsort([[i[key] for i in lines] for key in sortkeys])
-        if reversed:
-            idx = idx[::-1]
-        lines = [lines[i] for i in idx]
+        # -- color-highlight selected columns --
+
+        if (self.args["root"] or self.args["max_depth"]) and "WORK_DIR" not in keys:
+            keys += ["WORK_DIR"]
+
+        for key in keys:
+            # - apply to all remaining lines (not for machine-readable output)
+            if not typed:
+                for line in lines:
+                    line[key].color = theme["selection"]
+            # - apply to the header
+            header[key].color = theme["selection"]
 
         # -- select columns --
 
@@ -443,6 +462,92 @@ class Gstat:
         self.alias = alias
         self.aliasInv = aliasInv
 
+    def _convert_paths(self, lines):
+        """
+        Limit lines based on ``--root`` and ``--max-depth``,
+        and convert "WORK_DIR" and "COMMAND" to relative or absolute paths.
+
+        :param lines: List of lines.
+        :return: List of lines.
+        """
+
+        def convert(lines, func):
+            for line in lines:
+                for key in ["WORK_DIR", "COMMAND"]:
+                    if isinstance(line[key], rich.String):
+                        line[key].data = func(line[key].data)
+                    else:
+                        line[key] = func(line[key])
+
+        def depth(line):
+            return len(export.raw(line["WORK_DIR"]).split(os.path.sep))
+
+        if self.args["root"]:
+            root = self.args["root"]
+            lines = [
+                i
+                for i in lines
+                if not os.path.relpath(export.raw(i["WORK_DIR"]), root).startswith("..")
+            ]
+            convert(lines, lambda path: os.path.relpath(path, root))
+            if self.args["max_depth"]:
+                lines = [line for line in lines if depth(line) <= self.args["max_depth"]]
+        elif self.args["max_depth"]:
+            lines = [line for line in lines if depth(line) <= self.args["max_depth"] + 1]
+
+        if not self.args["root"]:
+            if self.args["abspath"]:
+                convert(lines, os.path.abspath)
+            elif self.args["relpath"]:
+                convert(lines, os.path.relpath)
+            else:
+                near = [
+                    line
+                    for line in lines
+                    if len(os.path.relpath(export.raw(line["WORK_DIR"])).split("../")) < 3
+                ]
+                convert(near, os.path.relpath)
+
+        return lines
+
+    def _format(self):
+        """
+        Format selected by ``--format`` (see ``GooseSLURM.export.select``).
+
+        :return: The format, ``None`` if a table (or list) should be printed instead.
+        """
+
+        if self.args["print_dependency"]:
+            return None
+
+        if not self.args["summary"] and (self.args["long"] or self.args["list"]):
+            return None
+
+        layout = self.args["width"] is not None or self.args["no_truncate"]
+        return export.select(self.args["format"], layout)
+
+    def _print_format(self, lines, columns):
+        """
+        Print in the format selected by ``--format``, see ``_format``.
+        The lines are plain values (see ``GooseSLURM.squeue.typed``),
+        or ``GooseSLURM.rich`` objects for the ``"plain"`` layout.
+
+        :return: ``True`` if printed, ``False`` if a table should be printed instead.
+        """
+
+        if self.fmt is None:
+            return False
+
+        export.write(
+            lines,
+            [column["key"] for column in columns],
+            self.fmt,
+            header=self.alias,
+            sep=self.args["sep"],
+            print_header=not self.args["no_header"],
+        )
+        return True
+
     def print_all(self):
         """
         Normal print
@@ -461,6 +566,9 @@ class Gstat:
             table.print_list(self.lines, self.columns[0]["key"], self.args["sep"])
             return
 
+        if self._print_format(self.lines, self.columns):
+            return
+
         # print columns
         table.print_columns(
             lines=self.lines,
@@ -487,6 +595,14 @@ class Gstat:
             {"key": "PARTITION", "width": 9, "align": "<", "priority": False},
         ]
 
+        # group by (default: user), the group's columns are printed first
+        by = [self.aliasInv[key.upper()] for key in self.args["summary_by"]] or ["USER"]
+        settings = {column["key"]: column for column in columns_summary}
+        columns_summary = [
+            settings.get(key, {"key": key, "width": 5, "align": "<", "priority": True})
+            for key in by
+        ] + [column for column in columns_summary if column["key"] not in by]
+
         # header
         header_summary = {
             column["key"]: rich.String(self.alias[column["key"]], align=column["align"])
@@ -495,55 +611,55 @@ class Gstat:
 
         # -- summarize information --
 
-        # get names of the different users
-        users = sorted({str(line["USER"]) for line in self.lines})
-
-        # start a new list of "user information", summed on the relevant users
-        users = [{"USER": rich.String(key)} for key in users]
-
-        # loop over users
-        for user in users:
-            # - isolate jobs for this user
-            N = [line for line in self.lines if str(line["USER"]) == str(user["USER"])]
-
-            # - get (a list of) partition(s)/account(s)
-            user["PARTITION"] = rich.String(",".join(list({str(line["PARTITION"]) for line in N})))
-            user["ACCOUNT"] = rich.String(",".join(list({str(line["ACCOUNT"]) for line in N})))
-
-            # - count used CPU (per category)
-            user["CPUS"] = rich.Integer(sum(int(line["CPUS"]) for line in N))
-            user["CPUS_R"] = rich.Integer(sum(int(line["CPUS_R"]) for line in N))
-            user["CPUS_PD"] = rich.Integer(sum(int(line["CPUS_PD"]) for line in N))
+        # - get (a list of) partition(s)/account(s), count used CPU (per category)
+        funcs = {
+            "USER": "distinct",
+            "ACCOUNT": "distinct",
+            "PARTITION": "distinct",
+            "CPUS": "sum",
+            "CPUS_R": "sum",
+            "CPUS_PD": "sum",
+        }
+        funcs = {key: func for key, func in funcs.items() if key not in by}
+        lines = aggregate.groupby(self.lines, by, funcs)
 
-            # - remove zeros from output for more intuitive output
-            for key in ["CPUS_R", "CPUS_PD"]:
-                if int(user[key]) == 0:
-                    user[key] = rich.Integer("-")
+        # - table and plain layout only (machine-readable output keeps the plain numbers)
+        if self.fmt in [None, "plain"]:
+            for line in lines:
+                for key in line:
+                    func = funcs.get(key)
+                    line[key] = (rich.Integer if func == "sum" else rich.String)(line[key])
 
-        # rename field
-        lines = users
+                # - remove zeros from output for more intuitive output
+                for key in ["CPUS_R", "CPUS_PD"]:
+                    if key in funcs and int(line[key]) == 0:
+                        line[key] = rich.Integer("-")
 
         # -- sort --
 
-        # default sort
-        lines.sort(key=lambda line: line["USER"], reverse=self.args["reverse"])
+        # default sort: on the group's columns, optional: sort by key(s)
+        sortkeys = by[::-1]
 
-        # optional: sort by key(s)
         if self.args["sort"]:
             # get available keys in the setting with fewer columns
             keys = [self.alias[column["key"]].upper() for column in columns_summary]
 
             # filter sort keys that are not available in this mode
             self.args["sort"] = [key for key in self.args["sort"] if key.upper() in keys]
+            sortkeys += [self.aliasInv[key.upper()] for key in self.args["sort"]]
 
-            # apply sort
-            for key in self.args["sort"]:
-                lines.sort(
-                    key=lambda line: line[self.aliasInv[key.upper()]], reverse=self.args["reverse"]
-                )
+        if self.args["head"] is not None:
+            lines = sort.head(lines, sortkeys, self.args["head"], self.args["reverse"])
+        elif self.args["tail"] is not None:
+            lines = sort.tail(lines, sortkeys, self.args["tail"], self.args["reverse"])
+        else:
+            lines = sort.sort(lines, sortkeys, self.args["reverse"])
 
         # -- print --
 
+        if self._print_format(lines, columns_summary):
+            return
+
         table.print_columns(
             lines=lines,
             columns=columns_summary,
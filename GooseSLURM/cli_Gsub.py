@@ -20,11 +20,25 @@ Options:
         Do no show progress-bar.
 
     --log = FILENAME
-        Log the JobIDs to a YAML-file (updated after each submit).
-        Existing log files are appended.
+        Log the JobIDs to a YAML-file.
+        Existing log files are appended, and several submissions can share one log file.
+        Each submission is appended to a journal ``FILENAME.journal`` that is compacted into
+        the YAML-file periodically and at the end (see ``GooseSLURM.journal``).
 
     --delay = FLOAT
-        Seconds to wait between submitting jobs. [default: 0.1]
+        Minimal number of seconds between the start of two submissions. [default: 0]
+
+    -j, --jobs = INT
+        Maximum number of concurrent submissions. [default: 8]
+        The number of concurrent submissions starts at one, and is adapted to the latency of
+        ``sbatch`` (see ``GooseSLURM.submit``).
+        Jobs that depend on each other (``--repeat``, ``--serial``) are submitted in order.
+
+    --retry = INT
+        Number of retries of submissions that fail with a transient error
+        (e.g. "Unable to contact slurm controller"), with an exponential backoff. [default: 5]
+        A time-out while sending or receiving ("Socket timed out") is not retried,
+        as the job might have been submitted.
 
     -r, --repeat = INT
         Submit using dependencies such that the job will be repeated 'n' times. [default: 1]
@@ -32,6 +46,169 @@ Options:
     --serial
         Submit using dependencies such that jobs are run after each other.
 
+    --array
+        Pack the job-scripts in job arrays, rather than submitting them one-by-one.
+        Job-scripts with identical ``#SBATCH`` headers (and interpreter) are grouped.
+        For each group a dispatcher script is written (to the current directory)
+        that runs the job-script corresponding to ``SLURM_ARRAY_TASK_ID``
+        from the directory in which it is stored.
+        The ``#SBATCH`` header is evaluated once for the array: relative paths
+        (e.g. of ``--output``) are relative to the current directory.
+        The log (see ``--log``) stores ``"JOBID_TASKID"`` for each job-script.
+        With ``--serial`` each array runs its tasks one-by-one, and waits for the previous array.
+
+    --throttle = INT
+        Maximum number of simultaneously running tasks of each array (``--array`` only).
+
+    --array-max = INT
+        Maximum number of tasks per array (``--array`` only), see ``MaxArraySize``.
+        [default: 1000]
+
+    --requeue-until-done = MARKER
+        Run each job-script as one job that requeues itself (``scontrol requeue``) until the
+        job-script creates the file ``MARKER`` (relative to the directory of the job-script,
+        ``{name}`` is replaced by the name of the job-script).
+        Shortly before the time-limit, the job-script receives a signal (see
+        ``--requeue-signal``) upon which it should write a checkpoint and stop;
+        the requeued job restarts it (under the same job-id), and it should continue from the
+        checkpoint. Each job-script is wrapped in ``Gsub_requeue_NAME``, written next to it
+        (see ``GooseSLURM.scripts.requeue``).
+        Compared to ``--repeat`` there is only one job (and queue wait) per chain.
+
+    --requeue-signal = ARG
+        Signal sent to the job-script before the time-limit (``--requeue-until-done`` only).
+        [default: USR1]
+
+    --requeue-before = ARG
+        Time before the time-limit at which the signal is sent, e.g. ``10m``
+        (``--requeue-until-done`` only). [default: 300]
+
+    --requeue-max = INT
+        Maximum number of requeues (``--requeue-until-done`` only).
+
+    --manifest = FILENAME
+        Read the job-scripts from a file (``-`` for stdin), one per line, optionally followed
+        by ``sbatch`` options for that job-script, e.g. ``path/to/job.slurm --mem 4G``.
+        The manifest is read while submitting, and job-scripts are checked as they are read:
+        memory use does not depend on the number of job-scripts.
+
+    --find = ROOT
+        Submit the job-scripts found in the directory tree ``ROOT`` (see ``--name``).
+        The tree is walked concurrently (see ``GooseSLURM.files.find``),
+        and job-scripts are submitted as they are found (in no particular order).
+
+    --name = PATTERN
+        Filename pattern of the job-scripts (``--find`` only). [default: *.slurm]
+
+    --prune = PATTERN
+        Do not search directories matching the pattern (``--find`` only), can be repeated.
+        Version control, Python, and CMake folders are always skipped
+        (see ``GooseSLURM.files.prune``).
+
+    --skip-queued
+        Skip job-scripts in a directory that is the working directory of one of your jobs in
+        the queue (``--find`` only).
+
+    --max-queued = INT
+        Keep at most this many of your jobs in the queue (e.g. to stay below ``MaxSubmitJobs``):
+        submit while there is room, and wait for jobs to leave the queue otherwise
+        (polling with one call ``squeue --noheader --array --format=%i``).
+        Every job of a chain (``--repeat``, ``--serial``) waits for room in the queue.
+        Array tasks count individually: with ``--array`` the arrays have at most this many
+        tasks (see ``--array-max``). Use ``--log`` to record progress, and
+        ``--resume`` to restart an interrupted submission (see ``GooseSLURM.submit.Cap``).
+
+    --poll = FLOAT
+        Time (in seconds) between polls of the queue while it is full (``--max-queued`` only).
+        [default: 30]
+
+    --stagger = RATE
+        Spread the start of the jobs (to avoid that all jobs read their input at once),
+        by giving each job an increasing earliest start time (``sbatch --begin``).
+        The rate is either a number of jobs per unit of time, e.g. ``10/m`` or ``1/30s``,
+        or an I/O budget, e.g. ``2G/s``, combined with ``--stagger-read``
+        (see ``GooseSLURM.submit.rate``). The schedule starts when ``Gsub`` is called.
+
+    --stagger-read = SIZE
+        Amount of data that each job reads at its start, e.g. ``500M`` (``--stagger`` only).
+
+    --if-stale
+        Only submit job-scripts that are stale (requires ``--log``): whose last job did not
+        complete, whose outputs are missing, or whose inputs changed since the outputs were
+        written. Inputs and outputs are declared in the job-script (``#GSUB input=...`` and
+        ``#GSUB output=...``) or in a YAML file ``JOBSCRIPT.gsub``, see ``GooseSLURM.stale``.
+        Job-scripts with a pending or running job are skipped.
+        The signatures of the inputs are cached in ``LOG.stale``.
+
+    --retry-from = LOG
+        Resubmit the job-scripts in a log (see ``--log``) whose last job failed
+        (or only the specified job-scripts). The accounting record of all logged jobs is read
+        with one call to ``sacct`` (see ``GooseSLURM.retry``).
+        The new job-ids are appended to the same log.
+
+    --retry-state = STATE
+        State of the jobs to resubmit (``--retry-from`` only), e.g. ``TIMEOUT`` or ``TO``.
+        Can be repeated or comma separated.
+        [default: FAILED,NODE_FAIL,TIMEOUT,OUT_OF_MEMORY, if no ``--retry-exit-code`` is given]
+
+    --retry-exit-code = INT
+        Resubmit jobs that ended with this exit code (``--retry-from`` only).
+        Can be repeated or comma separated.
+
+    --retry-time = RULE
+        Escalate the time-limit of jobs that timed out (``--retry-from`` only),
+        relative to the time-limit of the job, e.g. ``x2`` (double) or ``+1h``.
+
+    --retry-mem = RULE
+        Escalate the memory of jobs that ran out of memory (``--retry-from`` only),
+        relative to the memory of the job, e.g. ``x1.5`` or ``+4G``.
+        Memory that was requested per CPU is escalated per CPU (``--mem-per-cpu``).
+
+    --avoid-bad-nodes
+        Exclude nodes with an abnormal failure rate (added to ``--exclude``).
+        The nodes are detected from the accounting records of the last day
+        (one call to ``sacct`` for all users), and cached for an hour
+        (see ``GooseSLURM.health``).
+        Note that, as any ``sbatch`` option, ``--exclude`` overrides that of the job-script.
+
+    --allow-duplicates
+        Submit job-scripts that are already pending or running (from the same directory).
+        By default such job-scripts are skipped: before submitting, the pending and running
+        jobs of the user are read with one call to ``squeue``.
+        Note that this does not apply to ``--array``, and that with ``--dry-run`` the queue is
+        not read (no job-scripts are skipped).
+
+    --strict
+        Refuse to submit if a job-script is already pending or running
+        (rather than skipping it).
+
+    --workflow = FILENAME
+        Submit a workflow: a graph of job-scripts with dependencies, specified in a YAML-file
+        (see ``GooseSLURM.workflow``). The job-scripts are sorted topologically and submitted
+        level-by-level, with the jobs in one level submitted concurrently.
+        If a log is specified (see ``--log``), the graph (with job-ids and dependencies)
+        is written to ``FILENAME.workflow``.
+
+    --max-dependencies = INT
+        Maximum number of dependencies of a job (``--workflow`` only).
+        Jobs with more dependencies depend on "barrier" jobs that each depend on part of the
+        dependencies. [default: 100]
+
+    --resume
+        Only submit job-scripts that have no pending, running, or completed job in the log
+        (see ``--log``). The state of all logged jobs is read using one call to ``squeue``
+        and one call to ``sacct`` (see ``GooseSLURM.status``).
+
+    --resume-failed = resubmit|skip
+        Resubmit job-scripts whose last job failed (``--resume`` only). [default: resubmit]
+
+    --resume-timeout = resubmit|skip
+        Resubmit job-scripts whose last job timed out (``--resume`` only). [default: resubmit]
+
+    --resume-unknown = resubmit|skip
+        Resubmit job-scripts whose jobs are unknown to ``squeue`` and ``sacct``
+        (``--resume`` only). [default: skip]
+
     -A, --account = ARG (sbatch option)
         Account name.
 
@@ -57,8 +234,10 @@ Options:
     --mem = ARG (sbatch option)
         Memory allocation.
 
-    -w, --wait (sbatch option)
-        Do not exit until the submitted job terminates.
+    -w, --wait
+        Submit all jobs, and then wait until they have all finished (see ``GooseSLURM.wait``).
+        The state of all jobs is polled collectively, with a few calls to ``squeue`` and
+        ``sacct`` per minute. Exits with a non-zero status if any job did not complete.
 
     -h, --help
         Show help.
@@ -72,18 +251,22 @@ Options:
 import argparse
 import os
 import re
+import shlex
 import subprocess
+import sys
 import time
 
-import tqdm
-
 from . import fileio
+from . import journal
+from . import submit
 from . import version
+from . import workflow
 
 
 def sbatch(options, verbose=False, dry_run=False):
     """
     Submit job and return the job-id.
+    Raises ``subprocess.CalledProcessError`` (with ``stderr``) if ``sbatch`` fails.
     """
 
     assert isinstance(options, list)
@@ -94,7 +277,16 @@ def sbatch(options, verbose=False, dry_run=False):
     if dry_run:
         return None
 
-    out = subprocess.check_output(["sbatch"] + options).decode("utf-8")
+    cmd = ["sbatch"] + options
+    ret = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    out = ret.stdout.decode("utf-8")
+    err = ret.stderr.decode("utf-8")
+
+    if len(err) > 0:
+        sys.stderr.write(err)
+
+    if ret.returncode != 0:
+        raise subprocess.CalledProcessError(ret.returncode, cmd, out, err)
 
     if verbose:
         print(out, end="")
@@ -104,8 +296,10 @@ def sbatch(options, verbose=False, dry_run=False):
 
 def read_log(files, logfile=None):
     """
-    Read existing log-file.
+    Read existing log-file (including its journal, see ``GooseSLURM.journal``).
     If the file does not exists an empty log is returned.
+    Files that are not in the log (e.g. as the log is shared with other submissions) get an
+    empty list.
 
     :param files: List of files to submit.
     :param logfile: Filename of the log-file.
@@ -117,23 +311,92 @@ def read_log(files, logfile=None):
     if logfile is None:
         return log
 
-    if not os.path.isfile(os.path.realpath(logfile)):
-        return log
-
-    log = fileio.YamlRead(logfile)
-
-    if not isinstance(log, dict):
-        raise OSError("Unable to interpret log file")
+    log.update(journal.read(logfile))
 
     for filename in files:
-        if filename not in log:
-            raise OSError(f'"{filename} not in log file"')
         if not isinstance(log[filename], list):
             raise OSError(f'Log of "{filename}" not interpretable')
 
     return log
 
 
+def header(filename):
+    r"""
+    Interpreter and ``#SBATCH`` options of a job-script.
+    Like ``sbatch`` the options are read until the first command.
+
+    :param filename: The job-script.
+    :return: ``(interpreter, [line, ...])``, e.g. ``("/bin/bash -l", ["#SBATCH --time=1:00:00"])``.
+    """
+
+    interpreter = "/bin/bash"
+    ret = []
+
+    with open(filename) as file:
+        for i, line in enumerate(file):
+            line = line.strip()
+            if i == 0 and line.startswith("#!"):
+                interpreter = line[2:].strip()
+            elif line.startswith("#SBATCH"):
+                ret.append(line)
+            elif len(line) > 0 and not line.startswith("#"):
+                break
+
+    return interpreter, ret
+
+
+def dispatcher(files, interpreter, options):
+    r"""
+    Job-script of a job array that runs one job-script per task
+    (from the directory in which it is stored).
+
+    :param files: List of job-scripts (task ``i`` runs ``files[i]``).
+    :param interpreter: Interpreter of the job-scripts, see ``header``.
+    :param options: ``#SBATCH`` lines, see ``header``.
+    :return: The job-script (as string).
+    """
+
+    dirs = [shlex.quote(os.path.dirname(os.path.abspath(file))) for file in files]
+    names = [shlex.quote(os.path.basename(file)) for file in files]
+
+    ret = [f"#!{interpreter}"]
+    ret += options
+    ret += [""]
+    ret += ["# job-scripts (and their directories) per array task, written by Gsub --array"]
+    ret += ["dirs=("] + [f"    {i}" for i in dirs] + [")"]
+    ret += ["scripts=("] + [f"    {i}" for i in names] + [")"]
+    ret += [""]
+    ret += ['cd "${dirs[$SLURM_ARRAY_TASK_ID]}" || exit 1']
+    ret += [f'exec {interpreter} "${{scripts[$SLURM_ARRAY_TASK_ID]}}"']
+
+    return "\n".join(ret) + "\n"
+
+
+def groups(files, size=None):
+    r"""
+    Group job-scripts with identical ``#SBATCH`` headers (and interpreter), see ``header``.
+
+    :param files: List of job-scripts.
+    :param size: Maximum number of job-scripts per group.
+    :return: List of ``(interpreter, options, [file, ...])``, in order of first appearance.
+    """
+
+    index = {}
+
+    for file in files:
+        interpreter, options = header(file)
+        index.setdefault((interpreter, tuple(options)), []).append(file)
+
+    ret = []
+
+    for (interpreter, options), group in index.items():
+        n = len(group) if not size else size
+        for i in range(0, len(group), n):
+            ret.append((interpreter, list(options), group[i:][:n]))
+
+    return ret
+
+
 def main(cli_args: list[str] = None):
     class Parser(argparse.ArgumentParser):
         def print_help(self):
@@ -145,9 +408,42 @@ def main(cli_args: list[str] = None):
     parser.add_argument("--verbose", action="store_true")
     parser.add_argument("-Q", "--quiet", action="store_true")
     parser.add_argument("-l", "--log", type=str)
-    parser.add_argument("--delay", type=float, default=0.1)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("-j", "--jobs", type=int, default=8)
+    parser.add_argument("--retry", type=int, default=5)
     parser.add_argument("-r", "--repeat", type=int, default=1)
     parser.add_argument("--serial", action="store_true")
+    parser.add_argument("--array", action="store_true")
+    parser.add_argument("--throttle", type=int)
+    parser.add_argument("--array-max", type=int, default=1000)
+    parser.add_argument("--requeue-until-done", type=str)
+    parser.add_argument("--requeue-signal", type=str, default="USR1")
+    parser.add_argument("--requeue-before", type=str, default="300")
+    parser.add_argument("--requeue-max", type=int)
+    parser.add_argument("--manifest", type=str)
+    parser.add_argument("--find", type=str)
+    parser.add_argument("--name", type=str, default="*.slurm")
+    parser.add_argument("--prune", type=str, action="append", default=[])
+    parser.add_argument("--skip-queued", action="store_true")
+    parser.add_argument("--max-queued", type=int)
+    parser.add_argument("--poll", type=float, default=30.0)
+    parser.add_argument("--stagger", type=str)
+    parser.add_argument("--stagger-read", type=str)
+    parser.add_argument("--if-stale", action="store_true")
+    parser.add_argument("--retry-from", type=str)
+    parser.add_argument("--retry-state", type=str, action="append", default=[])
+    parser.add_argument("--retry-exit-code", type=str, action="append", default=[])
+    parser.add_argument("--retry-time", type=str)
+    parser.add_argument("--retry-mem", type=str)
+    parser.add_argument("--avoid-bad-nodes", action="store_true")
+    parser.add_argument("--strict", action="store_true")
+    parser.add_argument("--allow-duplicates", action="store_true")
+    parser.add_argument("--workflow", type=str)
+    parser.add_argument("--max-dependencies", type=int, default=100)
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--resume-failed", choices=["resubmit", "skip"], default="resubmit")
+    parser.add_argument("--resume-timeout", choices=["resubmit", "skip"], default="resubmit")
+    parser.add_argument("--resume-unknown", choices=["resubmit", "skip"], default="skip")
     parser.add_argument("-A", "--account", type=str)
     parser.add_argument("-b", "--begin", type=str)
     parser.add_argument("--comment", type=str)
@@ -167,30 +463,697 @@ def main(cli_args: list[str] = None):
     dargs = vars(args)
     down = ["account", "begin", "comment", "constraint", "dependency", "exclude", "export", "mem"]
 
+    if args.manifest:
+        if len(args.files) > 0:
+            parser.error("Specify either job-scripts or --manifest")
+        if args.array or args.serial or args.workflow or args.resume or args.if_stale:
+            parser.error(
+                "--manifest cannot be combined with --array, --serial, --workflow, --resume, "
+                "--if-stale"
+            )
+
+    if args.find:
+        if len(args.files) > 0 or args.manifest or args.workflow:
+            parser.error("--find cannot be combined with job-scripts, --manifest, --workflow")
+        if args.array or args.serial or args.resume or args.if_stale:
+            args.files = list(_find(args))
+            args.find = None
+
+    if args.retry_from:
+        if args.manifest or args.find or args.workflow or args.array:
+            parser.error(
+                "--retry-from cannot be combined with --manifest, --find, --workflow, --array"
+            )
+        if args.resume or args.if_stale:
+            parser.error("--retry-from cannot be combined with --resume, --if-stale")
+        if args.log and args.log != args.retry_from:
+            parser.error("--retry-from appends to its own log, specify no other --log")
+        args.log = args.retry_from
+        if len(args.files) == 0:
+            args.files = list(journal.read(args.retry_from))
+
+    if args.workflow:
+        if len(args.files) > 0:
+            parser.error("Specify either job-scripts or --workflow")
+        if args.array or args.serial or args.repeat != 1 or args.resume or args.dependency:
+            parser.error(
+                "--workflow cannot be combined with --array, --serial, --repeat, --resume, "
+                "--dependency"
+            )
+        graph = workflow.read(args.workflow)
+        levels = workflow.levels(graph)
+        args.files = list(dict.fromkeys(job["script"] for job in graph.values()))
+
     log = read_log(args.files, args.log)
-    jobid = ""
 
     for filename in args.files:
         if not os.path.isfile(filename):
             raise OSError(f'"{filename}" does not exist')
 
-    pbar = tqdm.tqdm(args.files, disable=args.quiet)
-
-    for ifile, file in enumerate(pbar):
-        for rep in range(int(args.repeat)):
-            pbar.set_description(file)
-            path, name = os.path.split(file)
-            options = ["--chdir", os.path.abspath(path)]
-            if args.wait:
-                options += ["--wait"]
-            for opt in down:
-                if dargs[opt]:
-                    options += [f"--{opt:s}", dargs[opt]]
-            if rep or (args.serial and ifile):
-                options += ["--dependency", str(jobid)]
-            options += [name]
-            jobid = sbatch(options, verbose=args.verbose, dry_run=args.dry_run)
-            log[file] += [jobid]
-            if args.log:
-                fileio.YamlDump(args.log, log)
-            time.sleep(float(args.delay))
+    files = args.files
+
+    if args.max_queued and args.array:
+        args.array_max = min(args.array_max, args.max_queued)
+
+    if args.requeue_until_done and (args.array or args.workflow or args.repeat != 1):
+        parser.error("--requeue-until-done cannot be combined with --array, --workflow, --repeat")
+
+    if args.resume:
+        if not args.log:
+            parser.error("--resume requires --log")
+        files = _resume(args, log)
+
+    if args.if_stale:
+        if not args.log:
+            parser.error("--if-stale requires --log")
+        if args.workflow:
+            parser.error("--if-stale cannot be combined with --workflow")
+        files = _stale(args, log, files)
+
+    overrides = {}
+
+    if args.retry_from:
+        try:
+            overrides = _retry(args, log)
+        except ValueError as error:
+            parser.error(str(error))
+        files = list(overrides)
+
+    if args.stagger:
+        if args.array or args.workflow or args.begin:
+            parser.error("--stagger cannot be combined with --array, --workflow, --begin")
+        try:
+            stagger = submit.rate(args.stagger, args.stagger_read)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.avoid_bad_nodes:
+        args.exclude = _avoid(args)
+
+    # options shared by all jobs
+    common = []
+    for opt in down:
+        if dargs[opt]:
+            common += [f"--{opt:s}", dargs[opt]]
+
+    # jobs: a job is repeated (using dependencies), "--serial" chains all jobs
+    if args.array:
+        jobs = _array(args, files)
+    elif args.manifest:
+        jobs = (_job(args, file, options) for file, options in manifest(args.manifest))
+    elif args.find:
+        jobs = (_job(args, file) for file in _find(args))
+    elif args.workflow:
+        jobs = []
+        for name, job in graph.items():
+            path, script = os.path.split(job["script"])
+            workdir = os.path.abspath(path)
+            options = ["--chdir", workdir] + job["options"]
+            files = [job["script"]]
+            jobs += [
+                {
+                    "options": options,
+                    "script": script,
+                    "files": files,
+                    "name": name,
+                    "workdir": workdir,
+                }
+            ]
+    else:
+        jobs = [_job(args, file, overrides.get(file, [])) for file in files]
+
+    # skip job-scripts that are already pending or running (in the same directory)
+    index = {}
+    skipped = []
+
+    if not args.array and not args.allow_duplicates and not args.dry_run:
+        index = _index(args)
+        if not args.workflow:
+            jobs = _unique(args, jobs, index, skipped)
+
+    # with "--manifest" or "--find" the jobs are generated while submitting
+    chains = ([job] * int(args.repeat) for job in jobs)
+
+    if args.serial:
+        chains = [[job for chain in chains for job in chain]]
+
+    chains = ([dict(job, depend=i > 0) for i, job in enumerate(chain)] for chain in chains)
+
+    # "--stagger": the first job of each chain gets an increasing start time
+    if args.stagger:
+        start = time.time()
+        chains = (
+            [dict(chain[0], begin=submit.begin(start, i, stagger))] + chain[1:]
+            for i, chain in enumerate(chains)
+        )
+
+    if args.manifest:
+        total = manifest_size(args.manifest)
+        total = total * int(args.repeat) if total is not None else None
+    elif args.find:
+        total = None
+    else:
+        chains = list(chains)
+        total = sum(len(chain) for chain in chains)
+        if len(skipped) > 0 and not args.quiet:
+            print(f"Skipping {len(skipped):d} job-script(s) that are already in the queue")
+        if args.stagger and len(chains) > 0 and not args.quiet:
+            print(f"Stagger: {len(chains):d} jobs, start times until {chains[-1][0]['begin']}")
+
+    import tqdm
+
+    pbar = tqdm.tqdm(total=total, disable=args.quiet)
+
+    def _submit(job, dependency):
+        options = job["options"] + common
+        if job["depend"]:
+            options += ["--dependency", str(dependency)]
+        elif job.get("dependency"):
+            options += ["--dependency", job["dependency"]]
+        if job.get("begin"):
+            options += ["--begin", job["begin"]]
+        options += job.get("overrides", []) + [job["script"]]
+        return sbatch(options, verbose=args.verbose, dry_run=args.dry_run)
+
+    jobids = {}
+    submitted = []
+
+    def _log(job, jobid):
+        pbar.set_description(job["script"])
+        pbar.update()
+        if cap is not None:
+            cap.release(len(job["files"]))
+        if "name" in job:
+            jobids[job["name"]] = jobid if jobid is not None else f"{{{job['name']}}}"
+        if args.array and jobid is not None:
+            ids = [f"{jobid}_{task:d}" for task in range(len(job["files"]))]
+        else:
+            ids = [jobid] * len(job["files"])
+        if args.wait:
+            submitted.extend(ids)
+        if log is None:
+            return
+        for file, i in zip(job["files"], ids):
+            log.append(file, i)
+
+    sequential = args.dry_run or args.verbose
+    controller = submit.Controller(
+        maximum=1 if sequential else args.jobs,
+        delay=args.delay,
+    )
+    log = journal.Journal(args.log) if args.log else None
+    cap = None
+
+    if args.max_queued and not args.dry_run:
+        from . import squeue
+
+        cap = submit.Cap(args.max_queued, squeue.count, args.poll)
+
+    def gate(job):
+        if cap is not None:
+            cap.acquire(len(job["files"]))
+
+    try:
+        if args.workflow:
+            _workflow(args, graph, levels, chains, jobids, controller, _submit, _log, index, gate)
+        else:
+            submit.run(chains, _submit, _log, controller=controller, retries=args.retry, gate=gate)
+    finally:
+        pbar.close()
+        if log is not None:
+            log.close()
+
+    if args.wait and not args.dry_run:
+        return _wait(args, submitted)
+
+
+def _wait(args, jobids):
+    r"""
+    Wait until all submitted jobs have finished, see ``Gsub --wait``.
+
+    :return: Exit status: ``0`` if all jobs completed successfully, ``1`` otherwise.
+    """
+
+    import tqdm
+
+    from . import monitor
+    from . import status
+
+    pbar = tqdm.tqdm(total=len(set(jobids)), disable=args.quiet, desc="waiting")
+
+    def _progress(done, pending):
+        pbar.update(len(done) - pbar.n)
+
+    try:
+        states = monitor.wait(jobids, callback=_progress)
+    finally:
+        pbar.close()
+
+    count = {}
+
+    for state in states.values():
+        category = status.category(state)
+        count[category] = count.get(category, 0) + 1
+
+    if not args.quiet:
+        summary = ", ".join(f"{count[i]:d} {i}" for i in status.categories if i in count)
+        print(f"Finished: {summary}")
+
+    return 0 if list(count) in [[], ["completed"]] else 1
+
+
+def _workflow(
+    args, graph, levels, chains, jobids, controller, func, callback, index=None, gate=None
+):
+    r"""
+    Submit a workflow level-by-level, see ``Gsub --workflow``.
+    Jobs that are already in the queue (see ``queue_index``) are not submitted,
+    jobs that depend on them depend on the job in the queue.
+    """
+
+    if index is None:
+        index = {}
+
+    jobs = {chain[0]["name"]: chain[0] for chain in chains}
+    barriers = []
+
+    def _barrier(dependency):
+        options = ["--job-name", "Gsub_barrier", "--time", "00:01:00", "--ntasks", "1"]
+        options += ["--output", "/dev/null", "--dependency", dependency, "--wrap", "true"]
+        if args.account:
+            options += ["--account", args.account]
+        jobid = submit.call(
+            lambda: sbatch(options, verbose=args.verbose, dry_run=args.dry_run),
+            controller,
+            args.retry,
+        )
+        jobid = jobid if jobid is not None else f"{{barrier_{len(barriers):d}}}"
+        barriers.append({"jobid": jobid, "dependency": dependency})
+        return jobid
+
+    def _record():
+        if not args.log or args.dry_run:
+            return
+        record = {
+            name: {
+                "script": job["script"],
+                "jobid": jobids.get(name),
+                "dependency": jobs[name].get("dependency"),
+            }
+            for name, job in graph.items()
+        }
+        fileio.YamlDump(f"{args.log}.workflow", {"jobs": record, "barriers": barriers})
+
+    try:
+        for level in levels:
+            for name in list(level):
+                jobid = index.get(_key(jobs[name]))
+                if jobid is not None:
+                    if args.strict:
+                        raise OSError(f'"{graph[name]["script"]}" is already in the queue')
+                    jobids[name] = jobid
+                    level = [i for i in level if i != name]
+                    continue
+                deps = workflow.dependencies(graph[name], jobids)
+                deps = workflow.reduce(deps, args.max_dependencies, _barrier)
+                if len(deps) > 0:
+                    jobs[name]["dependency"] = workflow.dependency(deps)
+            chains = [[jobs[name]] for name in level]
+            submit.run(chains, func, callback, controller=controller, retries=args.retry, gate=gate)
+    finally:
+        _record()
+
+
+def _array(args, files):
+    r"""
+    Write the dispatchers of the job arrays, see ``Gsub --array``.
+
+    :return: List of jobs, one per array.
+    """
+
+    throttle = 1 if args.serial else args.throttle
+    ret = []
+
+    for igroup, (interpreter, header, files) in enumerate(groups(files, args.array_max)):
+        name = f"Gsub_array_{igroup:d}.slurm"
+
+        if not args.dry_run:
+            with open(name, "w") as file:
+                file.write(dispatcher(files, interpreter, header))
+
+        array = f"0-{len(files) - 1:d}"
+        if throttle:
+            array += f"%{throttle:d}"
+
+        ret += [{"options": ["--array", array], "script": name, "files": files}]
+
+    return ret
+
+
+def manifest(filename):
+    r"""
+    Read a manifest: one job-script per line, optionally followed by ``sbatch`` options
+    (that override those of the job-script and of ``Gsub``), e.g.::
+
+        path/to/job.slurm
+        path/to/other.slurm --mem 4G --time 2h
+
+    Empty lines and lines starting with ``#`` are ignored.
+    The manifest is read line-by-line (as generator).
+    Job-scripts are checked to exist as they are read.
+
+    :param filename: The manifest (``"-"`` for stdin).
+    :return: Generator of ``(file, options)``.
+    """
+
+    def _read(stream):
+        for line in stream:
+            line = line.strip()
+            if len(line) == 0 or line.startswith("#"):
+                continue
+            if " " in line or "\t" in line or "'" in line or '"' in line:
+                file, *options = shlex.split(line)
+            else:
+                file, options = line, []
+            if not os.path.isfile(file):
+                raise OSError(f'"{file}" does not exist')
+            yield file, options
+
+    if filename == "-":
+        yield from _read(sys.stdin)
+        return
+
+    with open(filename) as stream:
+        yield from _read(stream)
+
+
+def manifest_size(filename):
+    r"""
+    Number of job-scripts in a manifest, see ``manifest``.
+
+    :param filename: The manifest (``None`` is returned for ``"-"``, stdin).
+    :return: Number of job-scripts.
+    """
+
+    if filename == "-":
+        return None
+
+    with open(filename) as stream:
+        return sum(1 for line in stream if len(line.strip()) > 0 and line.strip()[0] != "#")
+
+
+def _stale(args, log, files):
+    r"""
+    Select the job-scripts that are stale, see ``Gsub --if-stale``.
+    The inputs of the selected job-scripts are recorded in the cache ``LOG.stale``.
+
+    :return: List of job-scripts.
+    """
+
+    from . import stale
+    from . import status
+
+    last = {file: log[file][-1] for file in files if len(log[file]) > 0}
+    categories = status.classify([jobid for jobid in last.values() if jobid is not None])
+    cachefile = f"{args.log}.stale"
+    cache = fileio.YamlRead(cachefile) if os.path.isfile(cachefile) else {}
+    ret = []
+
+    for file in files:
+        category = categories.get(str(last.get(file)), "unknown")
+        if category in ["pending", "running"]:
+            continue
+        if stale.is_stale(file, category == "completed", cache):
+            ret.append(file)
+            stale.record(file, cache)
+
+    if not args.quiet:
+        print(f"Stale: submitting {len(ret):d} of {len(files):d} job-scripts")
+
+    if not args.dry_run and len(ret) > 0:
+        fileio.YamlDump(cachefile, cache)
+
+    return ret
+
+
+def _retry(args, log):
+    r"""
+    Select the job-scripts to resubmit, see ``Gsub --retry-from``.
+
+    :return: Dictionary with the job-scripts, and for each the options to escalate its resources.
+    """
+
+    from . import retry
+
+    def _split(values):
+        return [i.strip() for value in values for i in value.split(",") if len(i.strip()) > 0]
+
+    states = _split(args.retry_state)
+    codes = [int(i) for i in _split(args.retry_exit_code)]
+
+    if len(states) == 0 and len(codes) == 0:
+        states = retry.states
+
+    last = {file: log[file][-1] for file in args.files if len(log[file]) > 0}
+    records = retry.read([jobid for jobid in last.values() if jobid is not None])
+    ret = {}
+    count = {}
+
+    for file in args.files:
+        record = records.get(str(last.get(file)))
+        if record is None or not retry.select(record, states, codes):
+            continue
+        ret[file] = retry.resources(record, time=args.retry_time, mem=args.retry_mem)
+        state = retry.state(record["State"])
+        count[state] = count.get(state, 0) + 1
+
+    if not args.quiet:
+        summary = "".join(f", {n:d} {state}" for state, n in sorted(count.items()))
+        escalated = sum(1 for options in ret.values() if len(options) > 0)
+        print(
+            f"Retry: submitting {len(ret):d} of {len(args.files):d} job-scripts{summary}"
+            f" ({escalated:d} with escalated resources)"
+        )
+
+    return ret
+
+
+def _avoid(args):
+    r"""
+    Add the bad nodes to ``--exclude``, see ``Gsub --avoid-bad-nodes``.
+    If the bad nodes cannot be detected, a warning is printed and no nodes are added.
+
+    :return: Argument of ``--exclude``.
+    """
+
+    from . import health
+
+    try:
+        nodes = health.bad()
+    except (OSError, subprocess.CalledProcessError) as error:
+        print(f"Gsub: unable to detect bad nodes, sacct failed: {error}", file=sys.stderr)
+        return args.exclude
+
+    if len(nodes) > 0 and not args.quiet:
+        print(f"Excluding {len(nodes):d} bad node(s): {', '.join(nodes)}")
+
+    return health.exclude(args.exclude, nodes)
+
+
+def _find(args):
+    r"""
+    Find job-scripts, see ``Gsub --find``.
+
+    :return: Generator of job-scripts.
+    """
+
+    from . import files
+
+    exclude = files.prune() + args.prune
+    queued = set()
+
+    if args.skip_queued:
+        queued = {workdir for _, workdir in queue_index()}
+
+    for file in files.find(args.find, args.name, exclude):
+        if os.path.dirname(os.path.abspath(file)) not in queued:
+            yield file
+
+
+def queue_index(user=None):
+    r"""
+    Index of the pending and running jobs of a user, from one ``squeue`` call.
+
+    :param user: The user (default: the current user).
+    :return: Dictionary ``{(command, workdir): jobid}``.
+    """
+
+    import getpass
+
+    from . import squeue
+    from . import status
+
+    ret = {}
+
+    for line in squeue.read(user=user or getpass.getuser()):
+        if status.category(line["ST"]) in ["pending", "running"]:
+            workdir = os.path.normpath(line["WORK_DIR"])
+            ret[(os.path.normpath(line["COMMAND"]), workdir)] = line["JOBID"]
+
+    return ret
+
+
+def _key(job):
+    r"""
+    Key of a job in ``queue_index``.
+    """
+
+    return (os.path.normpath(os.path.join(job["workdir"], job["script"])), job["workdir"])
+
+
+def _index(args):
+    r"""
+    ``queue_index`` for the duplicate guard of Gsub (empty if the queue cannot be read).
+    """
+
+    try:
+        return queue_index()
+    except (OSError, subprocess.CalledProcessError) as error:
+        if args.strict:
+            raise
+        print(f"Gsub: unable to check for duplicates, squeue failed: {error}", file=sys.stderr)
+        return {}
+
+
+def _unique(args, jobs, index, skipped):
+    r"""
+    Skip jobs of which an identical job-script is pending or running in the same directory
+    (raise an ``OSError`` with ``--strict``).
+
+    :param jobs: Iterable of jobs.
+    :param index: See ``queue_index``.
+    :param skipped: List to which the skipped jobs are appended.
+    :return: Generator of jobs.
+    """
+
+    for job in jobs:
+        jobid = index.get(_key(job))
+        if jobid is None:
+            yield job
+        elif args.strict:
+            raise OSError(f'"{job["files"][0]}" is already in the queue (job {jobid})')
+        else:
+            skipped.append(job)
+
+
+def _job(args, file, options=None):
+    r"""
+    Job that submits a job-script (``options`` are appended to the ``sbatch`` options).
+
+    :return: Job.
+    """
+
+    if args.requeue_until_done:
+        ret = _requeue(args, file)
+    else:
+        path, name = os.path.split(file)
+        workdir = os.path.abspath(path)
+        ret = {"options": ["--chdir", workdir], "script": name, "files": [file], "workdir": workdir}
+
+    if options:
+        ret["overrides"] = options
+
+    return ret
+
+
+def _requeue(args, file):
+    r"""
+    Write the wrapper that requeues a job-script until done, see ``Gsub --requeue-until-done``.
+
+    :return: Job.
+    """
+
+    from . import scripts
+
+    path, name = os.path.split(file)
+    interpreter, options = header(file)
+    wrapper = f"Gsub_requeue_{name}"
+    sbatch = {}
+
+    if not any(re.match(r"#SBATCH\s+(-J|--job-name)", line) for line in options):
+        sbatch["job-name"] = name
+
+    if not args.dry_run:
+        with open(os.path.join(path, wrapper), "w") as out:
+            out.write(
+                scripts.requeue(
+                    script=name,
+                    marker=args.requeue_until_done.replace("{name}", name),
+                    interpreter=interpreter,
+                    signal=args.requeue_signal,
+                    before=args.requeue_before,
+                    maximum=args.requeue_max,
+                    header=options,
+                    **sbatch,
+                )
+            )
+
+    workdir = os.path.abspath(path)
+    return {"options": ["--chdir", workdir], "script": wrapper, "files": [file], "workdir": workdir}
+
+
+def file_status(categories):
+    r"""
+    Status of a job-script from the status of its jobs (see ``GooseSLURM.status``).
+
+    :param categories: Category of each job of the job-script (in order of submission).
+    :return:
+        ``"pending"`` or ``"running"`` if any job is in the queue,
+        otherwise ``"completed"`` if any job completed,
+        otherwise the category of the last job (``"new"`` if there are no jobs).
+    """
+
+    for category in ["running", "pending", "completed"]:
+        if category in categories:
+            return category
+
+    if len(categories) == 0:
+        return "new"
+
+    return categories[-1]
+
+
+def _resume(args, log):
+    r"""
+    Select the job-scripts to (re)submit, see ``Gsub --resume``.
+
+    :return: List of job-scripts.
+    """
+
+    from . import status
+
+    jobids = [str(jobid) for file in args.files for jobid in log[file] if jobid is not None]
+    categories = status.classify(jobids)
+    resubmit = {
+        "new": True,
+        "failed": args.resume_failed == "resubmit",
+        "timeout": args.resume_timeout == "resubmit",
+        "unknown": args.resume_unknown == "resubmit",
+    }
+
+    ret = []
+    count = {}
+
+    for file in args.files:
+        jobs = [categories[str(jobid)] for jobid in log[file] if jobid is not None]
+        category = file_status(jobs)
+        count[category] = count.get(category, 0) + 1
+        if resubmit.get(category, False):
+            ret.append(file)
+
+    if not args.quiet:
+        order = ["new"] + status.categories
+        summary = ", ".join(f"{count[i]:d} {i}" for i in order if i in count)
+        print(f"Resume: {summary}; submitting {len(ret):d} of {len(args.files):d} job-scripts")
+
+    return ret
@@ -0,0 +1,315 @@
+r"""
+Index for shell completion of job-ids, users, partitions, accounts, and nodes.
+
+The index is stored (as JSON) in ``$GOOSESLURM_CACHE/completion.json``, with
+``$GOOSESLURM_CACHE`` defaulting to ``$XDG_CACHE_HOME/GooseSLURM`` (or ``~/.cache/GooseSLURM``).
+It is updated by every live read of ``squeue`` (``GooseSLURM.squeue.read``)
+and ``sinfo`` (``GooseSLURM.sinfo.read``), e.g. by ``Gstat`` or ``Ginfo``.
+Completions are answered from the index without calling Slurm.
+If the index is older than ``ttl`` seconds it is refreshed in the background
+(at most one refresh at a time), such that the next completion is up-to-date.
+Only if there is no index at all, the refresh is done before answering.
+
+Only the job-ids of the current user are stored.
+"""
+
+import json
+import os
+import time
+
+ttl = 30
+
+kinds = ["jobid", "user", "partition", "account", "node"]
+
+# fields of "squeue" and "sinfo" stored for each kind
+_fields = {
+    "squeue": {"user": "USER", "partition": "PARTITION", "account": "ACCOUNT"},
+    "sinfo": {"partition": "PARTITION", "node": "HOSTNAMES"},
+}
+
+# option (of each command) whose argument is completed, ``None`` for positional arguments
+_gstat = {
+    "-u": "user",
+    "--user": "user",
+    "-j": "jobid",
+    "--jobid": "jobid",
+    "-a": "account",
+    "--account": "account",
+    "-p": "partition",
+    "--partition": "partition",
+    "--host": "node",
+    None: "jobid",
+}
+
+options = {
+    "Gstat": _gstat,
+    "Gdel": _gstat,
+    "Ginfo": {
+        "-u": "user",
+        "--user": "user",
+        "-j": "jobid",
+        "--jobid": "jobid",
+        "-p": "partition",
+        "--partition": "partition",
+        "--host": "node",
+    },
+    "Gps": {
+        "-u": "user",
+        "--user": "user",
+    },
+    "Gacct": {
+        "-u": "user",
+        "--user": "user",
+        "-A": "account",
+        "--account": "account",
+        "-r": "partition",
+        "--partition": "partition",
+        "-N": "node",
+        "--nodelist": "node",
+        None: "jobid",
+    },
+}
+
+
+def path():
+    r"""
+    Path of the index.
+    """
+
+    cache = os.environ.get("GOOSESLURM_CACHE")
+
+    if not cache:
+        root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache = os.path.join(root, "GooseSLURM")
+
+    return os.path.join(cache, "completion.json")
+
+
+def _user():
+    import pwd
+
+    return pwd.getpwuid(os.getuid())[0]
+
+
+def read():
+    r"""
+    Read the index.
+
+    :return:
+        Index per source (``"squeue"``, ``"sinfo"``):
+        the time of the read (``"time"``), and the sorted values per kind.
+        For example: ``{"squeue": {"time": 1.7e9, "jobid": ["1234", ...], ...}, ...}``.
+        Empty if there is no (readable) index.
+    """
+
+    try:
+        with open(path()) as file:
+            ret = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(ret, dict):
+        return {}
+
+    return ret
+
+
+def update(squeue=None, sinfo=None, now=None):
+    r"""
+    Update the index from the output of ``squeue`` and/or ``sinfo``.
+    Failures to write the index are ignored.
+
+    :param squeue: Output of ``GooseSLURM.squeue.read`` (list of dictionaries).
+    :param sinfo: Output of ``GooseSLURM.sinfo.read`` (list of dictionaries).
+    :param now: Time of the read (default: now).
+    """
+
+    if now is None:
+        now = time.time()
+
+    index = read()
+
+    for source, lines in [("squeue", squeue), ("sinfo", sinfo)]:
+        if lines is None:
+            continue
+        entry = {"time": now}
+        for kind, field in _fields[source].items():
+            values = {str(line.get(field, "")).strip().rstrip("*") for line in lines}
+            entry[kind] = sorted(values - {"", "(null)"})
+        if source == "squeue":
+            user = _user()
+            jobid = {str(line["JOBID"]) for line in lines if line.get("USER") == user}
+            entry["jobid"] = sorted(jobid, key=lambda i: (len(i), i))
+        index[source] = entry
+
+    dirname = os.path.dirname(path())
+    temp = f"{path()}.{os.getpid()}"
+
+    try:
+        os.makedirs(dirname, exist_ok=True)
+        with open(temp, "w") as file:
+            json.dump(index, file)
+        os.replace(temp, path())
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+
+def refresh(sources=None):
+    r"""
+    Refresh the index by reading ``squeue`` and/or ``sinfo``.
+    Sources that cannot be read are skipped.
+
+    :param sources: List of sources to read (default: ``["squeue", "sinfo"]``).
+    """
+
+    from . import sinfo
+    from . import squeue
+
+    if sources is None:
+        sources = list(_fields)
+
+    for module in [squeue, sinfo]:
+        if module.__name__.split(".")[-1] not in sources:
+            continue
+        try:
+            module.read()
+        except Exception:
+            pass
+
+
+def _lock():
+    return path() + ".lock"
+
+
+def _refresh_background(sources):
+    r"""
+    Refresh the index in a detached process, unless a (recent) refresh is running.
+    """
+
+    import subprocess
+    import sys
+
+    lock = _lock()
+
+    try:
+        if time.time() - os.path.getmtime(lock) < 2 * ttl:
+            return
+        os.remove(lock)
+    except OSError:
+        pass
+
+    try:
+        os.makedirs(os.path.dirname(lock), exist_ok=True)
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except OSError:
+        return
+
+    code = (
+        "import os\n"
+        "from GooseSLURM import completion\n"
+        "try:\n"
+        f"    completion.refresh({sources!r})\n"
+        "finally:\n"
+        f"    os.remove({lock!r})\n"
+    )
+
+    subprocess.Popen(
+        [sys.executable, "-c", code],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def complete(kind, prefix="", ttl=ttl, now=None):
+    r"""
+    Completions from the index.
+
+    :param kind: ``"jobid"``, ``"user"``, ``"partition"``, ``"account"``, or ``"node"``.
+    :param prefix: Only return values starting with this prefix.
+    :param ttl: Refresh the index (in the background) if it is older than this (in seconds).
+    :param now: Current time (default: now).
+    :return: List of values.
+    """
+
+    if kind not in kinds:
+        raise ValueError(f'Unknown kind "{kind}"')
+
+    if now is None:
+        now = time.time()
+
+    index = read()
+    sources = [source for source, fields in _fields.items() if kind in fields]
+
+    if kind == "jobid":
+        sources = ["squeue"]
+
+    if not any(source in index for source in sources):
+        refresh(sources)
+        index = read()
+    else:
+        stale = [s for s in sources if now - index.get(s, {}).get("time", 0) > ttl]
+        if len(stale) > 0:
+            _refresh_background(stale)
+
+    ret = set()
+
+    for source in sources:
+        ret.update(index.get(source, {}).get(kind, []))
+
+    return sorted(
+        (value for value in ret if value.startswith(prefix)),
+        key=lambda i: (len(i), i) if kind == "jobid" else i,
+    )
+
+
+def script(shell="bash"):
+    r"""
+    Completion script.
+
+    :param shell: ``"bash"`` or ``"zsh"``.
+    :return: The script (as string), to be evaluated by the shell.
+    """
+
+    if shell not in ["bash", "zsh"]:
+        raise ValueError(f'Unknown shell "{shell}"')
+
+    cases = []
+
+    for command, option in options.items():
+        for name, kind in option.items():
+            if name is not None:
+                cases.append(f'        "{command} {name}") kind={kind} ;;')
+
+    positional = [command for command, option in options.items() if None in option]
+
+    ret = [
+        "_GooseSLURM_complete()",
+        "{",
+        '    local cur="${COMP_WORDS[COMP_CWORD]}"',
+        '    local prev="${COMP_WORDS[COMP_CWORD-1]}"',
+        '    local cmd="${COMP_WORDS[0]##*/}"',
+        "    local kind",
+        '    case "$cmd $prev" in',
+        *cases,
+        "        *)",
+        '            case "$cur" in -*) return ;; esac',
+        '            case "$cmd" in',
+        f"                {'|'.join(positional)}) kind=jobid ;;",
+        "                *) return ;;",
+        "            esac",
+        "            ;;",
+        "    esac",
+        '    COMPREPLY=($(Gcomplete "$kind" "$cur" 2>/dev/null))',
+        "}",
+        f"complete -o default -F _GooseSLURM_complete {' '.join(options)}",
+    ]
+
+    if shell == "zsh":
+        ret = ["autoload -U +X bashcompinit && bashcompinit"] + ret
+
+    return "\n".join(ret) + "\n"
@@ -2,6 +2,15 @@ from __future__ import annotations
 
 import re
 
+# units of the human-readable conversion (see ``GooseSLURM.duration.asHuman``),
+# as ``(value, unit)`` from the biggest to the smallest unit
+units = (
+    (24 * 60 * 60, "d"),
+    (60 * 60, "h"),
+    (60, "m"),
+    (1, "s"),
+)
+
 
 def asSeconds(data: str | float | int, default: int = None) -> int | float:
     r"""
@@ -35,10 +44,10 @@ def asSeconds(data: str | float | int, default: int = None) -> int | float:
     if isinstance(data, int) or isinstance(data, float):
         return data
 
-    if re.match(r"^[0-9]*\.[0-9]*$", data):
+    if re.match(r"^([0-9]+\.[0-9]*|\.[0-9]+)$", data):
         return float(data)
 
-    if re.match(r"^[0-9]*$", data):
+    if re.match(r"^[0-9]+$", data):
         return int(data)
 
     # convert SLURM time string (e.g. "1-00:00:00")
@@ -81,7 +90,7 @@ def asSeconds(data: str | float | int, default: int = None) -> int | float:
         return int(t[0]) * 60 + int(t[1])
 
     # convert humanly readable time (e.g. "1d")
-    if re.match(r"^[0-9]*\.?[0-9]*[a-zA-Z]$", data):
+    if re.match(r"^([0-9]+\.?[0-9]*|\.[0-9]+)[a-zA-Z]$", data):
         if data[-1] == "d":
             return float(data[:-1]) * float(60 * 60 * 24)
         elif data[-1] == "h":
@@ -162,13 +171,6 @@ def asHuman(data, precision=None):
     if data is None:
         return ""
 
-    units = (
-        (24 * 60 * 60, "d"),
-        (60 * 60, "h"),
-        (60, "m"),
-        (1, "s"),
-    )
-
     for val, unit in units:
         if abs(data) >= val:
             return asUnit(float(data) / float(val), unit, precision)
@@ -176,6 +178,71 @@ def asHuman(data, precision=None):
     return asUnit(float(data), "s", precision)
 
 
+def asHumanArray(data, precision=None):
+    r"""
+    Vectorized version of ``GooseSLURM.duration.asHuman``:
+    convert a whole column of times at once (see ``GooseSLURM.duration.asUnitArray``).
+    Entries that are not numeric are converted using ``GooseSLURM.duration.asSeconds``,
+    entries that cannot be converted (e.g. ``None``) are converted to an empty string.
+
+    :arguments:
+
+        **data** (``<list>``)
+            Times in seconds.
+
+        **precision** (``<int>``)
+            The precision with which to print, see ``GooseSLURM.duration.asHuman``.
+
+    :returns:
+
+        ``<list<str>>``
+            The rich-strings.
+    """
+
+    if not set(map(type, data)).issubset({int, float}):
+        data = [asSeconds(i, default=float("nan")) if i is not None else float("nan") for i in data]
+
+    return asUnitArray(data, units, precision)
+
+
+def asUnitArray(data, units, precision):
+    r"""
+    Vectorized version of ``GooseSLURM.duration.asUnit``, selecting the biggest possible unit.
+    Shared by ``GooseSLURM.duration.asHumanArray`` and ``GooseSLURM.memory.asHumanArray``
+    (used by ``GooseSLURM.table`` to convert whole columns).
+
+    :param data: List of numbers (``NaN`` for missing values).
+    :param units: List of ``(value, unit)``, from the biggest to the smallest unit.
+    :param precision: The precision with which to print (``None`` for automatic precision).
+    :return: List of strings (empty for missing values).
+    """
+
+    # format of small (as "asUnit": one decimal if the rounded value is below ten) and big values
+    if precision:
+        fmt = [(val, f"%.{precision:d}f{unit}", f"%.{precision:d}f{unit}") for val, unit in units]
+    else:
+        fmt = [(val, f"%.1f{unit}", f"%.0f{unit}") for val, unit in units]
+
+    smallest = (1,) + fmt[-1][1:]
+    ret = []
+    append = ret.append
+
+    for x in data:
+        if x != x:
+            append("")
+            continue
+        a = x if x >= 0 else -x
+        for val, small, big in fmt:
+            if a >= val:
+                break
+        else:
+            val, small, big = smallest
+        x = x / val
+        append(small % x if -9.5 < x < 9.5 else big % x)
+
+    return ret
+
+
 def asSlurm(data):
     r"""
     Convert to a SLURM time string. For example ``"1d"`` -> ``"1-00:00:00"``.
@@ -0,0 +1,137 @@
+r"""
+Write tables in machine-readable formats (or in a compact plain layout).
+Contrary to ``GooseSLURM.table`` no colors or width fitting are applied.
+The machine-readable formats write the raw values (e.g. seconds and bytes rather than
+human-readable strings, see ``GooseSLURM.export.raw``),
+while the plain layout writes the text of each cell (e.g. ``"1.5h"`` for a
+``GooseSLURM.rich.Duration``).
+"""
+
+import csv
+import io
+import itertools
+import json
+import sys
+
+from . import output
+from . import rich
+
+formats = ["csv", "tsv", "json", "ndjson", "plain"]
+
+
+def raw(value):
+    r"""
+    Raw value of a cell.
+    For ``GooseSLURM.rich`` objects this is their ``data``
+    (e.g. seconds for ``GooseSLURM.rich.Duration``, bytes for ``GooseSLURM.rich.Memory``),
+    all other values are returned as they are.
+
+    :param value: The cell.
+    :return: The raw value.
+    """
+
+    if isinstance(value, rich.String):
+        return value.data
+
+    return value
+
+
+def select(fmt=None, layout=False):
+    r"""
+    Select the output format.
+
+    :param fmt: The format specified on the command line (``None`` if not specified).
+    :param layout: ``True`` if a table layout is explicitly requested (e.g. using ``--width``).
+    :return:
+        ``fmt`` if specified.
+        Otherwise ``"plain"`` if stdout is not a terminal and no layout is requested.
+        Otherwise ``None``: print a table (see ``GooseSLURM.table.print_columns``).
+    """
+
+    if fmt is not None:
+        return fmt
+
+    if layout or sys.stdout.isatty():
+        return None
+
+    return "plain"
+
+
+def _chunks(lines, n):
+    lines = iter(lines)
+    while True:
+        part = list(itertools.islice(lines, n))
+        if len(part) == 0:
+            return
+        yield part
+
+
+def write(lines, keys, fmt, header=None, sep=" ", print_header=True, file=None, chunk=1000):
+    r"""
+    Write table.
+
+    :param lines:
+        List of lines, with each line stored as a dictionary.
+        For example: ``[ {'JOBID': '1234', ...}, ...]``.
+
+    :param keys: The keys (columns) to write.
+    :param fmt: The format: ``"csv"``, ``"tsv"``, ``"json"``, ``"ndjson"``, or ``"plain"``.
+    :param header: Name to use for each key, e.g. ``{'JOBID': 'JobID', ...}`` (default: the key).
+    :param sep: Column separator (``"plain"`` only).
+    :param print_header: Write the header (``"csv"``, ``"tsv"``, and ``"plain"`` only).
+    :param file: Stream to write to (default: ``sys.stdout``).
+    :param chunk: Number of lines that are written at once.
+    """
+
+    if fmt not in formats:
+        raise ValueError(f'Unknown format "{fmt}"')
+
+    if file is not None:
+        return _write(lines, keys, fmt, header, sep, print_header, file, chunk)
+
+    try:
+        _write(lines, keys, fmt, header, sep, print_header, sys.stdout, chunk)
+    except BrokenPipeError:
+        output._stdout_closed()
+
+
+def _write(lines, keys, fmt, header, sep, print_header, file, chunk):
+    if header is None:
+        header = {}
+
+    names = [str(header.get(key, key)) for key in keys]
+
+    if fmt in ["csv", "tsv"]:
+        delimiter = "," if fmt == "csv" else "\t"
+        if print_header:
+            sio = io.StringIO()
+            csv.writer(sio, delimiter=delimiter, lineterminator="\n").writerow(names)
+            file.write(sio.getvalue())
+        for part in _chunks(lines, chunk):
+            sio = io.StringIO()
+            writer = csv.writer(sio, delimiter=delimiter, lineterminator="\n")
+            writer.writerows([raw(line.get(key)) for key in keys] for line in part)
+            file.write(sio.getvalue())
+
+    elif fmt == "plain":
+        if print_header:
+            file.write(sep.join(names) + "\n")
+        for part in _chunks(lines, chunk):
+            text = [sep.join(str(line.get(key, "")) for key in keys) for line in part]
+            file.write("".join(i + "\n" for i in text))
+
+    elif fmt == "ndjson":
+        for part in _chunks(lines, chunk):
+            text = [json.dumps({n: raw(line.get(k)) for n, k in zip(names, keys)}) for line in part]
+            file.write("".join(i + "\n" for i in text))
+
+    elif fmt == "json":
+        file.write("[")
+        empty = True
+        for part in _chunks(lines, chunk):
+            text = [json.dumps({n: raw(line.get(k)) for n, k in zip(names, keys)}) for line in part]
+            file.write(("\n" if empty else ",\n") + ",\n".join(text))
+            empty = False
+        file.write("]\n" if empty else "\n]\n")
+
+    file.flush()
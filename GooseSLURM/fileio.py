@@ -2,9 +2,6 @@ import functools
 import operator
 import os
 
-import click
-import yaml
-
 
 def ContinueDump(filename):
     r"""
@@ -13,6 +10,8 @@ def ContinueDump(filename):
     Return ``True`` is the user confirms to proceed.
     """
 
+    import click
+
     dirname = os.path.dirname(filename)
 
     if os.path.isfile(filename):
@@ -34,6 +33,8 @@ def YamlRead(filename):
     if not os.path.isfile(filename):
         raise OSError(f'"{filename:s} does not exist')
 
+    import yaml
+
     with open(filename) as file:
         return yaml.load(file.read(), Loader=yaml.FullLoader)
 
@@ -67,6 +68,8 @@ def YamlDump(filename, data):
     Unless ``force = True`` the function prompts before overwriting an existing file.
     """
 
+    import yaml
+
     dirname = os.path.dirname(filename)
 
     if not os.path.isdir(dirname) and len(dirname) > 0:
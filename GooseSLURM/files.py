@@ -1,6 +1,123 @@
+import os
+
+
 def cmake():
     r"""
     Return a list of typical build files/folders generated by CMake.
     """
 
     return ["CMakeFiles", "CMakeCache.txt", "cmake_install.cmake", "Makefile"]
+
+
+def vcs():
+    r"""
+    Return a list of typical folders of version control systems.
+    """
+
+    return [".git", ".hg", ".svn"]
+
+
+def python():
+    r"""
+    Return a list of typical build/cache folders generated by Python (tools).
+    """
+
+    return ["__pycache__", "*.egg-info", ".eggs", ".tox", ".nox", ".pytest_cache"]
+
+
+def prune():
+    r"""
+    Return a list of folders that are skipped by default by ``find``:
+    ``cmake()``, ``vcs()``, and ``python()``.
+    """
+
+    return cmake() + vcs() + python()
+
+
+def find(root=".", name="*", exclude=None, workers=8):
+    r"""
+    Find files by name, walking the directory tree concurrently (using ``os.scandir``).
+    Files are returned as they are found (in no particular order).
+    Symbolic links to directories are not followed, unreadable directories are skipped.
+
+    :param root: Root directory.
+    :param name: Pattern of the filename (``fnmatch``), e.g. ``"*.slurm"``.
+    :param exclude: Patterns of directory names (``fnmatch``) that are not entered
+        (default: ``prune()``).
+    :param workers: Number of concurrent ``os.scandir`` calls.
+    :return: Generator of paths (``os.path.join(root, ...)``).
+    :raise OSError: If ``root`` is not a directory.
+    """
+
+    if exclude is None:
+        exclude = prune()
+
+    if not os.path.isdir(root):
+        raise OSError(f'"{root}" is not a directory')
+
+    return _find(root, name, exclude, workers)
+
+
+def _find(root, name, exclude, workers):
+    r"""
+    Implementation of ``find``, see there.
+    """
+
+    import fnmatch
+    import queue
+    import threading
+
+    done = object()
+    dirs = queue.Queue()
+    found = queue.Queue()
+    lock = threading.Lock()
+    stop = threading.Event()
+    pending = [1]
+
+    def _walk(path):
+        ret = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not any(fnmatch.fnmatch(entry.name, i) for i in exclude):
+                                ret.append(entry.path)
+                        elif fnmatch.fnmatch(entry.name, name) and entry.is_file():
+                            found.put(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        return ret
+
+    def worker():
+        while not stop.is_set():
+            path = dirs.get()
+            if path is None:
+                return
+            subdirs = _walk(path)
+            with lock:
+                pending[0] += len(subdirs) - 1
+                for subdir in subdirs:
+                    dirs.put(subdir)
+                if pending[0] == 0:
+                    found.put(done)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, workers))]
+
+    for thread in threads:
+        thread.start()
+
+    dirs.put(root)
+
+    try:
+        while True:
+            path = found.get()
+            if path is done:
+                return
+            yield path
+    finally:
+        stop.set()
+        for thread in threads:
+            dirs.put(None)
@@ -0,0 +1,245 @@
+r"""
+Select lines of a table using (a list of) patterns per column.
+
+Each pattern is interpreted as regular expression that has to match the start of the
+(unformatted) value, as ``re.match``. A line is selected if, for each column,
+at least one of the patterns matches.
+For speed all patterns of a column are compiled at once:
+
+*   Literal patterns that are anchored at the end (e.g. ``"^1234$"``) are checked by lookup in
+    a set.
+
+*   Other literal patterns (e.g. ``"^foo"`` or ``"foo"``) are checked as prefix.
+
+*   All remaining patterns are combined into one regular expression.
+
+*   Numerical comparisons, e.g. ``">4"``, ``"<=1G"``, or ``">=2h"``, are evaluated on the
+    numerical value of ``GooseSLURM.rich`` objects (interpreting units for
+    ``GooseSLURM.rich.Duration`` and ``GooseSLURM.rich.Memory``), or of numbers.
+    Lines for which the value is not numeric are not selected.
+"""
+
+import operator
+import re
+
+from . import duration
+from . import memory
+from . import rich
+
+_comparison = re.compile(r"^(<=|>=|==|!=|<|>)\s*(.+)$")
+_literal = re.compile(r"^(?:[^\\.^$*+?{}\[\]|()]|\\[^A-Za-z0-9])*$")
+
+_operators = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _unescape(text):
+    r"""
+    Return the literal text matched by a regular expression, ``None`` if ``text`` is not literal.
+    """
+
+    if not _literal.match(text):
+        return None
+
+    return re.sub(r"\\(.)", r"\1", text)
+
+
+def _anchored_end(text):
+    r"""
+    Check if a regular expression ends with an (unescaped) ``$``.
+    """
+
+    if not text.endswith("$"):
+        return False
+
+    return (len(text) - 1 - len(text[:-1].rstrip("\\"))) % 2 == 0
+
+
+def _number(text, kind):
+    r"""
+    Convert text to a number, interpreting the units of ``kind``.
+    Return ``None`` if the conversion fails.
+    """
+
+    try:
+        if issubclass(kind, rich.Duration):
+            return float(duration.asSeconds(text))
+        if issubclass(kind, rich.Memory):
+            return float(memory.asBytes(text))
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _value(cell):
+    r"""
+    Numerical value of a cell (a numeric ``GooseSLURM.rich`` object or a number),
+    ``None`` if the cell is not numeric.
+    """
+
+    if isinstance(cell, rich.String):
+        return float(cell) if cell.isnumeric() else None
+
+    if isinstance(cell, (int, float)) and not isinstance(cell, bool):
+        return float(cell)
+
+    return None
+
+
+class Pattern:
+    r"""
+    Compiled (list of) pattern(s) for one column.
+
+    :param patterns: List of patterns.
+    :param flags: Flags of the regular expressions (only ``re.IGNORECASE`` affects literals).
+    """
+
+    def __init__(self, patterns, flags=0):
+        if isinstance(patterns, str):
+            patterns = [patterns]
+
+        self.flags = flags
+        self.ignorecase = bool(flags & re.IGNORECASE)
+        self.exact = set()
+        self.prefix = []
+        self.regex = []
+        self.comparisons = []
+
+        for pattern in patterns:
+            pattern = str(pattern)
+
+            if _comparison.match(pattern):
+                op, value = _comparison.match(pattern).groups()
+                self.comparisons.append((pattern, op, value))
+                continue
+
+            text = pattern[1:] if pattern.startswith("^") else pattern
+            end = _anchored_end(text)
+            literal = _unescape(text[:-1] if end else text)
+
+            if literal is None:
+                self.regex.append(pattern)
+            elif end:
+                self.exact.add(self._case(literal))
+            else:
+                self.prefix.append(self._case(literal))
+
+        self.prefix = tuple(self.prefix)
+
+    def _case(self, text):
+        return text.lower() if self.ignorecase else text
+
+    def _compile(self, regex):
+        if len(regex) == 0:
+            return None
+        return re.compile("|".join(f"(?:{i})" for i in regex), self.flags)
+
+    def mask(self, cells):
+        r"""
+        Evaluate the patterns on a column.
+
+        :param cells: List of cells (``GooseSLURM.rich`` objects, strings, or numbers).
+        :return: List of booleans (``True`` if at least one pattern matches).
+        """
+
+        regex = list(self.regex)
+        numeric = []
+
+        if len(self.comparisons) > 0:
+            kinds = [type(cell) for cell in cells if isinstance(cell, rich.String)]
+            if len(kinds) == 0 and any(_value(cell) is not None for cell in cells):
+                kinds = [float]
+            kind = kinds[0] if len(kinds) > 0 else str
+            for pattern, op, value in self.comparisons:
+                number = _number(value, kind) if kind is not str else None
+                if number is None or not issubclass(kind, (rich.Integer, rich.Float, float)):
+                    regex.append(pattern)
+                else:
+                    numeric.append((_operators[op], number))
+
+        regex = self._compile(regex)
+        ret = [False] * len(cells)
+
+        if regex or self.exact or self.prefix:
+            text = [str(cell) for cell in cells]
+            case = [i.lower() for i in text] if self.ignorecase else text
+
+            if self.exact:
+                ret = [r or c in self.exact for r, c in zip(ret, case)]
+            if self.prefix:
+                ret = [r or c.startswith(self.prefix) for r, c in zip(ret, case)]
+            if regex:
+                ret = [r or regex.match(t) is not None for r, t in zip(ret, text)]
+
+        if len(numeric) > 0:
+            values = [_value(cell) for cell in cells]
+
+        for op, number in numeric:
+            ret = [r or (v is not None and op(v, number)) for r, v in zip(ret, values)]
+
+        return ret
+
+    def __call__(self, value):
+        r"""
+        Evaluate the patterns on one value.
+
+        :param value: The value (``GooseSLURM.rich`` object or string).
+        :return: ``True`` if at least one pattern matches.
+        """
+        return self.mask([value])[0]
+
+
+def compile(patterns, flags=0):
+    r"""
+    Compile (a list of) pattern(s) for one column.
+
+    :param patterns: List of patterns.
+    :param flags: Flags of the regular expressions.
+    :return: ``GooseSLURM.filters.Pattern``.
+    """
+    return Pattern(patterns, flags)
+
+
+def mask(lines, selection, flags=0):
+    r"""
+    Evaluate a selection on a table.
+
+    :param lines:
+        List of lines, with each line stored as a dictionary.
+        For example: ``[ {'JOBID': '1234', ...}, ...]``.
+
+    :param selection:
+        Patterns per column. Columns without patterns (``None`` or empty list) are ignored.
+        For example: ``{'USER': ['foo', 'bar'], 'JOBID': ['^1234$']}``.
+
+    :param flags: Flags of the regular expressions.
+    :return: List of booleans (``True`` if the line is selected).
+    """
+
+    ret = [True] * len(lines)
+
+    for key, patterns in selection.items():
+        if not patterns:
+            continue
+        if not isinstance(patterns, Pattern):
+            patterns = Pattern(patterns, flags)
+        column = [line[key] for line, r in zip(lines, ret) if r]
+        selected = iter(patterns.mask(column))
+        ret = [r and next(selected) for r in ret]
+
+    return ret
+
+
+def apply(lines, selection, flags=0):
+    r"""
+    Select lines, see ``GooseSLURM.filters.mask``.
+
+    :return: List of selected lines.
+    """
+    return [line for line, selected in zip(lines, mask(lines, selection, flags)) if selected]
@@ -0,0 +1,183 @@
+r"""
+Detect faulty nodes from the recent accounting records (see ``Gsub --avoid-bad-nodes``).
+
+The finished jobs of all users in a recent time window are read with one ``sacct`` call
+(``GooseSLURM.health.read``). Each job is attributed to all nodes on which it ran,
+after which the jobs are grouped by node (``GooseSLURM.aggregate.groupby``) to obtain, per node,
+the number of jobs, the number of failures (``failures``), and the exit codes of the failures
+(``GooseSLURM.health.analyse``).
+A node is flagged as bad if it ran at least ``minimum`` jobs, and if its failure rate exceeds
+both ``threshold`` and ``factor`` times the failure rate of all nodes.
+
+The list of bad nodes is cached (as JSON) in ``$GOOSESLURM_CACHE/badnodes.json``
+(see ``GooseSLURM.completion``), and only recomputed if it is older than ``ttl`` seconds
+(``GooseSLURM.health.bad``).
+"""
+
+import json
+import os
+import re
+import time
+
+ttl = 3600
+
+failures = ["FAILED", "NODE_FAIL", "BOOT_FAIL"]
+
+fields = ["JobID", "NodeList", "State", "ExitCode"]
+
+
+def nodelist(text):
+    r"""
+    Expand a list of nodes.
+
+    :param text: Compressed list of nodes, e.g. ``"node[01-03,07],gpu1"``.
+    :return: List of nodes, e.g. ``["node01", "node02", "node03", "node07", "gpu1"]``.
+    """
+
+    ret = []
+
+    for name, numbers in re.findall(r"([^,\[]+)(?:\[([^\]]*)\])?", str(text)):
+        if len(numbers) == 0:
+            ret.append(name)
+            continue
+        for number in numbers.split(","):
+            start, _, end = number.partition("-")
+            if len(end) == 0:
+                ret.append(name + start)
+            else:
+                ret += [name + str(i).zfill(len(start)) for i in range(int(start), int(end) + 1)]
+
+    return ret
+
+
+def read(since="1d"):
+    r"""
+    Read the accounting records of all jobs (of all users) that started recently,
+    with one ``sacct`` call.
+
+    :param since: Time window, e.g. ``"12h"``.
+    :return: List of dictionaries (see ``GooseSLURM.health.fields``). All data are strings.
+    """
+
+    from . import sacct
+
+    start = sacct._asdate(f"-{since}")
+    return sacct._read(["sacct", "-X", "-a", "-p", f"--format={','.join(fields)}", "-S", start])
+
+
+def analyse(lines, minimum=5, factor=3.0, threshold=0.25):
+    r"""
+    Failure statistics per node.
+
+    :param lines: Accounting records, see ``GooseSLURM.health.read``.
+    :param minimum: Minimal number of jobs of a node to flag it.
+    :param factor: Minimal ratio of the failure rate of a node and that of all nodes to flag it.
+    :param threshold: Minimal failure rate of a node to flag it.
+
+    :return:
+        List with one line per node (sorted by failure rate, highest first).
+        For example:
+        ``[{"NODE": "node01", "JOBS": 10, "FAILED": 6, "RATE": 0.6, "EXIT": "1:0,0:9",
+        "BAD": True}, ...]``.
+    """
+
+    from . import aggregate
+    from . import retry
+    from . import status
+
+    rows = []
+
+    for line in lines:
+        state = retry.state(line.get("State", ""))
+        if status.category(state) in ["pending", "running", "unknown"]:
+            continue
+        failed = int(state in failures)
+        code = line.get("ExitCode", "") if failed else ""
+        for node in nodelist(line.get("NodeList", "")):
+            if node not in ["", "None assigned", "(null)"]:
+                rows.append({"NODE": node, "JOBS": 1, "FAILED": failed, "EXIT": code})
+
+    ret = aggregate.groupby(rows, ["NODE"], {"JOBS": "count", "FAILED": "sum", "EXIT": "distinct"})
+    total = sum(row["FAILED"] for row in rows) / max(1, len(rows))
+
+    for line in ret:
+        line["RATE"] = line["FAILED"] / line["JOBS"]
+        line["EXIT"] = line["EXIT"].strip(",")
+        line["BAD"] = (
+            line["JOBS"] >= minimum
+            and line["RATE"] >= threshold
+            and line["RATE"] >= factor * total
+            and line["FAILED"] > 0
+        )
+
+    return sorted(ret, key=lambda line: -line["RATE"])
+
+
+def path():
+    r"""
+    Path of the cached list of bad nodes.
+    """
+
+    from . import completion
+
+    return os.path.join(os.path.dirname(completion.path()), "badnodes.json")
+
+
+def bad(ttl=ttl, since="1d", now=None, **kwargs):
+    r"""
+    List of bad nodes, from the cache if it is recent enough (and computed with the same options).
+    Failures to write the cache are ignored.
+
+    :param ttl: Recompute the list if the cache is older than this (in seconds).
+    :param since: Time window, see ``GooseSLURM.health.read``.
+    :param now: Current time (default: now).
+    :param kwargs: Options, see ``GooseSLURM.health.analyse``.
+    :return: Sorted list of nodes.
+    """
+
+    if now is None:
+        now = time.time()
+
+    options = dict(kwargs, since=since)
+
+    try:
+        with open(path()) as file:
+            cache = json.load(file)
+        if cache["options"] == options and now - cache["time"] < ttl:
+            return cache["nodes"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    nodes = sorted(line["NODE"] for line in analyse(read(since), **kwargs) if line["BAD"])
+    temp = f"{path()}.{os.getpid()}"
+
+    try:
+        os.makedirs(os.path.dirname(path()), exist_ok=True)
+        with open(temp, "w") as file:
+            json.dump({"time": now, "options": options, "nodes": nodes}, file)
+        os.replace(temp, path())
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+    return nodes
+
+
+def exclude(current=None, nodes=None):
+    r"""
+    Add nodes to (the argument of) ``sbatch --exclude``.
+
+    :param current: Current argument, e.g. ``"node[01-02]"`` (``None`` if not specified).
+    :param nodes: List of nodes to add (default: none).
+    :return: Argument, e.g. ``"node[01-02],node07"`` (``None`` if empty).
+    """
+
+    known = set(nodelist(current)) if current else set()
+    ret = ([current] if current else []) + [node for node in nodes or [] if node not in known]
+
+    if len(ret) == 0:
+        return None
+
+    return ",".join(ret)
@@ -0,0 +1,231 @@
+r"""
+Append-only, crash-safe, log of submitted jobs (see ``Gsub --log``).
+
+The log is a YAML file that lists the job-ids per job-script::
+
+    myjob.slurm: [1234, 1240]
+
+Rather than rewriting the YAML file after each submission, submissions are appended to
+a journal ``<log>.journal``, with one JSON line per submission
+(e.g. ``{"file": "myjob.slurm", "jobid": 1240}``) that is flushed to disk before continuing.
+Periodically (and when closing), the journal is compacted into the YAML file:
+the YAML file is replaced atomically, after which the journal is removed.
+A crash can therefore only lose the submission that was being written.
+Compaction is idempotent: a job-id is never listed twice for the same job-script.
+
+All access to the journal is protected by a lock (``fcntl.flock``) on the journal,
+such that several processes can share one log.
+"""
+
+import json
+import os
+
+
+def _open(path):
+    r"""
+    Open and lock (exclusively) the journal.
+    If the journal was removed (compacted) while waiting for the lock, the new journal is opened.
+
+    :return: File descriptor.
+    """
+
+    import fcntl
+
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+
+def _entries(fd):
+    r"""
+    Read all entries of a (locked) journal. Incomplete lines (of a crashed write) are skipped.
+    """
+
+    os.lseek(fd, 0, os.SEEK_SET)
+    data = b""
+
+    while True:
+        chunk = os.read(fd, 1 << 20)
+        if len(chunk) == 0:
+            break
+        data += chunk
+
+    ret = []
+
+    for line in data.decode("utf-8", "replace").splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and "file" in entry:
+            ret.append(entry)
+
+    return ret
+
+
+def merge(log, entries):
+    r"""
+    Merge journal entries into a log.
+
+    :param log: Log (``{filename: [jobid, ...], ...}``), modified in-place.
+    :param entries: List of entries (``{"file": filename, "jobid": jobid}``).
+    :return: The log.
+    """
+
+    for entry in entries:
+        jobids = log.setdefault(entry["file"], [])
+        if entry["jobid"] is None or entry["jobid"] not in jobids:
+            jobids.append(entry["jobid"])
+
+    return log
+
+
+def _read_yaml(filename):
+    import yaml
+
+    if not os.path.isfile(filename):
+        return {}
+
+    with open(filename) as file:
+        log = yaml.load(file.read(), Loader=yaml.FullLoader)
+
+    if log is None:
+        return {}
+
+    if not isinstance(log, dict):
+        raise OSError(f'Unable to interpret log file "{filename}"')
+
+    return log
+
+
+def _write_yaml(filename, log):
+    r"""
+    Write a YAML file atomically (write to a temporary file, and replace).
+    """
+
+    import yaml
+
+    dirname = os.path.dirname(os.path.abspath(filename))
+    temp = os.path.join(dirname, f".{os.path.basename(filename)}.{os.getpid()}")
+
+    with open(temp, "w") as file:
+        yaml.dump(log, file)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp, filename)
+
+    fd = os.open(dirname, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    r"""
+    Log of submitted jobs. Use as context manager::
+
+        with journal.Journal("mylog.yaml") as log:
+            log.append("myjob.slurm", 1234)
+
+    :param filename: The (YAML) log file.
+    :param compact: Compact the journal every ``compact`` entries (appended by this instance).
+    """
+
+    def __init__(self, filename, compact=1000):
+        self.filename = filename
+        self.path = f"{filename}.journal"
+        self.compact_every = compact
+        self.n = 0
+
+    def append(self, file, jobid):
+        r"""
+        Append a submission (flushed to disk before returning).
+
+        :param file: The job-script.
+        :param jobid: The job-id.
+        """
+
+        line = json.dumps({"file": file, "jobid": jobid}) + "\n"
+        dirname = os.path.dirname(self.path)
+
+        if len(dirname) > 0:
+            os.makedirs(dirname, exist_ok=True)
+
+        fd = _open(self.path)
+
+        try:
+            os.write(fd, line.encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        self.n += 1
+
+        if self.compact_every and self.n % self.compact_every == 0:
+            self.compact()
+
+    def compact(self):
+        r"""
+        Compact the journal into the YAML file.
+        """
+
+        if not os.path.exists(self.path):
+            return
+
+        fd = _open(self.path)
+
+        try:
+            entries = _entries(fd)
+            if len(entries) > 0:
+                _write_yaml(self.filename, merge(_read_yaml(self.filename), entries))
+            os.remove(self.path)
+        finally:
+            os.close(fd)
+
+    def read(self):
+        r"""
+        Read the log (including the entries of the journal that are not yet compacted).
+
+        :return: Log as dict (``{filename: [jobid, ...], ...}``).
+        """
+
+        if not os.path.exists(self.path):
+            return _read_yaml(self.filename)
+
+        fd = _open(self.path)
+
+        try:
+            return merge(_read_yaml(self.filename), _entries(fd))
+        finally:
+            os.close(fd)
+
+    def close(self):
+        r"""
+        Compact the journal.
+        """
+        self.compact()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read(filename):
+    r"""
+    Read a log, see ``GooseSLURM.journal.Journal.read``.
+
+    :param filename: The (YAML) log file.
+    :return: Log as dict (``{filename: [jobid, ...], ...}``).
+    """
+
+    return Journal(filename).read()
@@ -1,5 +1,17 @@
 import re
 
+from . import duration
+
+# units of the human-readable conversion (see ``GooseSLURM.memory.asHuman``),
+# as ``(value, unit)`` from the biggest to the smallest unit
+units = (
+    (1e12, "T"),
+    (1e9, "G"),
+    (1e6, "M"),
+    (1e3, "K"),
+    (1, "B"),
+)
+
 
 def asBytes(data, default=None, default_unit=1):
     r"""
@@ -36,7 +48,7 @@ def asBytes(data, default=None, default_unit=1):
         return int(data * default_unit)
 
     # convert humanly readable time (e.g. "1G")
-    if re.match(r"^[0-9]*\.?[0-9]*[a-zA-Z]$", data):
+    if re.match(r"^([0-9]+\.?[0-9]*|\.[0-9]+)[a-zA-Z]$", data):
         if data[-1] == "T":
             return int(float(data[:-1]) * 1.0e12)
         if data[-1] == "G":
@@ -111,14 +123,6 @@ def asHuman(data, precision=None):
     if data is None:
         return ""
 
-    units = (
-        (1e12, "T"),
-        (1e9, "G"),
-        (1e6, "M"),
-        (1e3, "K"),
-        (1, "B"),
-    )
-
     for val, unit in units:
         if abs(data) >= val:
             return asUnit(float(data) / float(val), unit, precision)
@@ -126,6 +130,33 @@ def asHuman(data, precision=None):
     return asUnit(float(data), "B", precision)
 
 
+def asHumanArray(data, precision=None):
+    r"""
+    Vectorized version of ``GooseSLURM.memory.asHuman``:
+    convert a whole column of amounts of memory at once (see ``GooseSLURM.duration.asUnitArray``).
+    Entries that are not numeric are converted using ``GooseSLURM.memory.asBytes``,
+    entries that cannot be converted (e.g. ``None``) are converted to an empty string.
+
+    :arguments:
+
+        **data** (``<list>``)
+            Amounts of memory in bytes.
+
+        **precision** (``<int>``)
+            The precision with which to print, see ``GooseSLURM.memory.asHuman``.
+
+    :returns:
+
+        ``<list<str>>``
+            The rich-strings.
+    """
+
+    if not set(map(type, data)).issubset({int, float}):
+        data = [asBytes(i, default=float("nan")) if i is not None else float("nan") for i in data]
+
+    return duration.asUnitArray(data, units, precision)
+
+
 def asSlurm(data):
     r"""
     Convert to a SLURM string. For example ``"1G"``.
@@ -0,0 +1,117 @@
+r"""
+Wait for (many) jobs to finish, with a few calls to SLURM per minute (see ``Gsub --wait``).
+
+Each poll takes one snapshot of the queue for all jobs that are being waited for
+(one ``squeue --jobs`` call, see ``GooseSLURM.squeue.read``).
+The jobs that left the queue are read with one ``sacct`` call (``GooseSLURM.sacct.read_jobs``).
+The time between polls increases exponentially (up to a maximum).
+Calls that fail with a transient error (e.g. ``"Socket timed out"`` for a busy controller,
+see ``GooseSLURM.submit.is_transient``) are retried with an exponential backoff.
+"""
+
+import subprocess
+import time
+
+
+def _retry(func, retries, sleep):
+    r"""
+    Call a function, retrying transient errors (see ``GooseSLURM.submit.is_transient``)
+    with an exponential backoff (see ``GooseSLURM.submit.backoff``).
+
+    :param func: Function (without arguments).
+    :param retries: Maximum number of retries.
+    :param sleep: Function to sleep.
+    :return: The return value of ``func``.
+    """
+
+    from . import submit
+
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as error:
+            if attempt == retries or not submit.is_transient(error):
+                raise
+        sleep(submit.backoff(attempt))
+
+
+def wait(
+    jobids,
+    interval=5.0,
+    maximum=60.0,
+    factor=2.0,
+    timeout=None,
+    grace=3,
+    callback=None,
+    retries=5,
+    sleep=time.sleep,
+):
+    r"""
+    Wait until jobs have finished.
+
+    :param jobids: List of job-ids (array tasks as ``"1234_5"``).
+    :param interval: Time (in seconds) between the first two polls.
+    :param maximum: Maximum time (in seconds) between two polls.
+    :param factor: Factor by which the time between two polls increases.
+    :param timeout: Maximum time to wait (in seconds), raises ``TimeoutError`` if exceeded.
+
+    :param grace:
+        Number of polls that a job that left the queue may be missing from the accounting
+        database (which can lag behind), before its state is considered unknown.
+
+    :param callback:
+        Function ``callback(done, pending)`` called after each poll, with ``done`` the
+        state of each finished job, and ``pending`` the job-ids that are still waited for.
+
+    :param retries: Maximum number of retries of a call to SLURM that fails with a transient error.
+    :param sleep: Function to sleep (for testing).
+    :return:
+        Dictionary with the final (``sacct``) state of each job-id (as string),
+        e.g. ``"COMPLETED"``, ``None`` if unknown. See ``GooseSLURM.status.category``.
+    """
+
+    from . import sacct
+    from . import squeue
+    from . import status
+
+    jobids = list(dict.fromkeys(str(jobid) for jobid in jobids))
+    pending = set(jobids)
+    missing = {}
+    done = {}
+    start = time.monotonic()
+
+    while True:
+        lines = _retry(lambda: squeue.read(jobs=sorted(pending)), retries, sleep)
+        queued = {line["JOBID"] for line in lines}
+        left = sorted(pending - queued)
+
+        try:
+            lines = _retry(lambda: sacct.read_jobs(left), retries, sleep)
+        except subprocess.CalledProcessError:
+            # e.g. accounting is not available: the state of finished jobs is unknown
+            lines = []
+
+        states = {line["JobID"]: line["State"] for line in lines}
+
+        for jobid in left:
+            state = states.get(jobid)
+            if state is None:
+                missing[jobid] = missing.get(jobid, 0) + 1
+                if missing[jobid] <= grace:
+                    continue
+            elif status.category(state) in ["pending", "running"]:
+                continue
+            done[jobid] = state
+            pending.remove(jobid)
+
+        if callback is not None:
+            callback(done, pending)
+
+        if len(pending) == 0:
+            return {jobid: done[jobid] for jobid in jobids}
+
+        if timeout is not None and time.monotonic() - start + interval > timeout:
+            raise TimeoutError(f"{len(pending):d} job(s) did not finish within {timeout} seconds")
+
+        sleep(interval)
+        interval = min(maximum, interval * factor)
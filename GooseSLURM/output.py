@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import os
 import shlex
 import shutil
@@ -5,15 +7,112 @@ import subprocess
 import sys
 
 
-def _page(text: str):
+def _pager_cmd() -> list[str]:
+    """
+    Command of the terminal pager.
+    Respects the PAGER environment variable if set.
+    """
+    return shlex.split(os.environ.get("PAGER") or "less -r")
+
+
+def _stdout_closed():
+    """
+    Silence stdout after the reader has closed it (e.g. ``Gstat | head``).
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+
+class Pager:
     """
-    Display text in a terminal pager.
+    Stream text to stdout.
+    If stdout is a terminal, text is buffered until it is longer than the terminal height.
+    At that point a pager is opened, the buffered text is sent to it,
+    and all further text is streamed directly to the pager.
     Respects the PAGER environment variable if set.
 
-    :param text: Text to display.
+    Use as context manager::
+
+        with output.Pager() as pager:
+            for line in lines:
+                pager.write(line + "\\n")
+
+    :param end: Text written when closing, if the output was not sent to the pager.
     """
-    pager_cmd = shlex.split(os.environ.get("PAGER") or "less -r")
-    subprocess.run(pager_cmd, input=text.encode("utf-8"))
+
+    def __init__(self, end: str = "\n"):
+        self.end = end
+        self.buffer = []
+        self.nlines = 0
+        self.pager = None
+        self.closed = False
+
+        if sys.stdout.isatty():
+            _, self.height = shutil.get_terminal_size()
+        else:
+            self.height = None
+
+    def write(self, text: str):
+        """
+        Write text.
+
+        :param text: Text to write.
+        """
+
+        if self.pager is not None:
+            if not self.closed:
+                try:
+                    self.pager.stdin.write(text)
+                except BrokenPipeError:
+                    self.closed = True
+            return
+
+        if self.height is None:
+            if not self.closed:
+                try:
+                    sys.stdout.write(text)
+                except BrokenPipeError:
+                    self.closed = True
+                    _stdout_closed()
+            return
+
+        self.buffer.append(text)
+        self.nlines += text.count("\n")
+
+        if self.nlines > self.height:
+            self.pager = subprocess.Popen(_pager_cmd(), stdin=subprocess.PIPE, encoding="utf-8")
+            text = "".join(self.buffer)
+            self.buffer = []
+            self.write(text)
+
+    def close(self):
+        """
+        Flush all output and wait for the pager (if any) to be closed by the user.
+        """
+
+        if self.pager is None:
+            if not self.closed:
+                try:
+                    sys.stdout.write("".join(self.buffer) + self.end)
+                    sys.stdout.flush()
+                except BrokenPipeError:
+                    self.closed = True
+                    _stdout_closed()
+            self.buffer = []
+            return
+
+        try:
+            self.pager.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        self.pager.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
 
 def autoprint(text: str):
@@ -21,10 +120,5 @@ def autoprint(text: str):
     Print text to stdout.
     If the text is longer than the terminal height, it will be piped to a pager.
     """
-    if sys.stdout.isatty():
-        nlines = len(text.splitlines())
-        _, term_lines = shutil.get_terminal_size()
-        if nlines > term_lines:
-            return _page(text)
-
-    print(text)
+    with Pager() as pager:
+        pager.write(text)
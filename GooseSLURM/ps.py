@@ -102,7 +102,14 @@ def convert_duration(duration):
     return float(d) * 86400 + float(h) * 3600 + float(m) * 60 + float(s) * fac
 
 
-def interpret(lines, theme=colors()):
+_converters = {
+    "%CPU": lambda data: rich.Float(data, precision=2),
+    "TIME": lambda data: rich.Duration(convert_duration(data), precision=1),
+    "RSS": lambda data: rich.Memory(data, default_unit=1e3),
+}
+
+
+def interpret(lines, theme=colors(), keys=None):
     r"""
     Interpret the output of ``GooseSLURM.ps.read``. All fields are converted to the
     ``GooseSLURM.rich`` classes adding useful colors in the process.
@@ -117,6 +124,10 @@ def interpret(lines, theme=colors()):
         **theme** (``<dict>``)
             The color-theme, as selected by ``GooseSLURM.ps.colors``.
 
+        **keys** (``<list<str>>``)
+            Interpret only these fields (default: all fields).
+            Fields that were interpreted before are skipped.
+
     :returns:
 
         **lines** (``<list<dict>>``)
@@ -130,22 +141,10 @@ def interpret(lines, theme=colors()):
 
     # loop over all lines
     for line in lines:
-        # custom conversion
-        for key in ["%CPU"]:
-            line[key] = rich.Float(line[key], precision=2)
-
-        # custom conversion
-        for key in ["TIME"]:
-            line[key] = rich.Duration(convert_duration(line[key]), precision=1)
-
-        # custom conversion
-        for key in ["RSS"]:
-            line[key] = rich.Memory(line[key], default_unit=1e3)
-
-        # convert remaining fields to string
-        for key in line:
+        # custom conversion, convert remaining fields to string
+        for key in line if keys is None else keys:
             if not isinstance(line[key], rich.String):
-                line[key] = rich.String(line[key])
+                line[key] = _converters.get(key, rich.String)(line[key])
 
     return lines
 
@@ -0,0 +1,187 @@
+r"""
+Select failed jobs for resubmission, and escalate their resources (see ``Gsub --retry-from``).
+
+The accounting record of all jobs is read with one ``sacct`` call (``GooseSLURM.retry.read``).
+A job is retried if its state is one of ``states`` (e.g. ``"TIMEOUT"``),
+or if its exit code is one of ``codes`` (``GooseSLURM.retry.select``).
+
+Resources are escalated relative to the record of the failed job
+(``GooseSLURM.retry.escalate``), such that the limits grow with each retry:
+
+*   The time-limit of jobs that timed out, e.g. ``"x2"`` (double) or ``"+1h"`` (one hour more).
+*   The memory of jobs that ran out of memory, e.g. ``"x1.5"`` or ``"+4G"``.
+    Memory that was requested per CPU (``ReqMem`` with suffix ``"c"`` of older ``sacct``,
+    e.g. ``"4000Mc"``) is escalated per CPU (``--mem-per-cpu``).
+"""
+
+import subprocess
+
+from . import duration
+from . import memory
+
+states = ["FAILED", "NODE_FAIL", "TIMEOUT", "OUT_OF_MEMORY"]
+
+fields = ["JobID", "State", "ExitCode", "Timelimit", "ReqMem"]
+
+
+def state(text):
+    r"""
+    Normalize a state.
+
+    :param text: State, e.g. ``"TO"`` (short code), ``"timeout"``, or ``"CANCELLED by 1234"``.
+    :return: The state, e.g. ``"TIMEOUT"`` or ``"CANCELLED"``.
+    """
+
+    from . import status
+
+    text = str(text).strip().upper()
+    text = status._short.get(text, text)
+    return text.split(" ")[0].rstrip("+")
+
+
+def exit_code(text):
+    r"""
+    Exit code of a job.
+
+    :param text: ``ExitCode`` as reported by ``sacct``, e.g. ``"1:0"`` (exit code, signal).
+    :return: The exit code (``None`` if unknown).
+    """
+
+    try:
+        return int(str(text).split(":")[0])
+    except ValueError:
+        return None
+
+
+def read(jobids):
+    r"""
+    Read the accounting record of jobs, with one ``sacct`` call.
+
+    :param jobids: List of job-ids (array tasks as ``"1234_5"``).
+    :return: Dictionary with a record per job-id (as string), see ``GooseSLURM.retry.fields``.
+        Jobs without record are not included.
+    """
+
+    from . import sacct
+
+    jobids = list(dict.fromkeys(str(jobid) for jobid in jobids))
+
+    try:
+        lines = sacct.read_jobs(jobids, fields=fields)
+    except subprocess.CalledProcessError:
+        # e.g. accounting is not available: nothing is known about the jobs
+        lines = []
+
+    return {line["JobID"]: line for line in lines if line.get("JobID") in jobids}
+
+
+def select(record, states=None, codes=None):
+    r"""
+    Check if a job has to be retried.
+
+    :param record: Accounting record of the job, see ``GooseSLURM.retry.read``.
+    :param states: List of states to retry (see ``GooseSLURM.retry.state``),
+        default: ``GooseSLURM.retry.states``.
+    :param codes: List of exit codes to retry (default: none).
+    :return: ``True`` if the job has to be retried.
+    """
+
+    if states is None:
+        states = list(globals()["states"])  # the module default, shadowed by the argument
+
+    if state(record.get("State", "")) in [state(i) for i in states]:
+        return True
+
+    code = exit_code(record.get("ExitCode", ""))
+    return code is not None and code != 0 and code in (codes or [])
+
+
+def escalate(value, rule, convert):
+    r"""
+    Escalate a resource.
+
+    :param value: Current value (e.g. ``"1:00:00"``).
+    :param rule: ``"xFACTOR"`` (or ``"FACTOR"``) or ``"+AMOUNT"`` (e.g. ``"+1h"``).
+    :param convert: Function that converts ``value`` and ``AMOUNT`` to a number (``None`` if the
+        conversion fails), e.g. ``GooseSLURM.duration.asSeconds``.
+    :return: Escalated value (number), ``None`` if ``value`` cannot be converted.
+    """
+
+    value = convert(value)
+
+    if value is None:
+        return None
+
+    rule = str(rule).strip()
+
+    if rule.startswith("+"):
+        amount = convert(rule[1:])
+        if amount is None:
+            raise ValueError(f'Unable to interpret "{rule}"')
+        return value + amount
+
+    try:
+        factor = float(rule.lstrip("x"))
+    except ValueError:
+        raise ValueError(f'Unable to interpret "{rule}"')
+
+    return value * factor
+
+
+def _suffix(text):
+    r"""
+    Per-node/per-cpu suffix of ``ReqMem`` of older ``sacct`` (e.g. ``"4000Mn"`` or ``"4000Mc"``).
+
+    :return: ``"n"``, ``"c"``, or ``""`` (no suffix).
+    """
+
+    text = str(text).strip()
+
+    if len(text) > 1 and text[-1] in "nc" and text[-2].isalpha():
+        return text[-1]
+
+    return ""
+
+
+def _bytes(text):
+    r"""
+    Memory (in bytes), also accepting the per-node/per-cpu suffix of older ``sacct``
+    (e.g. ``"4000Mn"``).
+    """
+
+    text = str(text).strip()
+
+    if _suffix(text):
+        text = text[:-1]
+
+    return memory.asBytes(text)
+
+
+def resources(record, time=None, mem=None):
+    r"""
+    ``sbatch`` options that escalate the resources of a job that is retried.
+
+    :param record: Accounting record of the job, see ``GooseSLURM.retry.read``.
+    :param time: Rule to escalate the time-limit of jobs that timed out, see ``escalate``.
+    :param mem: Rule to escalate the memory of jobs that ran out of memory, see ``escalate``.
+    :return:
+        List of options, e.g. ``["--time", "0-02:00:00"]``.
+        Memory that was requested per CPU (e.g. ``"4000Mc"``) is escalated with
+        ``--mem-per-cpu``, otherwise ``--mem`` is used.
+    """
+
+    ret = []
+    current = state(record.get("State", ""))
+
+    if time and current == "TIMEOUT":
+        seconds = escalate(record.get("Timelimit"), time, duration.asSeconds)
+        if seconds is not None:
+            ret += ["--time", duration.asSlurm(int(-(-seconds // 60)) * 60)]
+
+    if mem and current == "OUT_OF_MEMORY":
+        size = escalate(record.get("ReqMem"), mem, _bytes)
+        option = "--mem-per-cpu" if _suffix(record.get("ReqMem")) == "c" else "--mem"
+        if size is not None:
+            ret += [option, memory.asSlurm(int(-(-size // 1e6) * 1e6))]
+
+    return ret
@@ -324,6 +324,7 @@ class Duration(Integer):
 
         **str(A)**
             Unformatted string, after unit conversion.
+            The conversion is cached until "data" or "precision" is modified.
 
         **A.isnumeric()**
             Return if the "data" is numeric.
@@ -346,7 +347,13 @@ class Duration(Integer):
         if not self.isnumeric():
             return self.data
 
-        return duration.asHuman(self.data, self.precision)
+        cache = self.__dict__.get("_str")
+
+        if cache is None or cache[0] != self.data or cache[1] != self.precision:
+            cache = (self.data, self.precision, duration.asHuman(self.data, self.precision))
+            self.__dict__["_str"] = cache
+
+        return cache[2]
 
 
 class Memory(Integer):
@@ -389,6 +396,7 @@ class Memory(Integer):
 
         **str(A)**
             Unformatted string, after unit conversion.
+            The conversion is cached until "data" or "precision" is modified.
 
         **A.isnumeric()**
             Return if the "data" is numeric.
@@ -414,4 +422,10 @@ class Memory(Integer):
         if not self.isnumeric():
             return self.data
 
-        return memory.asHuman(self.data, self.precision)
+        cache = self.__dict__.get("_str")
+
+        if cache is None or cache[0] != self.data or cache[1] != self.precision:
+            cache = (self.data, self.precision, memory.asHuman(self.data, self.precision))
+            self.__dict__["_str"] = cache
+
+        return cache[2]
@@ -2,8 +2,6 @@ from __future__ import annotations
 
 import argparse
 import datetime
-import io
-import json
 import os
 import pwd
 import re
@@ -11,25 +9,29 @@ import subprocess
 import sys
 from collections import defaultdict
 
-import numpy as np
-
 from . import duration
-from . import output
+from . import export
+from . import filters
+from . import memory
 from . import rich
+from . import sort
 from . import table
 from ._version import version
 
+batch = 1000
+
 
-def _read(cmd: str) -> list[dict]:
+def _read(cmd: list[str], stderr=None) -> list[dict]:
     r"""
     Read command and interpret.
     Requires ``-p`` and ``-l``.
 
-    :param jobid: The jobid to read.
+    :param cmd: The command, as list of arguments (no shell is used).
+    :param stderr: See ``subprocess.check_output`` (e.g. ``subprocess.PIPE`` to capture errors).
     :return: List of dictionaries, that contain the different fields. All data are strings.
     """
 
-    data = subprocess.check_output(cmd, shell=True).decode("utf-8")
+    data = subprocess.check_output(cmd, stderr=stderr).decode("utf-8")
 
     head, data = data.split("\n", 1)
     data = list(filter(None, data.split("\n")))
@@ -56,7 +58,117 @@ def read_job(jobid: int | str) -> list[dict]:
     :return: List of dictionaries, that contain the different fields. All data are strings.
     """
 
-    return _read(f"sacct -p -l -j {str(jobid)}")
+    return _read(["sacct", "-p", "-l", "-j", str(jobid)])
+
+
+def read_jobs(jobids: list, fields: list[str] = None) -> list[dict]:
+    r"""
+    Read ``sacct -X -p --format=... -j jobid,...`` (one line per job or array task).
+    The jobids are read in batches (see ``GooseSLURM.sacct.batch``),
+    to keep the command line below the system's limit.
+    The error output is captured in the raised ``subprocess.CalledProcessError``
+    (e.g. to retry transient errors, see ``GooseSLURM.submit.is_transient``).
+
+    :param jobids: List of jobids to read.
+    :param fields: List of fields to read (default: ``["JobID", "State"]``).
+    :return: List of dictionaries, that contain the different fields. All data are strings.
+    """
+
+    if fields is None:
+        fields = ["JobID", "State"]
+
+    jobids = list(map(str, jobids))
+    ret = []
+
+    for start in range(0, len(jobids), batch):
+        stop = start + batch
+        part = ",".join(jobids[start:stop])
+        cmd = ["sacct", "-X", "-p", f"--format={','.join(fields)}", "-j", part]
+        ret += _read(cmd, stderr=subprocess.PIPE)
+
+    return ret
+
+
+# fields that are sorted as durations or as amounts of memory (see ``GooseSLURM.sacct.sortable``)
+durations = [
+    "Elapsed",
+    "CPUTime",
+    "AveCPU",
+    "MinCPU",
+    "TotalCPU",
+    "UserCPU",
+    "SystemCPU",
+    "Timelimit",
+    "Reserved",
+    "Planned",
+]
+memories = [
+    "AveDiskRead",
+    "AveDiskWrite",
+    "AveRSS",
+    "AveVMSize",
+    "MaxDiskRead",
+    "MaxDiskWrite",
+    "MaxRSS",
+    "MaxVMSize",
+    "ReqMem",
+]
+
+
+def _seconds(text: str):
+    r"""
+    Duration in seconds, allowing fractional seconds (e.g. ``"00:01.234"``).
+    Returns the text if it cannot be interpreted.
+    """
+
+    ret = duration.asSeconds(text, default=None)
+
+    if ret is not None:
+        return ret
+
+    whole, _, fraction = text.partition(".")
+    ret = duration.asSeconds(whole, default=None)
+
+    if ret is None or not fraction.isdigit():
+        return text
+
+    return ret + float("0." + fraction)
+
+
+def sortable(lines: list[dict], keys: list[str]) -> list[dict]:
+    r"""
+    Typed values of fields of the output of ``sacct``, to sort on
+    (see ``GooseSLURM.sort``):
+
+    *   Durations (see ``GooseSLURM.sacct.durations``) in seconds.
+    *   Memory (see ``GooseSLURM.sacct.memories``) in bytes
+        (ignoring the suffix ``"n"`` or ``"c"`` of ``ReqMem``).
+    *   Fields of which all values are integers (e.g. ``NCPUS``) as integers.
+
+    Values that cannot be interpreted (e.g. ``"UNLIMITED"`` or empty) are kept as strings,
+    and are sorted last.
+
+    :param lines: List of dictionaries (all data are strings).
+    :param keys: The fields to convert.
+    :return: List of dictionaries with the typed values of ``keys`` (the lines are not modified).
+    """
+
+    ret = [{} for _ in lines]
+
+    for key in keys:
+        cells = [line[key] for line in lines]
+        if key in durations:
+            values = [_seconds(cell) if len(cell) > 0 else cell for cell in cells]
+        elif key in memories:
+            values = [memory.asBytes(cell.rstrip("nc"), default=cell) for cell in cells]
+        elif all(cell.isdigit() for cell in cells if len(cell) > 0):
+            values = [int(cell) if len(cell) > 0 else cell for cell in cells]
+        else:
+            values = cells
+        for row, value in zip(ret, values):
+            row[key] = value
+
+    return ret
 
 
 def _asdate(text: str):
@@ -82,7 +194,10 @@ def cli_parser() -> argparse.ArgumentParser:
     *   As state use: running / r, completed / cd, failed / f, timeout / to,
         resizing / rs, deadline / dl, node_fail / nf.
 
-    *   The output can be returned in JSON format (``--json``).
+    *   The output can be returned in a machine-readable format (e.g. ``--format json``),
+        with times in seconds and memory in bytes.
+        If the output is not a terminal, a plain layout (``--format plain``: the values of
+        the table, without alignment) is used by default.
 
     *   Extra columns can be added (``--extra``), see ``sacct --helpformat``.
         Commonly used are ``--extra="WorkDir"``.
@@ -102,11 +217,14 @@ def cli_parser() -> argparse.ArgumentParser:
 
     append = dict(type=str, action="append", default=[])
     parser.add_argument("-X", "--allocations", action="store_true", help="Include only main job.")
-    parser.add_argument("-j", "--json", action="store_true", help="Print in JSON format.")
+    parser.add_argument("--format", choices=export.formats, help="Print in format.")
     parser.add_argument("--sep", type=str, default=" ", help="Column separator.")
     parser.add_argument("--no-truncate", action="store_true", help="Print without fitting screen.")
     parser.add_argument("--sort", help="Sort based on column.", **append)
     parser.add_argument("--reverse", action="store_true", help="Reverse order.")
+    select = parser.add_mutually_exclusive_group()
+    select.add_argument("--head", type=int, help="Print only the first N lines (after sorting).")
+    select.add_argument("--tail", type=int, help="Print only the last N lines (after sorting).")
     parser.add_argument("--no-header", action="store_true", help="Do not print header.")
     parser.add_argument("--width", type=int, help="Print width (default: read from terminal).")
     parser.add_argument("-o", "--output", type=str, action="append", help="Output columns.")
@@ -230,12 +348,12 @@ def Gacct(args: list[str]):
     elif args.gid:
         opts += ["-u", ",".join(args.gid)]
 
-    lines = _read(" ".join(["sacct"] + opts))
+    lines = _read(["sacct"] + opts)
 
     if extra:
         op = [i for i in opts] + ["--format", ",".join(extra)]
         op.remove("-l")
-        ex = _read(" ".join(["sacct"] + op))
+        ex = _read(["sacct"] + op)
         for i in range(len(lines)):
             lines[i] = {**lines[i], **ex[i]}
 
@@ -259,7 +377,7 @@ def Gacct(args: list[str]):
         if not args.allocations:
             raise ValueError("Cannot infer extra data without --allocations.")
         opts.remove("-X")
-        ex = _read(" ".join(["sacct"] + opts))
+        ex = _read(["sacct"] + opts)
         data = defaultdict(dict)
         for line in ex:
             if "." not in line["JobID"]:
@@ -298,32 +416,24 @@ def Gacct(args: list[str]):
                     alias[j] = j
         key = "State"
         fields = [alias[i] for i in keys]
-        lines = [
-            line
-            for line in lines
-            if sum(1 if re.match(n, str(line[key]), re.IGNORECASE) else 0 for n in fields)
-        ]
+        lines = filters.apply(lines, {key: fields}, re.IGNORECASE)
 
     if len(lines) == 0:
         return
 
-    if args.sort:
-        lookup = {i.upper(): i for i in lines[0].keys()}
-        idx = np.lexsort([[line[lookup[key.upper()]] for line in lines] for key in args.sort])
-        if args.reverse:
-            idx = idx[::-1]
-        lines = [lines[i] for i in idx]
-    elif args.reverse:
-        lines = [i for i in lines[::-1]]
+    lookup = {i.upper(): i for i in lines[0].keys()}
+    sortkeys = [lookup[key.upper()] for key in args.sort]
 
-    if args.json:
-        for line in lines:
-            line = {k: v for k, v in line.items() if len(v) > 0}
-            json_object = json.dumps(line, indent=4)
-            sio = io.StringIO()
-            print(json_object, file=sio)
-            output.autoprint(sio.getvalue())
-        return
+    typed = sortable(lines, sortkeys)
+
+    if args.head is not None:
+        idx = sort.arghead(typed, sortkeys, args.head, args.reverse)
+    elif args.tail is not None:
+        idx = sort.argtail(typed, sortkeys, args.tail, args.reverse)
+    else:
+        idx = sort.argsort(typed, sortkeys, args.reverse)
+
+    lines = [lines[i] for i in idx]
 
     default = [
         "JobID",
@@ -358,14 +468,6 @@ def Gacct(args: list[str]):
     if "WorkDir" in extra:
         columns[default.index("WorkDir")]["align"] = "<"
 
-    for i in range(len(lines)):
-        for key in ["Elapsed", "CPUTime", "AveCPU"]:
-            if key in lines[i]:
-                lines[i][key] = rich.Duration(lines[i][key])
-        for key in ["AveDiskRead", "AveDiskWrite", "MaxVMSize", "MaxRSS"]:
-            if key in lines[i]:
-                lines[i][key] = rich.Memory(lines[i][key])
-
     if len(lines) > 0:
         keep = [False for _ in default]
         for i, key in enumerate(default):
@@ -383,6 +485,37 @@ def Gacct(args: list[str]):
         keys = [alias[key.upper()] for key in args.output]
         columns = [column for column in columns if column["key"] in keys]
 
+    fmt = export.select(args.format, args.width is not None or args.no_truncate)
+
+    # machine-readable output: times in seconds and memory in bytes
+    # (the "plain" layout keeps the human-readable values of the table)
+    if fmt not in [None, "plain"]:
+        for line in lines:
+            for key in ["Elapsed", "CPUTime", "AveCPU"]:
+                if len(line.get(key, "")) > 0:
+                    line[key] = duration.asSeconds(line[key], default=line[key])
+            for key in ["AveDiskRead", "AveDiskWrite", "MaxVMSize", "MaxRSS"]:
+                if len(line.get(key, "")) > 0:
+                    line[key] = memory.asBytes(line[key], default=line[key])
+    else:
+        for i in range(len(lines)):
+            for key in ["Elapsed", "CPUTime", "AveCPU"]:
+                if key in lines[i]:
+                    lines[i][key] = rich.Duration(lines[i][key])
+            for key in ["AveDiskRead", "AveDiskWrite", "MaxVMSize", "MaxRSS"]:
+                if key in lines[i]:
+                    lines[i][key] = rich.Memory(lines[i][key])
+
+    if fmt:
+        export.write(
+            lines,
+            [column["key"] for column in columns],
+            fmt,
+            sep=args.sep,
+            print_header=not args.no_header,
+        )
+        return
+
     table.print_columns(
         lines=lines,
         columns=columns,
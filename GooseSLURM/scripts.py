@@ -177,3 +177,136 @@ trap 'clean_up' EXIT
         outfile=outfile,
         remove=remove,
     )
+
+
+def requeue(
+    script,
+    marker,
+    interpreter="/bin/bash",
+    signal="USR1",
+    before=300,
+    maximum=None,
+    header=None,
+    shell="#!/bin/bash",
+    **sbatch,
+):
+    r"""
+    Return SBATCH-file (as text) that runs a job-script, and requeues itself until the job-script
+    is completed (see ``Gsub --requeue-until-done``).
+
+    Shortly before the time-limit ``signal`` is sent to the (batch shell of the) job,
+    which forwards it to the job-script. The job-script should write a checkpoint and stop.
+    Then, unless ``marker`` exists, the job is requeued (``scontrol requeue``):
+    it restarts under the same job-id, and the job-script should restart from its checkpoint.
+    The job is also requeued if the job-script stops successfully without creating ``marker``,
+    but not if it fails (without being signalled).
+
+    :options:
+
+        **script** (``<str>``)
+            The job-script (relative to the working directory of the job).
+
+        **marker** (``<str>``)
+            File that the job-script creates when it is completed
+            (relative to the working directory of the job).
+
+        **interpreter** (``<str>``)
+            Interpreter of the job-script.
+
+        **signal** (``<str>``)
+            Signal sent before the time-limit.
+
+        **before** (``<int>`` | ``<str>``)
+            Time before the time-limit at which the signal is sent
+            (may be human readable, see ``GooseSLUM.duration.asSeconds``).
+
+        **maximum** (``<int>``)
+            Maximum number of times the job is requeued.
+
+        **header** (``<list>``)
+            ``#SBATCH`` lines to include, e.g. those of the job-script.
+
+        **shell** (``<str>``)
+            The shell to use.
+
+    :SBATCH options:
+
+        **mem** (``<int>`` | ``<str>``)
+            Memory claim (may be human readable, see ``GooseSLUM.memory.asSlurm``).
+
+        **time**  (``<str>``)
+            Wall-time claim (may be human readable, see ``GooseSLUM.duration.asSlurm``).
+
+        ...
+    """
+
+    import shlex
+
+    # convert sbatch options
+    for key, item in sbatch.items():
+        if key in ["time"]:
+            sbatch[key] = duration.asSlurm(item)
+        if key in ["mem"]:
+            sbatch[key] = memory.asSlurm(item)
+
+    sbatch["requeue"] = ""
+    sbatch["open-mode"] = "append"
+    sbatch["signal"] = f"B:{signal:s}@{int(duration.asSeconds(before)):d}"
+
+    # - convert to string
+    sbatch = [f"#SBATCH --{key:s} {str(arg):s}".rstrip() for key, arg in sbatch.items()]
+    sbatch = "\n".join(list(header or []) + sbatch)
+
+    if maximum is None:
+        maximum = "# no maximum number of requeues"
+    else:
+        maximum = f"""if [ "${{SLURM_RESTART_COUNT:-0}}" -ge {int(maximum):d} ]; then
+  echo "Not completed after {int(maximum):d} requeues" >&2
+  exit 1
+fi"""
+
+    return """{shell:s}
+{sbatch:s}
+
+# requeue the job until the job-script is completed, written by Gsub --requeue-until-done
+marker={marker:s}
+
+if [ -e "${{marker}}" ]; then
+  exit 0
+fi
+
+# forward the signal (sent before the time-limit) to the job-script, to write a checkpoint
+signalled=0
+trap 'signalled=1; kill -{signal:s} "${{pid}}" 2> /dev/null' {signal:s}
+
+{interpreter:s} {script:s} &
+pid=$!
+
+# "wait" returns when the signal is received: wait until the job-script has stopped
+wait "${{pid}}"
+status=$?
+while kill -0 "${{pid}}" 2> /dev/null; do
+  wait "${{pid}}"
+  status=$?
+done
+
+if [ -e "${{marker}}" ]; then
+  exit 0
+fi
+
+if [ "${{signalled}}" -eq 0 ] && [ "${{status}}" -ne 0 ]; then
+  exit "${{status}}"
+fi
+
+{maximum:s}
+
+scontrol requeue "${{SLURM_JOB_ID}}"
+""".format(
+        shell=shell,
+        sbatch=sbatch,
+        marker=shlex.quote(marker),
+        signal=signal,
+        interpreter=interpreter,
+        script=shlex.quote(script),
+        maximum=maximum,
+    )
@@ -44,6 +44,7 @@ def colors(theme=None):
 def read(data=None):
     r"""
     Read ``sinfo -o "%all"``.
+    A live read also updates the index for shell completion, see ``GooseSLURM.completion``.
 
     :options:
 
@@ -59,7 +60,8 @@ def read(data=None):
     import subprocess
 
     # get live info
-    if data is None:
+    live = data is None
+    if live:
         data = subprocess.check_output('sinfo -o "%all"', shell=True).decode("utf-8")
 
     # extract the header and the info
@@ -83,6 +85,12 @@ def read(data=None):
         # -- store to list of lines
         lines += [info]
 
+    # update the index for shell completion
+    if live:
+        from . import completion
+
+        completion.update(sinfo=lines)
+
     # return output
     return lines
 
@@ -111,6 +119,66 @@ def mem_score(MEMORY, FREE_MEM, CPUS_A, CPUS_T, **kwargs):
     return rich.Float(float(MEM_USED) / float(MEMORY) * float(CPUS_T) / float(CPUS_A), precision=2)
 
 
+def _number(data, convert=float):
+    r"""
+    Convert to a number, ``None`` if the conversion fails.
+    """
+
+    try:
+        return convert(data)
+    except (TypeError, ValueError):
+        return None
+
+
+def typed(lines):
+    r"""
+    Convert the output of ``GooseSLURM.sinfo.read`` to plain values (numbers and strings),
+    for machine-readable output (see ``GooseSLURM.export``).
+    Contrary to ``GooseSLURM.sinfo.interpret`` no ``GooseSLURM.rich`` objects are created:
+    durations are stored in seconds, memory in bytes, and CPU counts as integers.
+    Scores that cannot be computed are ``None``.
+
+    :param lines: The output of ``GooseSLURM.sinfo.read`` (modified in place).
+    :return: The lines, including the derived fields (as ``GooseSLURM.sinfo.interpret``).
+    """
+
+    from . import duration
+    from . import memory
+
+    for line in lines:
+        line["CPU_LOAD"] = _number(line["CPU_LOAD"])
+        line["TIMELIMIT"] = duration.asSeconds(line["TIMELIMIT"], default=line["TIMELIMIT"])
+
+        for key in ["MEMORY", "FREE_MEM"]:
+            line[key] = memory.asBytes(line[key], default=line[key], default_unit=1e6)
+
+        a, i, _, t = (_number(n, int) for n in line["CPUS(A/I/O/T)"].split("/"))
+        line["CPUS_A"] = a
+        line["CPUS_I"] = i
+        line["CPUS_T"] = t
+
+        line["CPU_RELJOB"] = None
+        line["MEM_RELJOB"] = None
+
+        if line["CPU_LOAD"] is not None and a is not None and a > 0:
+            line["CPU_RELJOB"] = line["CPU_LOAD"] / a
+
+        mem = _number(line["MEMORY"])
+        free = _number(line["FREE_MEM"])
+        if None not in [mem, free, t, a] and mem > 0 and a > 0:
+            line["MEM_RELJOB"] = (mem - free) / mem * t / a
+
+        line["CPUS_D"] = 0
+        line["CPUS_O"] = t
+
+        if re.match(r"down,*|maint.*|drain.*", line["STATE"]):
+            line["CPUS_I"] = 0
+            line["CPUS_D"] = t
+            line["CPUS_O"] = 0
+
+    return lines
+
+
 def interpret(lines, theme=colors()):
     r"""
     Interpret the output of ``GooseSLURM.sinfo.read``. All fields are converted to the
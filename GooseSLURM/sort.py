@@ -0,0 +1,225 @@
+r"""
+Sort lines of a table on one or more columns.
+A typed sort key is extracted once per column:
+
+*   Columns of numeric ``GooseSLURM.rich`` objects (``Integer``, ``Float``, ``Duration``,
+    ``Memory``), or of numbers (e.g. ``GooseSLURM.squeue.typed``), are sorted on their numeric
+    value.
+    Non-numeric values (e.g. ``"N/A"``) are always sorted last (also in descending order),
+    and among each other on their string.
+
+*   All other columns are sorted on their string.
+
+The indices of the lines are then sorted at once, by one stable sort on a composite key.
+For several columns the keys of each column are replaced by their categorical codes
+(in reversed order for the columns that are sorted in descending order),
+which are combined into one integer per line (the most significant column weighs most).
+To get only the first (or last) ``n`` lines in sorted order, use ``GooseSLURM.sort.head``
+(or ``GooseSLURM.sort.tail``), or their indices ``GooseSLURM.sort.arghead``
+(or ``GooseSLURM.sort.argtail``). They select the candidates by a partial sort
+(``heapq``) on the primary key, such that only these candidates have to be sorted.
+"""
+
+import heapq
+
+from . import rich
+
+
+def _numeric(cells):
+    r"""
+    Check if all cells are numeric ``GooseSLURM.rich`` objects,
+    or if the cells are numbers, possibly mixed with missing values (strings or ``None``).
+    """
+
+    number = False
+    missing = False
+
+    for cell in cells:
+        if isinstance(cell, (rich.Integer, rich.Float)):
+            continue
+        if isinstance(cell, (int, float)) and not isinstance(cell, bool):
+            number = True
+            continue
+        if cell is None or isinstance(cell, str):
+            missing = True
+            continue
+        return False
+
+    return number or not missing
+
+
+def key(cells, reverse=False):
+    r"""
+    Typed sort key of a column.
+
+    :param cells: List of cells (``GooseSLURM.rich`` objects, strings, or numbers).
+    :param reverse: The key will be used to sort in descending order.
+    :return: List with a sort key per cell.
+    """
+
+    if not _numeric(cells):
+        return [str(cell) for cell in cells]
+
+    data = [cell.data if isinstance(cell, rich.String) else cell for cell in cells]
+    isnan = [not isinstance(i, (int, float)) or i != i for i in data]
+
+    if not any(isnan):
+        return [float(i) for i in data]
+
+    # non-numeric values last: in descending order the flag is inverted
+    return [
+        (n != reverse, 0.0, "" if cell is None else str(cell)) if n else (reverse, float(i), "")
+        for i, cell, n in zip(data, cells, isnan)
+    ]
+
+
+def _codes(values, reverse=False):
+    r"""
+    Categorical codes of a list of sort keys: equal keys have equal codes,
+    and the codes are in the order of the keys (in reversed order if ``reverse=True``).
+
+    :return: The codes, and the number of distinct keys.
+    """
+
+    distinct = sorted(set(values), reverse=reverse)
+    index = {value: i for i, value in enumerate(distinct)}
+    return [index[value] for value in values], len(distinct)
+
+
+def _reverse(keys, reverse):
+    r"""
+    Direction per key.
+    """
+
+    if isinstance(reverse, bool):
+        return [reverse] * len(keys)
+
+    return reverse
+
+
+def argsort(lines, keys, reverse=False):
+    r"""
+    Indices that sort the lines.
+
+    :param lines:
+        List of lines, with each line stored as a dictionary.
+        For example: ``[ {'JOBID': '1234', ...}, ...]``.
+
+    :param keys:
+        List of keys to sort by.
+        As ``numpy.lexsort`` the last key is the primary sort key.
+
+    :param reverse:
+        Sort in descending order.
+        Specify a list to set the order for each key individually.
+        Without keys the lines are kept in their original order, or reversed if ``reverse=True``.
+
+    :return: List of indices.
+    """
+
+    idx = list(range(len(lines)))
+
+    if len(keys) == 0:
+        return idx[::-1] if reverse is True else idx
+
+    reverse = _reverse(keys, reverse)
+
+    if len(keys) == 1:
+        values = key([line[keys[0]] for line in lines], reverse[0])
+        idx.sort(key=values.__getitem__, reverse=reverse[0])
+        return idx
+
+    composite = [0] * len(lines)
+
+    for name, rev in zip(keys[::-1], reverse[::-1]):
+        codes, n = _codes(key([line[name] for line in lines], rev), rev)
+        composite = [i * n + j for i, j in zip(composite, codes)]
+
+    idx.sort(key=composite.__getitem__)
+
+    return idx
+
+
+def sort(lines, keys, reverse=False):
+    r"""
+    Sort lines, see ``GooseSLURM.sort.argsort``.
+
+    :return: List of sorted lines.
+    """
+
+    return [lines[i] for i in argsort(lines, keys, reverse)]
+
+
+def _select(lines, keys, n, reverse, tail):
+    r"""
+    Indices of the first (or last if ``tail = True``) ``n`` lines in sorted order.
+    """
+
+    m = len(lines)
+    n = max(0, min(n, m))
+
+    if n == 0:
+        return []
+
+    if len(keys) == 0 or n == m:
+        idx = argsort(lines, keys, reverse)
+    else:
+        reverse = _reverse(keys, reverse)
+        values = key([line[keys[-1]] for line in lines], reverse[-1])
+        if tail != reverse[-1]:
+            threshold = heapq.nlargest(n, values)[-1]
+            candidates = [i for i, value in enumerate(values) if value >= threshold]
+        else:
+            threshold = heapq.nsmallest(n, values)[-1]
+            candidates = [i for i, value in enumerate(values) if value <= threshold]
+        idx = argsort([lines[i] for i in candidates], keys, reverse)
+        idx = [candidates[i] for i in idx]
+
+    if tail:
+        return idx[-n:]
+
+    return idx[:n]
+
+
+def arghead(lines, keys, n, reverse=False):
+    r"""
+    Indices of the first ``n`` lines in sorted order, see ``GooseSLURM.sort.argsort``.
+
+    :param n: Number of lines to select.
+    :return: List of (at most ``n``) indices.
+    """
+
+    return _select(lines, keys, n, reverse, False)
+
+
+def argtail(lines, keys, n, reverse=False):
+    r"""
+    Indices of the last ``n`` lines in sorted order, see ``GooseSLURM.sort.argsort``.
+
+    :param n: Number of lines to select.
+    :return: List of (at most ``n``) indices.
+    """
+
+    return _select(lines, keys, n, reverse, True)
+
+
+def head(lines, keys, n, reverse=False):
+    r"""
+    First ``n`` lines in sorted order, see ``GooseSLURM.sort.argsort``.
+
+    :param n: Number of lines to select.
+    :return: List of (at most ``n``) sorted lines.
+    """
+
+    return [lines[i] for i in arghead(lines, keys, n, reverse)]
+
+
+def tail(lines, keys, n, reverse=False):
+    r"""
+    Last ``n`` lines in sorted order, see ``GooseSLURM.sort.argsort``.
+
+    :param n: Number of lines to select.
+    :return: List of (at most ``n``) sorted lines.
+    """
+
+    return [lines[i] for i in argtail(lines, keys, n, reverse)]
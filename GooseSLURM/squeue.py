@@ -1,5 +1,9 @@
+from . import duration
+from . import memory
 from . import rich
 
+batch = 1000
+
 
 def colors(theme=None):
     r"""
@@ -30,15 +34,25 @@ def colors(theme=None):
     }
 
 
-def read(data=None):
+def read(data=None, jobs=None, user=None):
     r"""
     Read ``squeue -o "%all"``.
+    A live read also updates the index for shell completion, see ``GooseSLURM.completion``.
 
     :options:
 
       **data** (``<str>``)
         For debugging: specify the output of ``squeue -o "%all"`` as string.
 
+      **jobs** (``<list>``)
+        Only read these jobs (``squeue --array --jobs=...``), one line per array task.
+        Jobs that are no longer in the queue are ignored.
+        The jobs are read in batches (see ``GooseSLURM.squeue.batch``),
+        to keep the command line below the system's limit.
+
+      **user** (``<str>``)
+        Only read the jobs of this user (``squeue --user=...``).
+
     :returns:
 
       **lines** ``<list<dict>>``
@@ -48,8 +62,25 @@ def read(data=None):
     import subprocess
 
     # get live info
-    if data is None:
-        data = subprocess.check_output('squeue -o "%all"', shell=True).decode("utf-8")
+    live = data is None and jobs is None and user is None
+    if data is None and user is not None:
+        cmd = ["squeue", "-o", "%all", f"--user={user}"]
+        data = subprocess.check_output(cmd).decode("utf-8")
+    elif data is None and jobs is not None:
+        jobs = list(map(str, jobs))
+        lines = []
+        for start in range(0, len(jobs), batch):
+            stop = start + batch
+            cmd = ["squeue", "-o", "%all", "--array", "--jobs=" + ",".join(jobs[start:stop])]
+            ret = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if ret.returncode != 0:
+                if b"Invalid job id" in ret.stderr:
+                    continue
+                raise subprocess.CalledProcessError(ret.returncode, cmd, ret.stdout, ret.stderr)
+            lines += read(data=ret.stdout.decode("utf-8"))
+        return lines
+    elif live:
+        data = subprocess.check_output(["squeue", "-o", "%all"]).decode("utf-8")
 
     # extract the header and the info
     head, data = data.split("\n", 1)
@@ -78,11 +109,134 @@ def read(data=None):
         # -- store to list of lines
         lines += [info]
 
+    # update the index for shell completion
+    if live:
+        from . import completion
+
+        completion.update(squeue=lines)
+
     # return output
     return lines
 
 
-def interpret(lines, now=None, theme=colors()):
+def count(user=None):
+    r"""
+    Number of jobs of a user in the queue (array tasks are counted individually),
+    using one (cheap) call: ``squeue --noheader --array --format=%i --user=...``.
+
+    :param user: The user (default: the current user).
+    :return: Number of jobs.
+    """
+
+    import getpass
+    import subprocess
+
+    user = user or getpass.getuser()
+    cmd = ["squeue", "--noheader", "--array", "--format=%i", f"--user={user}"]
+
+    return len(subprocess.check_output(cmd).split())
+
+
+def _converters(now):
+    r"""
+    Conversion of the fields of ``GooseSLURM.squeue.read`` (other fields are converted to string).
+    """
+
+    import time
+
+    # "year-month-dayThour:minute:second" (e.g. "2017-11-05T19:09:53") -> seconds from now
+    def since(data):
+        try:
+            return rich.Duration(int(now - time.mktime(time.strptime(data, "%Y-%m-%dT%H:%M:%S"))))
+        except BaseException:
+            return rich.Duration(data)
+
+    return {
+        # convert to integer
+        "CPUS": rich.Integer,
+        "NODES": rich.Integer,
+        "START_TIME": since,
+        "SUBMIT_TIME": since,
+        # "days-hours:mins:secs" (e.g. "1-4:18:13") -> seconds
+        "TIME_LIMIT": rich.Duration,
+        "TIME_LEFT": rich.Duration,
+        "TIME": rich.Duration,
+        # convert memory (e.g. "4G") -> bytes
+        "MIN_MEMORY": rich.Memory,
+    }
+
+
+def _values(now):
+    r"""
+    Conversion of the fields of ``GooseSLURM.squeue.read`` to plain values,
+    as ``GooseSLURM.squeue._converters`` (values that cannot be converted are kept as string).
+    """
+
+    import time
+
+    def integer(data):
+        try:
+            return int(data)
+        except ValueError:
+            return data
+
+    def since(data):
+        try:
+            return int(now - time.mktime(time.strptime(data, "%Y-%m-%dT%H:%M:%S")))
+        except BaseException:
+            return duration.asSeconds(data, default=data)
+
+    def seconds(data):
+        return duration.asSeconds(data, default=data)
+
+    def size(data):
+        return memory.asBytes(data, default=data)
+
+    return {
+        "CPUS": integer,
+        "NODES": integer,
+        "START_TIME": since,
+        "SUBMIT_TIME": since,
+        "TIME_LIMIT": seconds,
+        "TIME_LEFT": seconds,
+        "TIME": seconds,
+        "MIN_MEMORY": size,
+    }
+
+
+def typed(lines, now=None):
+    r"""
+    Convert the output of ``GooseSLURM.squeue.read`` to plain values (numbers and strings),
+    for machine-readable output (see ``GooseSLURM.export``).
+    Contrary to ``GooseSLURM.squeue.interpret`` no ``GooseSLURM.rich`` objects are created:
+    durations are stored in seconds, memory in bytes, and counts as integers.
+
+    :param lines: The output of ``GooseSLURM.squeue.read`` (modified in place).
+    :param now: Current time (default: now).
+    :return: The lines, including the derived fields ``"CPUS_R"`` and ``"CPUS_PD"``.
+    """
+
+    import time
+
+    if now is None:
+        now = time.mktime(time.localtime())
+
+    convert = _values(now)
+
+    for line in lines:
+        for key, func in convert.items():
+            if key in line:
+                line[key] = func(line[key])
+
+        cpus = line["CPUS"] if isinstance(line["CPUS"], int) else 0
+        running = line["ST"] == "R"
+        line["CPUS_R"] = cpus if running else 0
+        line["CPUS_PD"] = 0 if running else cpus
+
+    return lines
+
+
+def interpret(lines, now=None, theme=colors(), keys=None):
     r"""
     Interpret the output of ``GooseSLURM.squeue.read``. All fields are converted to the
     ``GooseSLURM.rich`` classes adding useful colors in the process.
@@ -97,6 +251,12 @@ def interpret(lines, now=None, theme=colors()):
       **theme** (``<dict>``)
         The color-theme, as selected by ``GooseSLURM.squeue.colors``.
 
+      **keys** (``<list<str>>``)
+        Interpret only these fields (default: all fields).
+        Fields that were interpreted before are skipped.
+        This allows one to interpret only the fields needed to select lines,
+        and to interpret the remaining fields only for the selected lines.
+
     :returns:
 
       **lines** (``<list<dict>>``)
@@ -114,46 +274,30 @@ def interpret(lines, now=None, theme=colors()):
     if not isinstance(lines, list):
         lines = [lines]
 
+    convert = _converters(now)
+    derived = ["CPUS_R", "CPUS_PD"]
+
     # loop over all lines
     for line in lines:
-        # convert to integer
-        for key in ["CPUS", "NODES"]:
-            line[key] = rich.Integer(line[key])
-
-        # "year-month-dayThour:minute:second" (e.g. "2017-11-05T19:09:53") -> seconds from now
-        for key in ["START_TIME", "SUBMIT_TIME"]:
-            try:
-                line[key] = rich.Duration(
-                    int(now - time.mktime(time.strptime(line[key], "%Y-%m-%dT%H:%M:%S")))
-                )
-            except BaseException:
-                line[key] = rich.Duration(line[key])
-
-        # "days-hours:mins:secs" (e.g. "1-4:18:13") -> seconds
-        for key in ["TIME_LIMIT", "TIME_LEFT", "TIME"]:
-            line[key] = rich.Duration(line[key])
-
-        # convert memory (e.g. "4G") -> bytes
-        for key in ["MIN_MEMORY"]:
-            line[key] = rich.Memory(line[key])
+        for key in line if keys is None else keys:
+            if key in derived:
+                continue
+            if not isinstance(line[key], rich.String):
+                line[key] = convert.get(key, rich.String)(line[key])
 
         # specialize number of CPUS
-        if str(line["ST"]) == "R":
-            line["CPUS_R"] = rich.Integer(int(line["CPUS"]))
-            line["CPUS_PD"] = rich.Integer(0)
-        else:
-            line["CPUS_R"] = rich.Integer(0)
-            line["CPUS_PD"] = rich.Integer(int(line["CPUS"]))
-
-        # convert remaining fields to string
-        for key in line:
-            if not isinstance(line[key], rich.String):
-                line[key] = rich.String(line[key])
+        if keys is None or "CPUS_R" in keys or "CPUS_PD" in keys:
+            if "CPUS_R" not in line:
+                cpus = int(rich.Integer(str(line["CPUS"])))
+                running = str(line["ST"]) == "R"
+                line["CPUS_R"] = rich.Integer(cpus if running else 0)
+                line["CPUS_PD"] = rich.Integer(0 if running else cpus)
 
         # highlight queued jobs
         if str(line["ST"]) == "PD":
             for key in line:
-                line[key].color = theme["queued"]
+                if isinstance(line[key], rich.String):
+                    line[key].color = theme["queued"]
 
     return lines
 
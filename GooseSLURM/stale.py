@@ -0,0 +1,182 @@
+r"""
+Make-style up-to-date check of job-scripts (see ``Gsub --if-stale``).
+
+A job-script declares its inputs and outputs with directives::
+
+    #GSUB input=mesh.h5 params.yaml
+    #GSUB output=result.h5
+
+or in a sidecar file ``<job-script>.gsub`` (YAML)::
+
+    input: [mesh.h5, params.yaml]
+    output: [result.h5]
+
+Paths are relative to the directory of the job-script, and may be glob patterns.
+The job-script itself is always an input.
+
+A job-script is up-to-date if its last job completed, all its outputs exist,
+and none of its inputs changed since the outputs were written.
+An input changed if it is newer than the oldest output (or if there are no outputs),
+unless its content is identical to when the job-script was last submitted.
+For the latter, the modification time, size, and hash of the inputs are cached at submission
+(see ``GooseSLURM.stale.record``); an input is only hashed if its modification time or size
+differs from the cache.
+"""
+
+import glob
+import os
+
+directive = "#GSUB"
+
+
+def declared(filename):
+    r"""
+    Inputs and outputs declared by a job-script.
+
+    :param filename: The job-script.
+    :return: ``{"input": [...], "output": [...]}`` (paths, relative to the current directory).
+    """
+
+    ret = {"input": [], "output": []}
+    sidecar = f"{filename}.gsub"
+
+    with open(filename) as file:
+        for line in file:
+            line = line.strip()
+            if not line.startswith(directive):
+                continue
+            key, _, value = line.split(directive, 1)[1].strip().partition("=")
+            key = key.strip()
+            if key not in ret:
+                raise ValueError(f'"{filename}": unknown directive "{line}"')
+            ret[key] += value.split()
+
+    if os.path.isfile(sidecar):
+        from . import fileio
+
+        data = fileio.YamlRead(sidecar) or {}
+        for key in ret:
+            value = data.get(key, [])
+            ret[key] += [str(i) for i in (value if isinstance(value, list) else [value])]
+
+    root = os.path.dirname(filename)
+    ret["input"] = [filename] + expand(ret["input"], root)
+    ret["output"] = expand(ret["output"], root)
+
+    return ret
+
+
+def expand(patterns, root="."):
+    r"""
+    Expand glob patterns (relative to ``root``).
+    Patterns without matches are returned as path (of a missing file).
+
+    :param patterns: List of patterns.
+    :param root: Directory relative to which the patterns are specified.
+    :return: List of paths.
+    """
+
+    ret = []
+
+    for pattern in patterns:
+        pattern = os.path.normpath(os.path.join(root, pattern))
+        ret += sorted(glob.glob(pattern)) or [pattern]
+
+    return ret
+
+
+def sha256(path):
+    r"""
+    Hash of the content of a file.
+    """
+
+    import hashlib
+
+    ret = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            ret.update(chunk)
+
+    return ret.hexdigest()
+
+
+def signature(path, previous=None):
+    r"""
+    Signature of a file: modification time, size, and hash.
+
+    :param path: The file.
+    :param previous: A previous signature: its hash is reused if the modification time and size
+        are unchanged.
+    :return: ``{"mtime": ..., "size": ..., "sha256": ...}``.
+    """
+
+    stat = os.stat(path)
+    ret = {"mtime": stat.st_mtime, "size": stat.st_size}
+
+    if previous and previous.get("mtime") == ret["mtime"] and previous.get("size") == ret["size"]:
+        ret["sha256"] = previous["sha256"]
+    else:
+        ret["sha256"] = sha256(path)
+
+    return ret
+
+
+def is_stale(filename, completed, cache=None):
+    r"""
+    Check if a job-script has to be (re)submitted.
+
+    :param filename: The job-script.
+    :param completed: ``True`` if the last job of the job-script completed.
+    :param cache: See ``GooseSLURM.stale.record`` (default: nothing recorded).
+    :return: ``True`` if the job-script is stale.
+    """
+
+    if not completed:
+        return True
+
+    files = declared(filename)
+
+    if not all(os.path.isfile(path) for path in files["output"]):
+        return True
+
+    oldest = min([os.stat(path).st_mtime for path in files["output"]], default=None)
+    if cache is None:
+        cache = {}
+
+    recorded = cache.get(os.path.abspath(filename), {})
+
+    for path in files["input"]:
+        if not os.path.isfile(path):
+            return True
+        if oldest is not None and os.stat(path).st_mtime <= oldest:
+            continue
+        previous = recorded.get(os.path.abspath(path))
+        if previous is None:
+            return True
+        current = signature(path, previous)
+        if current["size"] != previous["size"] or current["sha256"] != previous["sha256"]:
+            return True
+
+    return False
+
+
+def record(filename, cache):
+    r"""
+    Record the signature of the inputs of a job-script, when it is submitted.
+
+    :param filename: The job-script.
+    :param cache:
+        Cache (``{job-script: {input: signature, ...}, ...}``, with absolute paths),
+        modified in-place.
+    """
+
+    known = {path: sig for inputs in cache.values() for path, sig in inputs.items()}
+    inputs = {}
+
+    for path in declared(filename)["input"]:
+        if os.path.isfile(path):
+            key = os.path.abspath(path)
+            inputs[key] = signature(path, known.get(key))
+
+    cache[os.path.abspath(filename)] = inputs
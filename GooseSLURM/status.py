@@ -0,0 +1,125 @@
+r"""
+Status of (many) jobs, using one ``squeue`` and one ``sacct`` call.
+
+Jobs in the queue are read with ``squeue`` (``GooseSLURM.squeue.read``).
+The state of all other jobs is read with ``sacct`` (``GooseSLURM.sacct.read_jobs``).
+Each state is classified as one of ``categories``:
+
+*   ``"pending"``: in the queue, waiting to start.
+*   ``"running"``: in the queue, started (running, completing, suspended, ...).
+*   ``"completed"``: finished successfully.
+*   ``"timeout"``: reached its time-limit.
+*   ``"failed"``: failed, cancelled, out-of-memory, node failure, preempted, ...
+*   ``"unknown"``: neither in the queue nor in the accounting database.
+"""
+
+import subprocess
+
+categories = ["pending", "running", "completed", "timeout", "failed", "unknown"]
+
+# short (squeue) state codes
+_short = {
+    "PD": "PENDING",
+    "R": "RUNNING",
+    "CG": "COMPLETING",
+    "CF": "CONFIGURING",
+    "S": "SUSPENDED",
+    "ST": "STOPPED",
+    "RQ": "REQUEUED",
+    "RH": "REQUEUE_HOLD",
+    "RF": "REQUEUE_FED",
+    "RS": "RESIZING",
+    "RD": "RESV_DEL_HOLD",
+    "RV": "REVOKED",
+    "SI": "SIGNALING",
+    "SE": "SPECIAL_EXIT",
+    "SO": "STAGE_OUT",
+    "CD": "COMPLETED",
+    "F": "FAILED",
+    "TO": "TIMEOUT",
+    "CA": "CANCELLED",
+    "NF": "NODE_FAIL",
+    "OOM": "OUT_OF_MEMORY",
+    "BF": "BOOT_FAIL",
+    "DL": "DEADLINE",
+    "PR": "PREEMPTED",
+}
+
+_pending = ["PENDING", "REQUEUED", "REQUEUE_HOLD", "REQUEUE_FED", "RESV_DEL_HOLD", "SPECIAL_EXIT"]
+
+_running = ["RUNNING", "COMPLETING", "CONFIGURING", "SUSPENDED", "STOPPED", "RESIZING"]
+_running += ["SIGNALING", "STAGE_OUT"]
+
+
+def category(state):
+    r"""
+    Classify a state.
+
+    :param state: State, e.g. ``"PD"`` (squeue) or ``"CANCELLED by 1234"`` (sacct).
+    :return: One of ``GooseSLURM.status.categories``.
+    """
+
+    if state is None:
+        return "unknown"
+
+    state = str(state).strip().upper()
+    state = _short.get(state, state)
+    state = state.split(" ")[0].rstrip("+")
+
+    if state in _pending:
+        return "pending"
+    if state in _running:
+        return "running"
+    if state == "COMPLETED":
+        return "completed"
+    if state == "TIMEOUT":
+        return "timeout"
+    if len(state) == 0 or state == "UNKNOWN":
+        return "unknown"
+
+    return "failed"
+
+
+def read(jobids):
+    r"""
+    Read the state of jobs.
+    Calls ``squeue`` once for all jobs, and ``sacct`` once for all jobs that are not in the queue.
+
+    :param jobids: List of job-ids (array tasks as ``"1234_5"``).
+    :return: Dictionary with the state of each job-id (as string), ``None`` if unknown.
+    """
+
+    from . import sacct
+    from . import squeue
+
+    jobids = list(dict.fromkeys(str(jobid) for jobid in jobids))
+    ret = {jobid: None for jobid in jobids}
+
+    for line in squeue.read(jobs=jobids):
+        if line["JOBID"] in ret:
+            ret[line["JOBID"]] = line["ST"]
+
+    missing = [jobid for jobid, state in ret.items() if state is None]
+
+    try:
+        lines = sacct.read_jobs(missing)
+    except subprocess.CalledProcessError:
+        # e.g. accounting is not available: the state of finished jobs is unknown
+        lines = []
+
+    for line in lines:
+        if line["JobID"] in ret and ret[line["JobID"]] is None:
+            ret[line["JobID"]] = line["State"]
+
+    return ret
+
+
+def classify(jobids):
+    r"""
+    Classify jobs, see ``GooseSLURM.status.read`` and ``GooseSLURM.status.category``.
+
+    :param jobids: List of job-ids (array tasks as ``"1234_5"``).
+    :return: Dictionary with the category of each job-id (as string).
+    """
+
+    return {jobid: category(state) for jobid, state in read(jobids).items()}
@@ -0,0 +1,412 @@
+r"""
+Submit (chains of) jobs concurrently, adapting the concurrency to the load of the controller.
+
+*   Independent chains are submitted in parallel by a pool of workers.
+    The jobs of one chain are submitted in order: each job depends on the previous job of
+    its chain (``--dependency``).
+
+*   The number of concurrent ``sbatch`` calls is controlled by ``GooseSLURM.submit.Controller``
+    (additive increase, multiplicative decrease):
+    it increases while ``sbatch`` is fast, and is halved if ``sbatch`` is slow or fails with a
+    transient error (e.g. ``"Socket timed out"`` for a busy controller).
+
+*   Submissions that fail with a transient error are retried, with an exponential backoff
+    with (full) jitter. Other errors are raised.
+    A time-out while sending or receiving (e.g. ``"Socket timed out on send/recv operation"``)
+    does not tell if the job was submitted: it is not retried (to never submit a job twice)
+    but raised (see ``GooseSLURM.submit.is_ambiguous``).
+"""
+
+import random
+import re
+import subprocess
+import threading
+import time
+
+from . import duration
+from . import memory
+
+# errors of sbatch for which a retry might succeed
+transient = re.compile(
+    "|".join(
+        [
+            r"Socket timed out",
+            r"Unable to contact slurm controller",
+            r"Resource temporarily unavailable",
+            r"Connection refused",
+            r"Connection timed out",
+            r"Transient",
+            r"try again",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# errors of sbatch after which the job might have been submitted
+ambiguous = re.compile(r"Socket timed out", re.IGNORECASE)
+
+
+def _text(error):
+    r"""
+    Output of a failed command.
+
+    :param error: The exception.
+    :return: The error message (``str``).
+    """
+
+    text = error.stderr or error.output or ""
+
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", "replace")
+
+    return text
+
+
+def is_transient(error):
+    r"""
+    Check if an error of ``sbatch`` is transient (such that a retry might succeed).
+
+    :param error: The exception (``subprocess.CalledProcessError`` to check its ``stderr``).
+    :return: ``True`` if the error is transient.
+    """
+
+    if isinstance(error, subprocess.TimeoutExpired):
+        return True
+
+    if not isinstance(error, subprocess.CalledProcessError):
+        return False
+
+    return transient.search(_text(error)) is not None
+
+
+def is_ambiguous(error):
+    r"""
+    Check if an error of ``sbatch`` leaves it unknown if the job was submitted
+    (a time-out while sending or receiving). Such a submission should not be retried blindly.
+
+    :param error: The exception (``subprocess.CalledProcessError`` to check its ``stderr``).
+    :return: ``True`` if the error is ambiguous.
+    """
+
+    if isinstance(error, subprocess.TimeoutExpired):
+        return True
+
+    if not isinstance(error, subprocess.CalledProcessError):
+        return False
+
+    return ambiguous.search(_text(error)) is not None
+
+
+class Controller:
+    r"""
+    Limit the number of concurrent submissions (additive increase, multiplicative decrease).
+
+    Use as::
+
+        controller.acquire()
+        try:
+            ...
+        finally:
+            controller.release(latency, ok)
+
+    :param maximum: Maximum number of concurrent submissions.
+    :param minimum: Minimum number of concurrent submissions.
+    :param latency: Latency (in seconds) above which a submission is considered slow.
+    :param delay: Minimal time (in seconds) between the start of two submissions.
+    """
+
+    def __init__(self, maximum=8, minimum=1, latency=2.0, delay=0.0):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.latency = latency
+        self.delay = delay
+        self.limit = float(minimum)
+        self.active = 0
+        self.last = None
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        r"""
+        Wait until a submission is allowed.
+        """
+
+        with self.condition:
+            while self.active >= int(self.limit):
+                self.condition.wait()
+            self.active += 1
+            now = time.monotonic()
+            start = now if self.last is None else max(now, self.last + self.delay)
+            self.last = start
+
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, latency=0.0, ok=True):
+        r"""
+        Signal that a submission has finished.
+
+        :param latency: Duration of the submission (in seconds).
+        :param ok: ``False`` if the submission failed with a transient error.
+        """
+
+        with self.condition:
+            self.active -= 1
+            if ok and latency <= self.latency:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            else:
+                self.limit = max(self.minimum, self.limit / 2.0)
+            self.condition.notify_all()
+
+
+def backoff(attempt, base=1.0, cap=60.0):
+    r"""
+    Time to wait before a retry: exponential backoff with (full) jitter.
+
+    :param attempt: Number of the attempt (0 for the first retry).
+    :param base: Wait time of the first retry (upper bound, in seconds).
+    :param cap: Maximum wait time (in seconds).
+    :return: Time to wait (in seconds).
+    """
+
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def call(func, controller, retries=5, base=1.0, cap=60.0):
+    r"""
+    Call a function as controlled submission, retrying transient errors
+    (see ``GooseSLURM.submit.is_transient``).
+    Ambiguous errors (see ``GooseSLURM.submit.is_ambiguous``) are raised without retry,
+    as the job might have been submitted.
+
+    :param func: Function (without arguments) that submits.
+    :param controller: ``GooseSLURM.submit.Controller``.
+    :param retries: Maximum number of retries.
+    :param base: See ``GooseSLURM.submit.backoff``.
+    :param cap: See ``GooseSLURM.submit.backoff``.
+    :return: The return value of ``func``.
+    """
+
+    for attempt in range(retries + 1):
+        controller.acquire()
+        tic = time.monotonic()
+        try:
+            ret = func()
+        except Exception as error:
+            ok = not is_transient(error)
+            controller.release(time.monotonic() - tic, ok)
+            if ok or attempt == retries or is_ambiguous(error):
+                raise
+        else:
+            controller.release(time.monotonic() - tic, True)
+            return ret
+
+        time.sleep(backoff(attempt, base, cap))
+
+
+def rate(text, size=None):
+    r"""
+    Interpret a rate of job starts (see ``Gsub --stagger``), as either:
+
+    *   A number of jobs per unit of time, e.g. ``"10/m"`` or ``"100/h"`` or ``"1/30s"``.
+    *   An I/O budget, e.g. ``"2G/s"``, with ``size`` the amount of data that each job reads
+        (at its start), e.g. ``"500M"``.
+
+    :param text: The rate.
+    :param size: Amount of data per job (required for an I/O budget).
+    :return: Number of jobs per second.
+    """
+
+    count, _, unit = text.partition("/")
+    unit = {"": "s", "sec": "s", "min": "m", "hour": "h", "day": "d"}.get(unit, unit)
+
+    if re.match(r"^[a-zA-Z]$", unit):
+        unit = "1" + unit
+
+    seconds = duration.asSeconds(unit)
+
+    if size is None:
+        n = duration.asSeconds(count)
+        if not n and (count.endswith("B") or memory.asBytes(count, 0) > 0):
+            raise ValueError(
+                f'Rate "{text}" is in bytes: it requires the amount of data per job '
+                "(Gsub --stagger-read)"
+            )
+    else:
+        n = memory.asBytes(count.rstrip("B"), 0)
+        size = memory.asBytes(size.rstrip("B"), 0)
+        n = n / size if size > 0 else 0
+
+    if not seconds or not n or n <= 0 or seconds <= 0:
+        raise ValueError(f'Unable to interpret rate "{text}"')
+
+    return n / seconds
+
+
+def begin(start, index, rate):
+    r"""
+    Start time of a job in a staggered schedule (see ``GooseSLURM.submit.rate``).
+
+    :param start: Start time of the first job (seconds since the epoch, see ``time.time``).
+    :param index: Index of the job in the schedule.
+    :param rate: Number of jobs per second.
+    :return: Start time as ``sbatch --begin`` argument, e.g. ``"2024-01-01T12:00:00"``.
+    """
+
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(start + index / rate))
+
+
+class Cap:
+    r"""
+    Limit the number of jobs in the queue (e.g. to stay below ``MaxSubmitJobs``).
+    Use ``acquire(n)`` before submitting ``n`` jobs, and ``release(n)`` once they are submitted.
+
+    The number of jobs in the queue is polled (with ``count``) only if the cap seems to be
+    reached (counting the jobs acquired since the last poll). While the cap is reached,
+    the queue is polled every ``interval`` seconds.
+    Jobs that are acquired but not yet released are added to the polled count,
+    as they may not be in the queue yet.
+    The poll is shared by all threads. A poll that fails is treated as a full queue.
+
+    :param maximum: Maximum number of jobs in the queue.
+    :param count: Function that returns the number of jobs in the queue.
+    :param interval: Time (in seconds) between polls while the cap is reached.
+    :param sleep: Function to sleep (for testing).
+    """
+
+    def __init__(self, maximum, count, interval=30.0, sleep=time.sleep):
+        self.maximum = maximum
+        self.count = count
+        self.interval = interval
+        self.sleep = sleep
+        self.queued = None
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.mutex = threading.Lock()
+
+    def acquire(self, n=1):
+        r"""
+        Wait until ``n`` jobs can be added to the queue.
+
+        :param n: Number of jobs (at most ``maximum``).
+        """
+
+        if n > self.maximum:
+            raise ValueError(f"Cannot queue {n:d} jobs at once with at most {self.maximum:d} jobs")
+
+        with self.lock:
+            while True:
+                if self.queued is None or self.queued + n > self.maximum:
+                    # read "pending" before polling: a job that is released in between
+                    # is counted twice, rather than not at all
+                    with self.mutex:
+                        pending = self.pending
+                    try:
+                        self.queued = self.count() + pending
+                    except (OSError, subprocess.CalledProcessError):
+                        self.queued = None
+                if self.queued is not None and self.queued + n <= self.maximum:
+                    self.queued += n
+                    with self.mutex:
+                        self.pending += n
+                    return
+                self.sleep(self.interval)
+
+    def release(self, n=1):
+        r"""
+        Signal that ``n`` acquired jobs have been submitted.
+
+        :param n: Number of jobs.
+        """
+
+        with self.mutex:
+            self.pending = max(0, self.pending - n)
+
+
+def run(chains, submit, callback=None, controller=None, retries=5, gate=None):
+    r"""
+    Submit chains of jobs. Chains are submitted in parallel, the jobs of each chain in order.
+    On an error no new jobs are submitted, and the error is raised once the running
+    submissions have finished.
+
+    :param chains:
+        List of chains, with each chain a list of jobs.
+        A job can be any object, it is passed to ``submit`` and ``callback``.
+        Can also be an iterator (e.g. a generator), from which the chains are read as needed.
+
+    :param submit:
+        Function ``submit(job, dependency)`` that submits a job and returns its job-id.
+        ``dependency`` is the job-id of the previous job in the chain (``None`` for the first job).
+
+    :param callback:
+        Function ``callback(job, jobid)`` called after each successful submission.
+        Calls are serialised. An error of ``callback`` stops the submission as a failed
+        submission does.
+
+    :param controller: ``GooseSLURM.submit.Controller`` (default: ``Controller()``).
+    :param retries: Maximum number of retries of each submission.
+
+    :param gate:
+        Function ``gate(job)`` called before submitting each job, that blocks until the
+        job may be submitted (e.g. using ``GooseSLURM.submit.Cap``).
+    """
+
+    if controller is None:
+        controller = Controller()
+
+    lock = threading.Lock()
+    queue = iter(chains)
+    errors = []
+
+    def worker():
+        while True:
+            with lock:
+                if len(errors) > 0:
+                    return
+                try:
+                    chain = next(queue)
+                except StopIteration:
+                    return
+                except Exception as error:
+                    errors.append(error)
+                    return
+            dependency = None
+            for job in chain:
+                if len(errors) > 0:
+                    return
+                if gate is not None:
+                    try:
+                        gate(job)
+                    except Exception as error:
+                        with lock:
+                            errors.append(error)
+                        return
+                try:
+                    jobid = call(lambda: submit(job, dependency), controller, retries)
+                except Exception as error:
+                    with lock:
+                        errors.append(error)
+                    return
+                if callback is not None:
+                    with lock:
+                        try:
+                            callback(job, jobid)
+                        except Exception as error:
+                            errors.append(error)
+                            return
+                dependency = jobid
+
+    n = min(controller.maximum, len(chains)) if hasattr(chains, "__len__") else controller.maximum
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        for thread in threads:
+            thread.join()
+    except BaseException as error:
+        errors.append(error)
+        raise
+
+    if len(errors) > 0:
+        raise errors[0]
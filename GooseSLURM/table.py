@@ -1,8 +1,17 @@
-import io
+import itertools
+import operator
 
+from . import duration
+from . import memory
 from . import output
 from . import rich
 
+# number of lines written to the pager at once
+_chunk = 1000
+
+# number of lines of which the cells are read at once (while they are in the CPU cache)
+_block = 2000
+
 
 def print_long(lines):
     r"""
@@ -27,8 +36,6 @@ def print_long(lines):
         Note that all data has to be stored as one as string,
         or as one the GooseSLURM.rich classes (no rich printing is used though).
     """
-    sio = io.StringIO()
-
     # width of the field-names
     # - initialize
     width = 0
@@ -41,107 +48,145 @@ def print_long(lines):
     head = "{{key:<{width:d}.{width:d}s}}".format(width=width + 1)
     fmt = "{{key:<{width:d}.{width:d}s}}: {{data:s}}".format(width=width + 1)
 
-    # print header
-    print(head.format(key="-" * 100, data=""), file=sio)
+    with output.Pager() as pager:
+        # print header
+        pager.write(head.format(key="-" * 100, data="") + "\n")
 
-    # print dat, file=sioa
-    for line in lines:
-        for key in sorted(line):
-            print(fmt.format(key=key, data=str(line[key])), file=sio)
-        print(head.format(key="-" * 100, data=""), file=sio)
-
-    output.autoprint(sio.getvalue())
+        # print data
+        for line in lines:
+            for key in sorted(line):
+                pager.write(fmt.format(key=key, data=str(line[key])) + "\n")
+            pager.write(head.format(key="-" * 100, data="") + "\n")
 
 
-def print_columns(
-    lines,
-    columns,
-    header,
-    no_truncate=False,
-    sep=", ",
-    width=None,
-    print_header=True,
-):
+def _column(cells):
     r"""
-    Print table to fit the screen. This function can show data truncated, or even suppress columns
-    if there is insufficient room.
+    Unformatted text and color of a column of cells.
+    Columns of a single ``GooseSLURM.rich`` type are read at once from the attributes of the cells
+    (``GooseSLURM.rich.Duration`` and ``GooseSLURM.rich.Memory`` are converted at once by
+    ``GooseSLURM.duration.asHumanArray`` and ``GooseSLURM.memory.asHumanArray``).
+
+    :param cells: List of cells, each a ``GooseSLURM.rich`` object or a string.
+    :return:
+        ``(text, colors)``: list of strings, and list of colors (``None`` if no cell has a color).
+    """
 
-    :param lines:
-        List of lines, with each line stored as a dictionary.
-        Note that all data has to be stored as one of the GooseSLURM.rich classes
-        (to customize the color, precision, ...) or as string.
-        For example: ``[ {'JOBID': '1234', ...}, ...]``.
+    kinds = set(map(type, cells))
+    kind = kinds.pop() if len(kinds) == 1 else None
 
-    :param columns
-        List with print settings of each column:
-        - 'key'     : the key-name used to store each line (see ``lines`` below)
-        - 'width'   : minimum print width (expanded as much as possible to fit the data)
-        - 'align'   : alignment of the column
-        - 'priority': priority of column expansion, columns marked ``True`` are expanded first
-        For example: ``[ {'key': 'JOBID', 'width': 7, 'align': '>', 'priority': True}, ...]``.
+    if kind not in [rich.String, rich.Integer, rich.Float, rich.Duration, rich.Memory]:
+        colors = [getattr(cell, "color", None) for cell in cells]
+        return list(map(str, cells)), colors if any(colors) else None
 
-    :param header: Header name for each column. For example: ``{'JOBID': 'JobID', ...}``.
-    :param no_truncate: Disable truncation of columns: expand each column to fit the data.
-    :param sep: Separator between columns.
-    :param width: Number of characters on one line. ``None``: use current terminal's width.
-    :param print_header: Optionally skip printing of header.
+    data = list(map(operator.attrgetter("data"), cells))
+    colors = list(map(operator.attrgetter("color"), cells))
+    colors = colors if any(colors) else None
+    types = set(map(type, data))
+
+    if kind in [rich.String, rich.Integer]:
+        if types == {str}:
+            return data, colors
+        return list(map(str, data)), colors
+
+    precision = set(map(operator.attrgetter("precision"), cells))
+
+    if len(precision) != 1 or not types.issubset({int, float}):
+        return list(map(str, cells)), colors
+
+    if kind is rich.Float:
+        return list(map(f"%.{precision.pop():d}f".__mod__, data)), colors
+
+    if kind is rich.Duration:
+        return duration.asHumanArray(data, precision.pop()), colors
+
+    return memory.asHumanArray(data, precision.pop()), colors
+
+
+def _pad(text, width, align="<", colors=None, truncate=True):
+    r"""
+    Truncate/pad a column of strings to a fixed width, and optionally apply colors.
+
+    :param text: List of strings.
+    :param width: Print width.
+    :param align: Alignment (``"<"``, ``">"``, or ``"^"``).
+    :param colors: Color of each cell (``None`` or ``""`` for no color).
+    :param truncate: Set ``False`` if no string is wider than ``width`` (skips truncation).
+    :return: List of strings.
     """
-    sio = io.StringIO()
 
-    # check available data
-    # --------------------
+    pad = {"<": str.ljust, ">": str.rjust, "^": str.center}[align]
 
-    # function to check if a "key" present in all lines
-    def inlines(lines, key):
-        # - check all lines
-        for line in lines:
-            if key not in line:
-                return False
-        # - all lines passed: return True
-        return True
+    if truncate:
+        text = [i[:width] for i in text]
 
-    # select columns based on data availability
-    columns = [column for column in columns if inlines(lines, column["key"])]
+    text = list(map(pad, text, itertools.repeat(width)))
 
-    # select header based on columns
-    header = {column["key"]: header[column["key"]] for column in columns}
+    if colors is None:
+        return text
 
-    # convert to GooseSLURM.rich
-    # --------------------------
+    return [f"\x1b[{c:s}m{t:s}\x1b[0m" if c else t for t, c in zip(text, colors)]
 
-    for line in lines:
-        for key in line:
-            if not isinstance(line[key], rich.String):
-                line[key] = rich.String(line[key])
 
-    for key in header:
-        if not isinstance(header[key], rich.String):
-            header[key] = rich.String(header[key])
+def render_columns(
+    lines,
+    columns,
+    header,
+    no_truncate=False,
+    sep=", ",
+    width=None,
+    print_header=True,
+):
+    r"""
+    Render table to fit the screen, see ``GooseSLURM.table.print_columns``.
+    The table is constructed column-by-column, the input is not modified.
 
-    # compute column-width, based on data
-    # -----------------------------------
+    :return: Iterator over lines (without newline).
+    """
 
-    # initialize
+    # unformatted text (and colors) of each column, read in blocks of lines
+    # (columns that are not available in all lines are skipped)
+    text = {column["key"]: [] for column in columns}
+    colors = {key: [] for key in text}
+
+    for start in range(0, len(lines), _block):
+        stop = start + _block
+        block = lines[start:stop]
+        for key in list(text):
+            try:
+                cells = list(map(operator.itemgetter(key), block))
+            except KeyError:
+                del text[key]
+                continue
+            value, color = _column(cells)
+            text[key] += value
+            colors[key] += itertools.repeat(None, len(value)) if color is None else color
+
+    for key in text:
+        colors[key] = colors[key] if any(colors[key]) else None
+
+    # select columns based on data availability (work on copies of the print settings)
+    columns = [dict(column) for column in columns if column["key"] in text]
+
+    if len(columns) == 0:
+        return
+
+    # header as rich string (to get alignment and color)
+    head = {}
     for column in columns:
-        column["real"] = 0
+        value = header[column["key"]]
+        head[column["key"]] = value if isinstance(value, rich.String) else rich.String(value)
 
-    # get actual width
-    # - header
+    # the width that each column needs
     for column in columns:
-        column["real"] = max(column["real"], len(str(header[column["key"]])))
-    # - data
-    for line in lines:
-        for column in columns:
-            column["real"] = max(column["real"], len(str(line[column["key"]])))
+        key = column["key"]
+        column["real"] = max(len(str(head[key])), max(map(len, text[key]), default=0))
 
     # auto-limit columns, auto-adjust their width
     # -------------------------------------------
 
     if no_truncate:
-        # set all columns to the real width
-        for line in lines:
-            for column in columns:
-                column["width"] = column["real"]
+        for column in columns:
+            column["width"] = column["real"]
 
     else:
         # get the terminal size
@@ -151,26 +196,25 @@ def print_columns(
             width, _ = shutil.get_terminal_size()
 
         # get the cumulative minimum size of the columns (+ spacing between the columns)
-        # - first entry
-        columns[0]["total"] = columns[0]["width"]
-        # - all other entries
-        for i in range(1, len(columns)):
-            columns[i]["total"] = columns[i - 1]["total"] + columns[i]["width"] + len(sep)
+        total = -len(sep)
+        for column in columns:
+            total += column["width"] + len(sep)
+            column["total"] = total
 
         # truncate at terminal size
         columns = [column for column in columns if column["total"] <= width]
 
+        if len(columns) == 0:
+            return
+
         # get the available size to expand
         room = width - columns[-1]["total"]
 
         # expand minimum width, as long there is room
-        # - distinguish priorities for expanding
-        low = [column["key"] for column in columns if not column.get("priority", False)]
-        high = [column["key"] for column in columns if column["key"] not in low]
-        # - expand
-        for prio in [high, low]:
+        # (columns marked with "priority" are expanded first)
+        for prio in [True, False]:
             for column in columns:
-                if column["key"] not in prio:
+                if column.get("priority", False) != prio:
                     continue
                 if room <= 0:
                     break
@@ -180,39 +224,79 @@ def print_columns(
                 column["width"] += dw
                 room -= dw
 
-    # apply width
-    for line in lines:
+    # render
+    # ------
+
+    if print_header:
+        hline = []
+        names = []
         for column in columns:
-            line[column["key"]].width = column["width"]
-            line[column["key"]].align = column["align"]
+            h = head[column["key"]]
+            hline += _pad(["=" * column["width"]], column["width"], h.align, [h.color])
+            names += _pad([str(h)], column["width"], h.align, [h.color])
+        yield sep.join(hline)
+        yield sep.join(names)
+        yield sep.join(hline)
+
+    data = []
+    for column in columns:
+        key = column["key"]
+        truncate = column["real"] > column["width"]
+        data.append(_pad(text[key], column["width"], column["align"], colors[key], truncate))
 
-    # print to screen
-    # ---------------
+    yield from map(sep.join, zip(*data))
 
-    # select header based on columns
-    header = {column["key"]: header[column["key"]] for column in columns}
 
-    # apply width to header
-    for column in columns:
-        header[column["key"]].width = column["width"]
+def print_columns(
+    lines,
+    columns,
+    header,
+    no_truncate=False,
+    sep=", ",
+    width=None,
+    print_header=True,
+):
+    r"""
+    Print table to fit the screen. This function can show data truncated, or even suppress columns
+    if there is insufficient room.
 
-    # separator
-    # - copy from header
-    hline = {key: rich.String(**value.__dict__) for key, value in header.items()}
-    # - convert from header (print format retained)
-    for key in hline:
-        hline[key].data = "=" * hline[key].width
+    :param lines:
+        List of lines, with each line stored as a dictionary.
+        Note that all data has to be stored as one of the GooseSLURM.rich classes
+        (to customize the color, precision, ...) or as string.
+        For example: ``[ {'JOBID': '1234', ...}, ...]``.
 
-    # header
-    if print_header:
-        print(sep.join(hline[column["key"]].format() for column in columns), file=sio)
-        print(sep.join(header[column["key"]].format() for column in columns), file=sio)
-        print(sep.join(hline[column["key"]].format() for column in columns), file=sio)
-    # data
-    for line in lines:
-        print(sep.join(line[column["key"]].format() for column in columns), file=sio)
+    :param columns
+        List with print settings of each column:
+        - 'key'     : the key-name used to store each line (see ``lines`` below)
+        - 'width'   : minimum print width (expanded as much as possible to fit the data)
+        - 'align'   : alignment of the column
+        - 'priority': priority of column expansion, columns marked ``True`` are expanded first
+        For example: ``[ {'key': 'JOBID', 'width': 7, 'align': '>', 'priority': True}, ...]``.
 
-    output.autoprint(sio.getvalue())
+    :param header: Header name for each column. For example: ``{'JOBID': 'JobID', ...}``.
+    :param no_truncate: Disable truncation of columns: expand each column to fit the data.
+    :param sep: Separator between columns.
+    :param width: Number of characters on one line. ``None``: use current terminal's width.
+    :param print_header: Optionally skip printing of header.
+    """
+
+    ret = render_columns(
+        lines=lines,
+        columns=columns,
+        header=header,
+        no_truncate=no_truncate,
+        sep=sep,
+        width=width,
+        print_header=print_header,
+    )
+
+    with output.Pager() as pager:
+        while True:
+            chunk = list(itertools.islice(ret, _chunk))
+            if len(chunk) == 0:
+                break
+            pager.write("\n".join(chunk) + "\n")
 
 
 def print_list(lines, key, sep=" "):
@@ -234,10 +318,8 @@ def print_list(lines, key, sep=" "):
       **sep** ([``' '``] | ``<str>``)
         Separator between columns.
     """
-    sio = io.StringIO()
-
-    for line in lines:
-        print(line[key], end=sep, file=sio)
+    with output.Pager() as pager:
+        for line in lines:
+            pager.write(str(line[key]) + sep)
 
-    print("", file=sio)
-    output.autoprint(sio.getvalue())
+        pager.write("\n")
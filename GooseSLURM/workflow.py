@@ -0,0 +1,165 @@
+r"""
+Workflows: a graph of job-scripts with dependencies (see ``Gsub --workflow``).
+
+A workflow is specified as YAML file, that lists the jobs by name::
+
+    prepare:
+        script: prepare.slurm
+    run_a:
+        script: a/run.slurm
+        afterok: [prepare]
+    run_b:
+        script: b/run.slurm
+        afterok: prepare
+        options: [--mem, 4G]
+    collect:
+        script: collect.slurm
+        afterany: [run_a, run_b]
+
+Each job has a ``script`` (relative to the directory of the YAML file),
+optionally dependencies on other jobs, as ``after``, ``afterok``, ``afterany``, or ``afternotok``
+(see ``sbatch --dependency``), and optionally a list of extra ``sbatch`` ``options``.
+
+The jobs are sorted in levels (``GooseSLURM.workflow.levels``),
+such that the jobs of one level only depend on jobs of earlier levels.
+"""
+
+import os
+
+types = ["after", "afterok", "afterany", "afternotok"]
+
+
+def normalize(spec, root="."):
+    r"""
+    Normalize a workflow.
+
+    :param spec: Workflow (``{name: {"script": ..., "afterok": [...], ...}, ...}``).
+    :param root: Directory relative to which the scripts are specified.
+    :return:
+        Workflow, with for each job: ``"script"`` (path relative to the current directory),
+        ``"options"`` (list), and a list of job-names for each of ``GooseSLURM.workflow.types``.
+    """
+
+    if not isinstance(spec, dict):
+        raise ValueError("A workflow must list the jobs by name")
+
+    ret = {}
+
+    for name, node in spec.items():
+        if node is None:
+            node = {}
+
+        if not isinstance(node, dict):
+            raise ValueError(f'Job "{name}" not interpretable')
+
+        unknown = [key for key in node if key not in types + ["script", "options"]]
+
+        if len(unknown) > 0:
+            raise ValueError(f'Job "{name}": unknown key(s) {", ".join(map(str, unknown))}')
+
+        script = os.path.normpath(os.path.join(root, str(node.get("script", name))))
+        options = [str(i) for i in node.get("options", [])]
+        job = {"script": os.path.relpath(script), "options": options}
+
+        for key in types:
+            value = node.get(key, [])
+            job[key] = [str(i) for i in (value if isinstance(value, list) else [value])]
+
+        ret[str(name)] = job
+
+    return ret
+
+
+def read(filename):
+    r"""
+    Read a workflow from a YAML file, see ``GooseSLURM.workflow.normalize``.
+
+    :param filename: The YAML file.
+    :return: Workflow.
+    """
+
+    from . import fileio
+
+    return normalize(fileio.YamlRead(filename), os.path.dirname(filename))
+
+
+def levels(workflow):
+    r"""
+    Sort the jobs of a workflow topologically.
+
+    :param workflow: Workflow, see ``GooseSLURM.workflow.normalize``.
+    :return: List of levels, each a list of job-names (in order of the workflow).
+    """
+
+    parents = {}
+
+    for name, job in workflow.items():
+        parents[name] = {parent for key in types for parent in job[key]}
+        for parent in parents[name]:
+            if parent not in workflow:
+                raise ValueError(f'Job "{name}" depends on unknown job "{parent}"')
+
+    ret = []
+    done = set()
+
+    while len(done) < len(workflow):
+        level = [name for name in workflow if name not in done and parents[name] <= done]
+        if len(level) == 0:
+            cycle = sorted(name for name in workflow if name not in done)
+            raise ValueError(f'Circular dependencies between jobs: {", ".join(cycle)}')
+        ret.append(level)
+        done.update(level)
+
+    return ret
+
+
+def dependencies(job, jobids):
+    r"""
+    Dependencies of a job on submitted jobs.
+
+    :param job: Job, see ``GooseSLURM.workflow.normalize``.
+    :param jobids: Job-id per job-name.
+    :return: List of ``(type, jobid)``, e.g. ``[("afterok", 1234), ...]``.
+    """
+
+    return [(key, jobids[parent]) for key in types for parent in job[key]]
+
+
+def dependency(deps):
+    r"""
+    Format dependencies as (argument of) ``sbatch --dependency``.
+
+    :param deps: List of ``(type, jobid)``.
+    :return: E.g. ``"afterok:1234:1235,afterany:1236"``.
+    """
+
+    ret = {}
+
+    for key, jobid in deps:
+        ret.setdefault(key, []).append(str(jobid))
+
+    return ",".join(f"{key}:{':'.join(jobids)}" for key, jobids in ret.items())
+
+
+def reduce(deps, maximum, barrier):
+    r"""
+    Limit the number of dependencies of a job by depending on "barrier" jobs that each depend on
+    (at most ``maximum``) dependencies.
+    A barrier job does nothing, it only completes successfully if its dependencies are satisfied,
+    such that the job can depend on the barriers with ``afterok``.
+
+    :param deps: List of ``(type, jobid)``.
+    :param maximum: Maximum number of dependencies of a job.
+    :param barrier: Function that submits a barrier job: ``barrier(dependency)`` returns its job-id.
+    :return: List of ``(type, jobid)`` (at most ``maximum``).
+    """
+
+    maximum = max(2, maximum)
+
+    while len(deps) > maximum:
+        deps = [
+            ("afterok", barrier(dependency(deps[i:][:maximum])))
+            for i in range(0, len(deps), maximum)
+        ]
+
+    return deps
@@ -1,4 +1,5 @@
 import argparse
+import fcntl
 import inspect
 import os
 import pwd
@@ -12,18 +13,71 @@ dirname = os.path.dirname(os.path.abspath(__file__))
 logfile = "_sbatch.yaml"
 
 
+def _lock():
+    """
+    Lock the log-file (until the process exits), such that concurrent calls do not collide.
+    """
+
+    file = open(logfile, "a")
+    fcntl.flock(file, fcntl.LOCK_EX)
+    return file
+
+
+# long names of the (short) states
+states = {
+    "PD": "PENDING",
+    "R": "RUNNING",
+    "CG": "COMPLETING",
+    "CD": "COMPLETED",
+    "F": "FAILED",
+    "TO": "TIMEOUT",
+    "CA": "CANCELLED",
+    "OOM": "OUT_OF_MEMORY",
+    "NF": "NODE_FAIL",
+}
+
+# states of jobs in the queue
+queued = ["PD", "R", "CG"]
+
+
+def _tasks(job):
+    """
+    Expand a job array into its tasks (with job-id "JOBID_TASKID").
+    Other jobs are returned as they are.
+    """
+
+    if "array" not in job:
+        return [job]
+
+    ret = []
+
+    for part in str(job["array"]).split("%")[0].split(","):
+        first, last = (part.split("-") * 2)[:2] if "-" in part else (part, part)
+        for task in range(int(first), int(last) + 1):
+            ret.append(dict(job, jobid=f"{job['jobid']}_{task}", array=task))
+
+    return ret
+
+
+def _dependency(text):
+    """
+    Dependency: a job-id (as int), or a dependency list (e.g. "afterok:1:2,afterany:3").
+    """
+    return int(text) if text.isdigit() else text
+
+
 def sbatch():
     """
     Dummy ``sbatch`` command.
     A local file '_sbatch.yaml' in the current working directory will contain the history of
     'submitted' jobs.
+    The state of a new job is "PD", or the environment variable 'DUMMYSLURM_STATE' (if set).
     """
 
-    log = []
+    lock = _lock()  # noqa: F841
 
-    if os.path.isfile(os.path.realpath(logfile)):
-        with open(logfile) as file:
-            log = yaml.load(file.read(), Loader=yaml.FullLoader)
+    with open(logfile) as file:
+        log = yaml.load(file.read(), Loader=yaml.FullLoader) or []
 
     class MyFmt(
         argparse.RawDescriptionHelpFormatter,
@@ -36,10 +90,10 @@ def sbatch():
     doc = textwrap.dedent(inspect.getdoc(globals()[funcname]))
 
     parser = argparse.ArgumentParser(formatter_class=MyFmt, description=doc)
-    parser.add_argument("script", type=str)
+    parser.add_argument("script", type=str, nargs="?")
     parser.add_argument("-A", "--account", type=str, default="default")
     parser.add_argument("-c", "--cpus-per-task", type=str, default="1")
-    parser.add_argument("-d", "--dependency", type=int)
+    parser.add_argument("-d", "--dependency", type=_dependency)
     parser.add_argument("-J", "--job-name", type=str)
     parser.add_argument("-N", "--nodes", type=str, default="1")
     parser.add_argument("-n", "--ntasks", type=str, default="1")
@@ -47,13 +101,26 @@ def sbatch():
     parser.add_argument("-t", "--time", type=str, default="1:00:00")
     parser.add_argument("--mem", type=str, default="5000000000")
     parser.add_argument("--chdir", type=str)
+    parser.add_argument("-a", "--array", type=str)
+    parser.add_argument("-o", "--output", type=str)
+    parser.add_argument("--wrap", type=str)
+    parser.add_argument("-b", "--begin", type=str)
+    parser.add_argument("--requeue", action="store_true", default=None)
+    parser.add_argument("--open-mode", type=str)
+    parser.add_argument("--signal", type=str)
     args = parser.parse_args()
 
+    if args.script is None and args.wrap is None:
+        parser.error("Specify a script or --wrap")
+
+    if args.script is None:
+        args.script = "wrap"
+
     if args.job_name is None:
         args.job_name = args.script
 
     # read SBATCH options from script
-    if os.path.isfile(args.script):
+    if args.wrap is None and os.path.isfile(args.script):
         extra = []
         with open(args.script) as file:
             lines = file.read().split("\n")
@@ -63,16 +130,16 @@ def sbatch():
         if len(extra) > 0:
             args = parser.parse_args(extra + sys.argv[1:])
 
-    jobid = len(log) + 1
+    jobid = max([job["jobid"] for job in log], default=0) + 1
     mylog = vars(args).copy()
     for key, value in dict(mylog).items():
         if value is None:
             del mylog[key]
 
-    mylog["state"] = "PD"
+    mylog["state"] = os.environ.get("DUMMYSLURM_STATE", "PD")
     mylog["jobid"] = jobid
     mylog["user"] = pwd.getpwuid(os.getuid())[0]
-    mylog["command"] = os.path.abspath(mylog["script"])
+    mylog["command"] = os.path.abspath(os.path.join(args.chdir or "", mylog["script"]))
     if args.chdir:
         mylog["workdir"] = args.chdir
     else:
@@ -93,11 +160,10 @@ def scancel():
     'submitted' jobs.
     """
 
-    log = []
+    lock = _lock()  # noqa: F841
 
-    if os.path.isfile(os.path.realpath(logfile)):
-        with open(logfile) as file:
-            log = yaml.load(file.read(), Loader=yaml.FullLoader)
+    with open(logfile) as file:
+        log = yaml.load(file.read(), Loader=yaml.FullLoader) or []
 
     class MyFmt(
         argparse.RawDescriptionHelpFormatter,
@@ -130,9 +196,36 @@ def squeue():
 
     if os.path.isfile(os.path.realpath(logfile)):
         with open(logfile) as file:
-            log = yaml.load(file.read(), Loader=yaml.FullLoader)
+            log = yaml.load(file.read(), Loader=yaml.FullLoader) or []
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("-o", "--format", type=str)
+    parser.add_argument("-r", "--array", action="store_true")
+    parser.add_argument("-j", "--jobs", type=str)
+    parser.add_argument("-u", "--user", type=str)
+    parser.add_argument("-h", "--noheader", action="store_true")
+    args = parser.parse_args()
+
+    log = [i for i in log if i.get("state", "PD") in queued]
+
+    if args.user:
+        log = [i for i in log if i["user"] in args.user.split(",")]
+
+    if args.array:
+        log = [task for job in log for task in _tasks(job)]
+
+    if args.jobs:
+        jobids = args.jobs.split(",")
+        log = [i for i in log if str(i["jobid"]) in jobids]
+
+    if args.format == "%i":
+        if not args.noheader:
+            print("JOBID")
+        for i in log:
+            print(i["jobid"])
+        return 0
 
-    if sys.argv[1:] == ["-o", "%all"]:
+    if args.format == "%all":
         keys = [
             "ACCOUNT",
             "TRES_PER_NODE",
@@ -200,8 +293,10 @@ def squeue():
             "TIME": "time",
             "USER": "user",
             "WORK_DIR": "workdir",
+            "COMMAND": "command",
             "HOST": "host",
             "TIME_START": "time_start",
+            "ARRAY_TASK_ID": "array",
         }
 
         print("|".join([i.upper() for i in keys]))
@@ -219,7 +314,7 @@ def scontrol():
 
     if os.path.isfile(os.path.realpath(logfile)):
         with open(logfile) as file:
-            log = yaml.load(file.read(), Loader=yaml.FullLoader)
+            log = yaml.load(file.read(), Loader=yaml.FullLoader) or []
 
     if re.match(r"^(show job )([0-9]*)", " ".join(sys.argv[1:])):
         jobid = int(re.split(r"^(show job )([0-9]*)", " ".join(sys.argv[1:]))[2])
@@ -308,21 +403,31 @@ def scontrol():
 
 
 def sacct():
-    args = sys.argv[1:]
     log = []
 
     if os.path.isfile(os.path.realpath(logfile)):
         with open(logfile) as file:
-            log = yaml.load(file.read(), Loader=yaml.FullLoader)
+            log = yaml.load(file.read(), Loader=yaml.FullLoader) or []
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-X", "--allocations", action="store_true")
+    parser.add_argument("-p", "--parsable", action="store_true")
+    parser.add_argument("-l", "--long", action="store_true")
+    parser.add_argument("-j", "--jobs", type=str)
+    parser.add_argument("-o", "--format", type=str)
+    parser.add_argument("-a", "--allusers", action="store_true")
+    parser.add_argument("-S", "--starttime", type=str)
+    args = parser.parse_args()
 
-    allocations = False
-    if "-X" in sys.argv[1:]:
-        allocations = True
-        args.remove("-X")
+    if not args.parsable or not (args.jobs or args.starttime) or not (args.long or args.format):
+        raise OSError("Command not implemented")
 
-    if re.match(r"^(-p -l -j )([0-9\,]*)", " ".join(args)):
-        jobids = map(int, re.split(r"^(-p -l -j )([0-9\,]*)", " ".join(args))[2].split(","))
+    # all jobs (regardless of their start time) if no job-ids are specified
+    jobids = args.jobs.split(",") if args.jobs else None
 
+    if args.format:
+        keys = args.format.split(",")
+    else:
         keys = [
             "JobID",
             "JobIDRaw",
@@ -382,30 +487,37 @@ def sacct():
             "TRESUsageOutTot",
         ]
 
-        alias = {
-            "JobID": "jobid",
-            "JobName": "job_name",
-        }
-
-        lines = []
-
-        for i in log:
-            if i["jobid"] in jobids:
-                base = [str(i.get(alias.get(key, "NONE"), "")) for key in keys]
-                batch = [r for r in base]
-                extern = [r for r in base]
-                batch[0] = batch[0] + ".batch"
-                extern[0] = extern[0] + ".extern"
-                lines.append("|".join(base) + "|")
-                if not allocations:
-                    lines.append("|".join(batch) + "|")
-                    lines.append("|".join(extern) + "|")
-
-        if len(lines) > 0:
-            print("|".join(keys) + "|")
-            print("\n".join(lines))
-            return 0
-
-        raise OSError("JobID not found")
+    alias = {
+        "JobID": "jobid",
+        "JobName": "job_name",
+        "WorkDir": "workdir",
+        "Timelimit": "time",
+        "ReqMem": "mem",
+        "ExitCode": "exit_code",
+        "NodeList": "nodelist",
+    }
+
+    lines = []
+
+    for job in log:
+        for i in _tasks(job):
+            if jobids is not None and str(i["jobid"]) not in jobids:
+                if str(job["jobid"]) not in jobids:
+                    continue
+            i = dict(i, State=states.get(i.get("state", "PD"), i.get("state")))
+            base = [str(i.get(alias.get(key, key), "")) for key in keys]
+            batch = [r for r in base]
+            extern = [r for r in base]
+            batch[0] = batch[0] + ".batch"
+            extern[0] = extern[0] + ".extern"
+            lines.append("|".join(base) + "|")
+            if not args.allocations:
+                lines.append("|".join(batch) + "|")
+                lines.append("|".join(extern) + "|")
+
+    if len(lines) > 0 or args.format:
+        print("|".join(keys) + "|")
+        print("\n".join(lines))
+        return 0
 
-    raise OSError("Command not implemented")
+    raise OSError("JobID not found")
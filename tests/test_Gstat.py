@@ -0,0 +1,92 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import GooseSLURM.cli_Gstat
+
+squeue = (
+    "ACCOUNT|JOBID|NAME|MIN_MEMORY|COMMAND|ST|USER|CPUS|NODES|DEPENDENCY|TIME_LEFT|"
+    "NODELIST(REASON)|PARTITION|START_TIME|WORK_DIR\n"
+    "acc1|1|a.slurm|1G|/tmp/a.slurm|R|alice|4|1|(null)|1:00:00|f001|gpu|N/A|/tmp\n"
+    "acc1|2|b.slurm|1G|/tmp/b.slurm|PD|alice|8|1|(null)|1:00:00|(Priority)|serial|N/A|/tmp\n"
+    "acc2|3|c.slurm|1G|/tmp/c.slurm|R|bob|2|1|(null)|1:00:00|f002|gpu|N/A|/tmp\n"
+)
+
+
+class Test_Gstat(unittest.TestCase):
+    """
+    Test Gstat commands.
+    """
+
+    def run_Gstat(self, args):
+        with tempfile.TemporaryDirectory() as temp:
+            filename = os.path.join(temp, "squeue.txt")
+            with open(filename, "w") as file:
+                file.write(squeue)
+            sio = io.StringIO()
+            with contextlib.redirect_stdout(sio):
+                GooseSLURM.cli_Gstat.main(["--debug", filename] + args)
+            return sio.getvalue()
+
+    def test_summary(self):
+        ret = json.loads(self.run_Gstat(["--summary", "--format", "json"]))
+        self.assertEqual(
+            ret,
+            [
+                {
+                    "User": "alice",
+                    "Account": "acc1",
+                    "#CPU": 12,
+                    "#CPU(R)": 4,
+                    "#CPU(PD)": 8,
+                    "Partition": "gpu,serial",
+                },
+                {
+                    "User": "bob",
+                    "Account": "acc2",
+                    "#CPU": 2,
+                    "#CPU(R)": 2,
+                    "#CPU(PD)": 0,
+                    "Partition": "gpu",
+                },
+            ],
+        )
+
+    def test_format(self):
+        # "plain": human-readable values as in the table
+        ret = self.run_Gstat(["--format", "plain", "-o", "JobID", "-o", "Tleft", "-o", "MEM"])
+        self.assertEqual(
+            ret.splitlines(), ["JobID Tleft MEM", "1 1.0h 1.0G", "3 1.0h 1.0G", "2 1.0h 1.0G"]
+        )
+
+        # machine-readable formats: raw values
+        ret = self.run_Gstat(["--format", "csv", "-o", "JobID", "-o", "Tleft", "-o", "MEM"])
+        self.assertEqual(ret.splitlines()[1], "1,3600,1000000000")
+
+    def test_summary_by(self):
+        ret = json.loads(self.run_Gstat(["--summary-by", "ST", "--format", "json"]))
+        self.assertEqual([line["ST"] for line in ret], ["PD", "R"])
+        self.assertEqual([line["User"] for line in ret], ["alice", "alice,bob"])
+        self.assertEqual([line["#CPU(R)"] for line in ret], [0, 6])
+
+        ret = self.run_Gstat(["--summary-by", "Partition,ST", "--format", "csv"])
+        self.assertEqual(ret.splitlines()[0], "Partition,ST,User,Account,#CPU,#CPU(R),#CPU(PD)")
+        self.assertEqual(ret.splitlines()[1], 'gpu,R,"alice,bob","acc1,acc2",6,6,0')
+
+        ret = self.run_Gstat(["--summary-by", "ST", "--width", "200", "--colors", "none"])
+        header = ["ST", "User", "Account", "#CPU", "#CPU(R)", "#CPU(PD)", "Partition"]
+        self.assertEqual(ret.splitlines()[1].split(), header)
+        self.assertEqual(
+            ret.splitlines()[4].split(), ["R", "alice,bob", "acc1,acc2", "6", "6", "-", "gpu"]
+        )
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                self.run_Gstat(["--summary-by", "foo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import datetime
+import fcntl
 import os
+import shutil
 import subprocess
+import time
 import unittest
 
 import dummyslurm
@@ -42,7 +46,7 @@ class Test_Gsub(unittest.TestCase):
         self.assertIn(myjob, log)
         self.assertEqual(log[myjob], [1])
 
-        subprocess.check_output(["Gsub", "--quiet", "--log", mylog, myjob])
+        subprocess.check_output(["Gsub", "--quiet", "--allow-duplicates", "--log", mylog, myjob])
         log = GooseSLURM.fileio.YamlRead(mylog)
 
         self.assertIn(myjob, log)
@@ -52,6 +56,42 @@ class Test_Gsub(unittest.TestCase):
         os.remove(myjob)
         os.remove(mylog)
 
+    def test_duplicates(self):
+        myjobs = ["myjob_0.slurm", "myjob_1.slurm"]
+
+        for filename in [dummyslurm.logfile] + myjobs:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        for myjob in myjobs:
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+
+        subprocess.check_output(["Gsub", "--quiet", myjobs[0]])
+        subprocess.check_output(["Gsub", "--quiet"] + myjobs)
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        self.assertEqual([job["script"] for job in log], myjobs)
+
+        ret = subprocess.run(["Gsub", "--quiet", "--strict"] + myjobs, capture_output=True)
+        self.assertNotEqual(ret.returncode, 0)
+        self.assertEqual(len(GooseSLURM.fileio.YamlRead(dummyslurm.logfile)), 2)
+
+        # the queue is not read with --dry-run
+        cmd = ["Gsub", "--dry-run", "--strict"] + myjobs
+        ret = subprocess.run(cmd, capture_output=True, text=True)
+        self.assertEqual(ret.returncode, 0)
+        self.assertEqual(ret.stdout.count("sbatch"), 2)
+        self.assertEqual(len(GooseSLURM.fileio.YamlRead(dummyslurm.logfile)), 2)
+
+        # finished jobs are no duplicates
+        log[0]["state"] = "CD"
+        GooseSLURM.fileio.YamlDump(dummyslurm.logfile, log)
+        subprocess.check_output(["Gsub", "--quiet", "--strict", myjobs[0]])
+        self.assertEqual(len(GooseSLURM.fileio.YamlRead(dummyslurm.logfile)), 3)
+
+        for filename in [dummyslurm.logfile] + myjobs:
+            os.remove(filename)
+
     def test_repeat(self):
         myjob = "myjob.slurm"
 
@@ -101,6 +141,452 @@ class Test_Gsub(unittest.TestCase):
         for myjob in myjobs:
             os.remove(myjob)
 
+    def test_array(self):
+        myjobs = ["myjob_1.slurm", "myjob_2.slurm", "myjob_3.slurm"]
+        mylog = "mylog.yaml"
+        dispatchers = ["Gsub_array_0.slurm", "Gsub_array_1.slurm"]
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs + dispatchers:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        for myjob in myjobs[:2]:
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+
+        with open(myjobs[2], "w") as file:
+            file.write("#!/bin/bash\n#SBATCH --time=2:00:00\necho foo\n")
+
+        subprocess.check_output(
+            ["Gsub", "--quiet", "--array", "--throttle", "2", "--log", mylog] + myjobs
+        )
+
+        log = GooseSLURM.fileio.YamlRead(mylog)
+
+        # the arrays are submitted concurrently (in arbitrary order)
+        jobs = {job["script"]: job for job in GooseSLURM.fileio.YamlRead(dummyslurm.logfile)}
+        self.assertEqual(sorted(jobs), dispatchers)
+        self.assertEqual(jobs[dispatchers[0]]["array"], "0-1%2")
+        self.assertEqual(jobs[dispatchers[1]]["array"], "0-0%2")
+        self.assertEqual(jobs[dispatchers[1]]["time"], "2:00:00")
+
+        i, j = (jobs[dispatcher]["jobid"] for dispatcher in dispatchers)
+        self.assertEqual(log, {myjobs[0]: [f"{i}_0"], myjobs[1]: [f"{i}_1"], myjobs[2]: [f"{j}_0"]})
+
+        with open(dispatchers[0]) as file:
+            script = file.read()
+
+        for myjob in myjobs[:2]:
+            self.assertIn(myjob, script)
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs + dispatchers:
+            os.remove(filename)
+
+    def test_resume(self):
+        myjobs = [f"myjob_{i:d}.slurm" for i in range(6)]
+        mylog = "mylog.yaml"
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        for myjob in myjobs:
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+
+        subprocess.check_output(["Gsub", "--quiet", "--log", mylog] + myjobs[:5])
+
+        # jobs: running, completed, failed, timed-out, cancelled (removed from the accounting)
+        state = {"myjob_0.slurm": "R", "myjob_1.slurm": "CD", "myjob_2.slurm": "F"}
+        state["myjob_3.slurm"] = "TO"
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        log = [dict(job, state=state[job["script"]]) for job in log if job["script"] in state]
+        GooseSLURM.fileio.YamlDump(dummyslurm.logfile, log)
+
+        cmd = ["Gsub", "--quiet", "--resume", "--log", mylog, "--resume-timeout", "skip"]
+        subprocess.check_output(cmd + myjobs)
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        self.assertEqual([job["script"] for job in log[4:]], ["myjob_2.slurm", "myjob_5.slurm"])
+
+        log = GooseSLURM.fileio.YamlRead(mylog)
+        self.assertEqual(len(log["myjob_2.slurm"]), 2)
+        self.assertEqual(len(log["myjob_1.slurm"]), 1)
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs:
+            os.remove(filename)
+
+    def test_retry_from(self):
+        myjobs = [f"myjob_{i:d}.slurm" for i in range(5)]
+        mylog = "mylog.yaml"
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        for myjob in myjobs:
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+
+        subprocess.check_output(["Gsub", "--quiet", "--log", mylog] + myjobs)
+
+        # jobs: completed, failed, timed-out, out-of-memory, completed with non-zero exit code
+        state = {"myjob_0.slurm": "CD", "myjob_1.slurm": "F", "myjob_2.slurm": "TO"}
+        state.update({"myjob_3.slurm": "OOM", "myjob_4.slurm": "CD"})
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        log = [dict(job, state=state[job["script"]], exit_code="0:0") for job in log]
+        log = {job["script"]: job for job in log}
+        log["myjob_3.slurm"]["mem"] = "4G"
+        log["myjob_4.slurm"]["exit_code"] = "3:0"
+        log = list(log.values())
+        GooseSLURM.fileio.YamlDump(dummyslurm.logfile, log)
+
+        cmd = ["Gsub", "--quiet", "--retry-from", mylog, "--retry-time", "x2", "--retry-mem", "+2G"]
+        subprocess.check_output(cmd)
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        retried = {job["script"]: job for job in log[5:]}
+        self.assertEqual(sorted(retried), ["myjob_1.slurm", "myjob_2.slurm", "myjob_3.slurm"])
+        self.assertEqual(retried["myjob_1.slurm"]["time"], "1:00:00")
+        self.assertEqual(retried["myjob_2.slurm"]["time"], "0-02:00:00")
+        self.assertEqual(retried["myjob_3.slurm"]["mem"], "6G")
+
+        log = GooseSLURM.fileio.YamlRead(mylog)
+        self.assertEqual([len(log[myjob]) for myjob in myjobs], [1, 2, 2, 2, 1])
+
+        # select by exit code
+        subprocess.check_output(
+            ["Gsub", "--quiet", "--retry-from", mylog, "--retry-exit-code", "3"]
+        )
+        log = GooseSLURM.fileio.YamlRead(mylog)
+        self.assertEqual([len(log[myjob]) for myjob in myjobs], [1, 2, 2, 2, 2])
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs:
+            os.remove(filename)
+
+    def test_avoid_bad_nodes(self):
+        myjob = "myjob.slurm"
+        cache = "mycache"
+
+        for filename in [dummyslurm.logfile, myjob]:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        with open(myjob, "w") as file:
+            file.write(GooseSLURM.scripts.plain(myjob))
+
+        log = [{"jobid": i + 1, "nodelist": f"node0[{i % 3:d}-{i % 3 + 1:d}]"} for i in range(30)]
+        log = [dict(job, state="CD") for job in log]
+        log += [{"jobid": 31 + i, "nodelist": "node07", "state": "F"} for i in range(5)]
+        GooseSLURM.fileio.YamlDump(dummyslurm.logfile, log)
+
+        env = dict(os.environ, GOOSESLURM_CACHE=cache)
+        cmd = ["Gsub", "--dry-run", "--avoid-bad-nodes", "--exclude", "node01", myjob]
+        output = subprocess.check_output(cmd, env=env).decode("utf-8")
+        self.assertIn("Excluding 1 bad node(s): node07", output)
+        self.assertIn("--exclude node01,node07", output)
+        self.assertTrue(os.path.isfile(os.path.join(cache, "badnodes.json")))
+
+        shutil.rmtree(cache)
+
+        for filename in [dummyslurm.logfile, myjob]:
+            os.remove(filename)
+
+    def test_requeue(self):
+        myjob = "myjob.slurm"
+        wrapper = "Gsub_requeue_myjob.slurm"
+        mylog = "mylog.yaml"
+
+        for filename in [dummyslurm.logfile, myjob, wrapper, mylog]:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        with open(myjob, "w") as file:
+            file.write(GooseSLURM.scripts.plain("python run.py", time="1h"))
+
+        cmd = ["Gsub", "--quiet", "--log", mylog, "--requeue-until-done", "{name}.done"]
+        subprocess.check_output(cmd + ["--requeue-before", "10m", myjob])
+
+        with open(wrapper) as file:
+            text = file.read()
+
+        self.assertIn("#SBATCH --time 0-01:00:00", text)
+        self.assertIn("marker=myjob.slurm.done", text)
+        self.assertIn('scontrol requeue "${SLURM_JOB_ID}"', text)
+
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        self.assertEqual(len(log), 1)
+        self.assertEqual(log[0]["script"], wrapper)
+        self.assertEqual(log[0]["job_name"], myjob)
+        self.assertEqual(log[0]["signal"], "B:USR1@600")
+        self.assertTrue(log[0]["requeue"])
+
+        log = GooseSLURM.fileio.YamlRead(mylog)
+        self.assertEqual(log, {myjob: [1]})
+
+        for filename in [dummyslurm.logfile, myjob, wrapper, mylog]:
+            os.remove(filename)
+
+    def test_manifest(self):
+        myjobs = [f"myjob_{i:d}.slurm" for i in range(4)]
+        manifest = "manifest.txt"
+
+        for filename in [dummyslurm.logfile, manifest] + myjobs:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        for myjob in myjobs:
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+
+        with open(manifest, "w") as file:
+            file.write("# job-scripts\n\n")
+            file.write("\n".join(myjobs[:3]) + "\n")
+            file.write(f"{myjobs[3]} --mem 4G\n")
+
+        subprocess.check_output(["Gsub", "--quiet", "--manifest", manifest])
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        self.assertEqual(sorted(job["script"] for job in log), myjobs)
+        self.assertEqual([job["mem"] for job in log if job["script"] == myjobs[3]], ["4G"])
+
+        os.remove(dummyslurm.logfile)
+
+        with open(manifest) as file:
+            subprocess.check_output(["Gsub", "--quiet", "--manifest", "-"], stdin=file)
+
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        self.assertEqual(len(log), 4)
+
+        with open(manifest, "a") as file:
+            file.write("nonexisting.slurm\n")
+
+        ret = subprocess.run(["Gsub", "--quiet", "--manifest", manifest], capture_output=True)
+        self.assertNotEqual(ret.returncode, 0)
+        self.assertIn(b"nonexisting.slurm", ret.stderr)
+
+        for filename in [dummyslurm.logfile, manifest] + myjobs:
+            os.remove(filename)
+
+    def test_find(self):
+        root = "myfind"
+        dirs = [os.path.join(root, f"a{i:d}", f"b{j:d}") for i in range(3) for j in range(3)]
+        myjobs = [os.path.join(d, "job.slurm") for d in dirs]
+        skip = [os.path.join(root, "skip", "job.slurm"), os.path.join(root, ".git", "job.slurm")]
+
+        if os.path.isfile(dummyslurm.logfile):
+            os.remove(dummyslurm.logfile)
+
+        shutil.rmtree(root, ignore_errors=True)
+
+        for myjob in myjobs + skip:
+            os.makedirs(os.path.dirname(myjob), exist_ok=True)
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+            with open(os.path.join(os.path.dirname(myjob), "other.slurm.txt"), "w") as file:
+                file.write("")
+
+        cmd = ["Gsub", "--quiet", "--find", root, "--name", "job.slurm", "--prune", "skip"]
+        subprocess.check_output(cmd)
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        workdirs = sorted(job["workdir"] for job in log)
+        self.assertEqual(workdirs, sorted(os.path.abspath(d) for d in dirs))
+
+        # only the job-scripts without a job in the queue
+        log = [job for job in log if job["workdir"] != os.path.abspath(dirs[0])]
+        GooseSLURM.fileio.YamlDump(dummyslurm.logfile, log)
+        subprocess.check_output(cmd + ["--skip-queued"])
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        self.assertEqual(log[-1]["workdir"], os.path.abspath(dirs[0]))
+        self.assertEqual(len(log), len(dirs))
+
+        # a nonexisting root is an error
+        os.remove(dummyslurm.logfile)
+        ret = subprocess.run(["Gsub", "--quiet", "--find", "nonexisting"], capture_output=True)
+        self.assertNotEqual(ret.returncode, 0)
+        self.assertIn(b"nonexisting", ret.stderr)
+        self.assertFalse(os.path.isfile(dummyslurm.logfile))
+
+        shutil.rmtree(root)
+
+    def test_if_stale(self):
+        myjobs = ["myjob_0.slurm", "myjob_1.slurm"]
+        mylog = "mylog.yaml"
+        other = ["input.txt", "output_0.txt", "output_1.txt", "mylog.yaml.stale"]
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs + other:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        with open("input.txt", "w") as file:
+            file.write("data")
+
+        for i, myjob in enumerate(myjobs):
+            with open(myjob, "w") as file:
+                file.write(f"#!/bin/bash\n#GSUB input=input.txt\n#GSUB output=output_{i:d}.txt\n")
+
+        cmd = ["Gsub", "--quiet", "--log", mylog, "--if-stale"] + myjobs
+        subprocess.check_output(cmd)
+        self.assertEqual(len(GooseSLURM.fileio.YamlRead(dummyslurm.logfile)), 2)
+
+        # pending: skipped
+        subprocess.check_output(cmd)
+        self.assertEqual(len(GooseSLURM.fileio.YamlRead(dummyslurm.logfile)), 2)
+
+        # completed, outputs only for "myjob_0.slurm"
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        log = [dict(job, state="CD") for job in log]
+        GooseSLURM.fileio.YamlDump(dummyslurm.logfile, log)
+
+        with open("output_0.txt", "w") as file:
+            file.write("result")
+
+        subprocess.check_output(cmd)
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        self.assertEqual([job["script"] for job in log[2:]], ["myjob_1.slurm"])
+
+        # input changed
+        log = [dict(job, state="CD") for job in log]
+        GooseSLURM.fileio.YamlDump(dummyslurm.logfile, log)
+
+        with open("output_1.txt", "w") as file:
+            file.write("result")
+
+        subprocess.check_output(cmd)
+        self.assertEqual(len(GooseSLURM.fileio.YamlRead(dummyslurm.logfile)), 3)
+
+        stat = os.stat("output_1.txt")
+
+        with open("input.txt", "w") as file:
+            file.write("other")
+
+        os.utime("input.txt", (stat.st_atime, stat.st_mtime + 10))
+        subprocess.check_output(cmd)
+        self.assertEqual(len(GooseSLURM.fileio.YamlRead(dummyslurm.logfile)), 5)
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs + other:
+            os.remove(filename)
+
+    def test_stagger(self):
+        myjobs = [f"myjob_{i:d}.slurm" for i in range(3)]
+
+        for filename in [dummyslurm.logfile] + myjobs:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        for myjob in myjobs:
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+
+        subprocess.check_output(
+            ["Gsub", "--quiet", "--stagger", "2G/m", "--stagger-read", "1G"] + myjobs
+        )
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        begin = sorted(
+            datetime.datetime.strptime(job["begin"], "%Y-%m-%dT%H:%M:%S").timestamp() for job in log
+        )
+        self.assertEqual([j - i for i, j in zip(begin[:-1], begin[1:])], [30, 30])
+
+        ret = subprocess.run(["Gsub", "--quiet", "--stagger", "x/m"] + myjobs, capture_output=True)
+        self.assertNotEqual(ret.returncode, 0)
+
+        for filename in [dummyslurm.logfile] + myjobs:
+            os.remove(filename)
+
+    def test_max_queued(self):
+        myjobs = [f"myjob_{i:d}.slurm" for i in range(5)]
+        mylog = "mylog.yaml"
+
+        for filename in [dummyslurm.logfile, mylog] + myjobs:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        for myjob in myjobs:
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+
+        # "--serial": each job of the chain waits for room in the queue
+        for extra in [[], ["--serial"]]:
+            cmd = ["Gsub", "--quiet", "--log", mylog, "--max-queued", "2", "--poll", "0.1"]
+            process = subprocess.Popen(cmd + extra + myjobs)
+            queued = []
+
+            # let the queued jobs finish one-by-one, until all jobs are submitted
+            while process.poll() is None:
+                time.sleep(0.3)
+                if not os.path.isfile(dummyslurm.logfile):
+                    continue
+                with open(dummyslurm.logfile, "a") as lock:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                    log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile) or []
+                    pending = [job for job in log if job["state"] == "PD"]
+                    queued.append(len(pending))
+                    if len(pending) > 0:
+                        pending[0]["state"] = "CD"
+                    GooseSLURM.fileio.YamlDump(dummyslurm.logfile, log)
+
+            self.assertEqual(process.returncode, 0)
+            self.assertLessEqual(max(queued), 2)
+            self.assertEqual(len(GooseSLURM.fileio.YamlRead(dummyslurm.logfile)), 5)
+            self.assertEqual(sorted(GooseSLURM.fileio.YamlRead(mylog)), myjobs)
+
+            for filename in [dummyslurm.logfile, mylog]:
+                os.remove(filename)
+
+        for filename in myjobs:
+            os.remove(filename)
+
+    def test_workflow(self):
+        myjobs = ["prepare.slurm"] + [f"run_{i:d}.slurm" for i in range(3)] + ["collect.slurm"]
+        myflow = "myflow.yaml"
+        mylog = "mylog.yaml"
+        mygraph = "mylog.yaml.workflow"
+
+        for filename in [dummyslurm.logfile, myflow, mylog, mygraph] + myjobs:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        for myjob in myjobs:
+            with open(myjob, "w") as file:
+                file.write(GooseSLURM.scripts.plain(myjob))
+
+        flow = {"prepare": {"script": "prepare.slurm"}}
+        for i in range(3):
+            flow[f"run_{i:d}"] = {"script": f"run_{i:d}.slurm", "afterok": "prepare"}
+        flow["collect"] = {"script": "collect.slurm", "afterany": [f"run_{i:d}" for i in range(3)]}
+        GooseSLURM.fileio.YamlDump(myflow, flow)
+
+        cmd = ["Gsub", "--quiet", "--log", mylog, "--workflow", myflow, "--max-dependencies", "2"]
+        subprocess.check_output(cmd)
+
+        log = GooseSLURM.fileio.YamlRead(dummyslurm.logfile)
+        jobids = {job["script"]: job["jobid"] for job in log}
+        self.assertEqual(len(log), 7)
+        self.assertNotIn("dependency", log[jobids["prepare.slurm"] - 1])
+
+        for i in range(3):
+            job = log[jobids[f"run_{i:d}.slurm"] - 1]
+            self.assertEqual(job["dependency"], f"afterok:{jobids['prepare.slurm']:d}")
+
+        barriers = [job for job in log if job["script"] == "wrap"]
+        collect = log[jobids["collect.slurm"] - 1]
+        self.assertEqual(len(barriers), 2)
+        self.assertEqual(
+            collect["dependency"], "afterok:" + ":".join(str(job["jobid"]) for job in barriers)
+        )
+        self.assertEqual(
+            sorted(int(i) for job in barriers for i in job["dependency"].split(":")[1:]),
+            sorted(jobids[f"run_{i:d}.slurm"] for i in range(3)),
+        )
+
+        log = GooseSLURM.fileio.YamlRead(mylog)
+        self.assertEqual(log["collect.slurm"], [jobids["collect.slurm"]])
+
+        graph = GooseSLURM.fileio.YamlRead(mygraph)
+        self.assertEqual(graph["jobs"]["collect"]["jobid"], jobids["collect.slurm"])
+        self.assertEqual(graph["jobs"]["collect"]["dependency"], collect["dependency"])
+        self.assertEqual(len(graph["barriers"]), 2)
+
+        for filename in [dummyslurm.logfile, myflow, mylog, mygraph] + myjobs:
+            os.remove(filename)
+
 
 if __name__ == "__main__":
     unittest.main()
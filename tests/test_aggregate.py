@@ -0,0 +1,59 @@
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_groups(self):
+        lines = [{"A": "x", "B": 1}, {"A": "y", "B": 1}, {"A": "x", "B": 2}, {"A": "x", "B": 1}]
+        self.assertEqual(slurm.aggregate.groups(lines, ["A"]), {("x",): [0, 2, 3], ("y",): [1]})
+        self.assertEqual(
+            slurm.aggregate.groups(lines, ["A", "B"]),
+            {("x", "1"): [0, 3], ("y", "1"): [1], ("x", "2"): [2]},
+        )
+        self.assertEqual(slurm.aggregate.groups(lines, []), {(): [0, 1, 2, 3]})
+        self.assertEqual(slurm.aggregate.groups([], ["A"]), {})
+
+    def test_groupby(self):
+        lines = [
+            {"USER": "bob", "PARTITION": "gpu", "CPUS": slurm.rich.Integer(4)},
+            {"USER": "alice", "PARTITION": "serial", "CPUS": slurm.rich.Integer("N/A")},
+            {"USER": "bob", "PARTITION": "serial", "CPUS": slurm.rich.Integer(8)},
+            {"USER": "bob", "PARTITION": "gpu", "CPUS": slurm.rich.Integer(2)},
+        ]
+
+        funcs = {"PARTITION": "distinct", "CPUS": "sum"}
+        self.assertEqual(
+            slurm.aggregate.groupby(lines, ["USER"], funcs),
+            [
+                {"USER": "bob", "PARTITION": "gpu,serial", "CPUS": 14},
+                {"USER": "alice", "PARTITION": "serial", "CPUS": 0},
+            ],
+        )
+
+        funcs = {"CPUS": "mean", "USER": "count"}
+        self.assertEqual(
+            slurm.aggregate.groupby(lines, ["PARTITION"], funcs),
+            [
+                {"PARTITION": "gpu", "CPUS": 3.0, "USER": 2},
+                {"PARTITION": "serial", "CPUS": 8.0, "USER": 2},
+            ],
+        )
+
+        funcs = {"CPUS": lambda values: max(map(int, values))}
+        self.assertEqual(
+            slurm.aggregate.groupby(lines[2:], ["USER", "PARTITION"], funcs),
+            [
+                {"USER": "bob", "PARTITION": "serial", "CPUS": 8},
+                {"USER": "bob", "PARTITION": "gpu", "CPUS": 2},
+            ],
+        )
+
+        lines = [{"A": "x", "B": slurm.rich.Float("")}]
+        self.assertEqual(
+            slurm.aggregate.groupby(lines, ["A"], {"B": "mean"}), [{"A": "x", "B": None}]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
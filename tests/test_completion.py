@@ -0,0 +1,64 @@
+import os
+import pwd
+import tempfile
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.environ = os.environ.get("GOOSESLURM_CACHE")
+        os.environ["GOOSESLURM_CACHE"] = self.tempdir.name
+
+    def tearDown(self):
+        if self.environ is None:
+            del os.environ["GOOSESLURM_CACHE"]
+        else:
+            os.environ["GOOSESLURM_CACHE"] = self.environ
+        self.tempdir.cleanup()
+
+    def test_complete(self):
+        me = pwd.getpwuid(os.getuid())[0]
+
+        squeue = [
+            {"JOBID": "12", "USER": me, "PARTITION": "gpu", "ACCOUNT": "foo"},
+            {"JOBID": "3", "USER": me, "PARTITION": "serial", "ACCOUNT": "foo"},
+            {"JOBID": "13", "USER": "someone", "PARTITION": "gpu", "ACCOUNT": "bar"},
+        ]
+        sinfo = [
+            {"HOSTNAMES": "f001", "PARTITION": "serial*"},
+            {"HOSTNAMES": "f002", "PARTITION": "long"},
+        ]
+
+        slurm.completion.update(squeue=squeue, sinfo=sinfo, now=100.0)
+        self.assertEqual(os.listdir(self.tempdir.name), ["completion.json"])
+
+        complete = slurm.completion.complete
+        self.assertEqual(complete("jobid", now=100.0), ["3", "12"])
+        self.assertEqual(complete("jobid", "1", now=100.0), ["12"])
+        self.assertEqual(complete("user", now=100.0), sorted([me, "someone"]))
+        self.assertEqual(complete("account", "b", now=100.0), ["bar"])
+        self.assertEqual(complete("partition", now=100.0), ["gpu", "long", "serial"])
+        self.assertEqual(complete("node", now=100.0), ["f001", "f002"])
+
+        slurm.completion.update(squeue=squeue[:1], now=110.0)
+        self.assertEqual(complete("jobid", now=110.0), ["12"])
+        self.assertEqual(complete("node", now=110.0), ["f001", "f002"])
+
+        with self.assertRaises(ValueError):
+            complete("foo")
+
+    def test_script(self):
+        for shell in ["bash", "zsh"]:
+            script = slurm.completion.script(shell)
+            self.assertIn("complete -o default -F _GooseSLURM_complete", script)
+            self.assertIn('"Gstat --user") kind=user ;;', script)
+            self.assertIn("Gstat|Gdel|Gacct) kind=jobid ;;", script)
+
+        self.assertIn("bashcompinit", slurm.completion.script("zsh"))
+
+
+if __name__ == "__main__":
+    unittest.main()
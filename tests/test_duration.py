@@ -32,6 +32,22 @@ class MyTests(unittest.TestCase):
         self.assertEqual(slurm.duration.asSeconds("02:01"), 1 + 2 * minute)
         self.assertEqual(slurm.duration.asSeconds("27:01"), 1 + 27 * minute)
 
+        for value in ["", ".", "s", "h", "foo"]:
+            self.assertEqual(slurm.duration.asSeconds(value), None)
+            self.assertEqual(slurm.duration.asSeconds(value, default=-1), -1)
+
+    def test_asHumanArray(self):
+        data = [0, 1, 9.5, 59, 60, 61, 599, 3599, 3600, 86399, 86400, 10 * 86400, -70]
+
+        for precision in [None, 1, 2]:
+            self.assertEqual(
+                slurm.duration.asHumanArray(data, precision),
+                [slurm.duration.asHuman(i, precision) for i in data],
+            )
+
+        self.assertEqual(slurm.duration.asHumanArray([60, None]), ["1.0m", ""])
+        self.assertEqual(slurm.duration.asHumanArray(["1h", "foo", float("nan")]), ["1.0h", "", ""])
+
 
 if __name__ == "__main__":
     unittest.main()
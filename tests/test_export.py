@@ -0,0 +1,95 @@
+import io
+import json
+import time
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_write(self):
+        lines = [
+            {"A": slurm.rich.String("foo"), "B": slurm.rich.Duration("1h"), "C": "x,y"},
+            {"A": slurm.rich.String("bar"), "B": slurm.rich.Memory("1G"), "C": "z"},
+        ]
+        header = {"A": "a", "B": "b"}
+
+        sio = io.StringIO()
+        slurm.export.write(lines, ["A", "B", "C"], "csv", header=header, file=sio)
+        self.assertEqual(sio.getvalue(), 'a,b,C\nfoo,3600,"x,y"\nbar,1000000000,z\n')
+
+        sio = io.StringIO()
+        slurm.export.write(lines, ["A", "B"], "tsv", print_header=False, file=sio)
+        self.assertEqual(sio.getvalue(), "foo\t3600\nbar\t1000000000\n")
+
+        sio = io.StringIO()
+        slurm.export.write(lines, ["A", "B"], "plain", sep=" ", file=sio)
+        self.assertEqual(sio.getvalue(), "A B\nfoo 1.0h\nbar 1.0G\n")
+
+        for chunk in [1, 1000]:
+            sio = io.StringIO()
+            slurm.export.write(lines, ["A", "B"], "json", header=header, file=sio, chunk=chunk)
+            self.assertEqual(
+                json.loads(sio.getvalue()), [{"a": "foo", "b": 3600}, {"a": "bar", "b": int(1e9)}]
+            )
+
+        sio = io.StringIO()
+        slurm.export.write(lines, ["A"], "ndjson", file=sio)
+        self.assertEqual(
+            [json.loads(i) for i in sio.getvalue().splitlines()], [{"A": "foo"}, {"A": "bar"}]
+        )
+
+        sio = io.StringIO()
+        slurm.export.write([], ["A"], "json", file=sio)
+        self.assertEqual(json.loads(sio.getvalue()), [])
+
+    def test_typed(self):
+        data = (
+            "JOBID|USER|ST|CPUS|NODES|TIME_LEFT|MIN_MEMORY|START_TIME\n"
+            "1|foo|R|4|1|1:00:00|2G|2026-01-01T00:00:00\n"
+            "2|bar|PD|N/A|1|UNLIMITED|N/A|N/A\n"
+        )
+        now = time.mktime(time.strptime("2026-01-01T01:00:00", "%Y-%m-%dT%H:%M:%S"))
+        lines = slurm.squeue.typed(slurm.squeue.read(data=data), now)
+        self.assertEqual(
+            lines[0],
+            {
+                "JOBID": "1",
+                "USER": "foo",
+                "ST": "R",
+                "CPUS": 4,
+                "NODES": 1,
+                "TIME_LEFT": 3600,
+                "MIN_MEMORY": int(2e9),
+                "START_TIME": 3600,
+                "CPUS_R": 4,
+                "CPUS_PD": 0,
+            },
+        )
+        self.assertEqual(lines[1]["CPUS"], "N/A")
+        self.assertEqual(lines[1]["TIME_LEFT"], "UNLIMITED")
+        self.assertEqual(lines[1]["CPUS_R"], 0)
+        self.assertEqual(lines[1]["CPUS_PD"], 0)
+
+        data = (
+            "HOSTNAMES|CPUS(A/I/O/T)|CPU_LOAD|PARTITION|MEMORY|FREE_MEM|TIMELIMIT|STATE\n"
+            "f001|4/12/0/16|2.00|serial|1000|500|1-00:00:00|mixed\n"
+            "f002|0/16/0/16|N/A|serial|1000|N/A|infinite|down*\n"
+        )
+        lines = slurm.sinfo.typed(slurm.sinfo.read(data=data))
+        keys = ["CPUS_T", "CPUS_I", "CPUS_D", "CPU_RELJOB", "MEM_RELJOB", "MEMORY", "TIMELIMIT"]
+        self.assertEqual([lines[0][key] for key in keys], [16, 12, 0, 0.5, 2.0, int(1e9), 86400])
+        self.assertEqual(
+            [lines[1][key] for key in keys], [16, 0, 16, None, None, int(1e9), "infinite"]
+        )
+
+        sio = io.StringIO()
+        slurm.export.write(lines, ["HOSTNAMES", "CPU_RELJOB"], "json", file=sio)
+        self.assertEqual(
+            json.loads(sio.getvalue()),
+            [{"HOSTNAMES": "f001", "CPU_RELJOB": 0.5}, {"HOSTNAMES": "f002", "CPU_RELJOB": None}],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_find(self):
+        root = tempfile.mkdtemp()
+        expect = []
+
+        for path in ["a", "a/b", "a/b/c", "d", "CMakeFiles", ".git/e", "build"]:
+            os.makedirs(os.path.join(root, path), exist_ok=True)
+            for name in ["job.slurm", "job.txt"]:
+                with open(os.path.join(root, path, name), "w") as file:
+                    file.write("")
+            if path.split("/")[0] not in ["CMakeFiles", ".git", "build"]:
+                expect.append(os.path.join(root, path, "job.slurm"))
+
+        os.symlink(os.path.join(root, "a"), os.path.join(root, "link"))
+
+        exclude = slurm.files.prune() + ["build"]
+
+        for workers in [1, 4]:
+            found = slurm.files.find(root, "*.slurm", exclude, workers)
+            self.assertEqual(sorted(found), sorted(expect))
+
+        self.assertEqual(len(list(slurm.files.find(root, "*.slurm"))), len(expect) + 1)
+
+        with self.assertRaises(OSError):
+            slurm.files.find(os.path.join(root, "nonexisting"))
+
+        with self.assertRaises(OSError):
+            slurm.files.find(os.path.join(root, "a", "job.slurm"))
+
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    unittest.main()
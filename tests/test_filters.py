@@ -0,0 +1,86 @@
+import re
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_compile(self):
+        pattern = slurm.filters.compile(["^1234$", "56$", "^foo", "bar", "b.z", r"q\.x$"])
+        self.assertEqual(pattern.exact, {"1234", "56", "q.x"})
+        self.assertEqual(pattern.prefix, ("foo", "bar"))
+        self.assertEqual(pattern.regex, ["b.z"])
+
+        values = [
+            "1234",
+            "12345",
+            "56",
+            "foobar",
+            "barfoo",
+            "abar",
+            "baz",
+            "q.x",
+            "qax",
+        ]
+        expect = [True, False, True, True, True, False, True, True, False]
+        self.assertEqual(pattern.mask(values), expect)
+        self.assertEqual([pattern(i) for i in values], expect)
+
+    def test_regex(self):
+        patterns = ["^1234$", "56$", "^foo", "bar", "b.z", "a|c", r"q\.x$", r"x\$", ""]
+        values = [
+            "1234",
+            "12345",
+            "56",
+            "foobar",
+            "abar",
+            "baz",
+            "c",
+            "q.x",
+            "x$",
+            "ab",
+        ]
+        for n in patterns:
+            pattern = slurm.filters.compile(n)
+            self.assertEqual(pattern.mask(values), [bool(re.match(n, i)) for i in values])
+
+    def test_ignorecase(self):
+        pattern = slurm.filters.compile(["running", "^pd$"], re.IGNORECASE)
+        values = ["RUNNING", "CANCELLED by 1", "PD", "PENDING"]
+        self.assertEqual(pattern.mask(values), [True, False, True, False])
+
+    def test_comparison(self):
+        cells = [slurm.rich.Integer(i) for i in [0, 4, 8, "N/A"]]
+        self.assertEqual(slurm.filters.compile(">=4").mask(cells), [False, True, True, False])
+        self.assertEqual(
+            slurm.filters.compile(["<4", "==8"]).mask(cells), [True, False, True, False]
+        )
+
+        cells = [slurm.rich.Memory(i) for i in ["1G", "3G", "N/A"]]
+        self.assertEqual(slurm.filters.compile(">2G").mask(cells), [False, True, False])
+
+        cells = [slurm.rich.Duration(i) for i in ["1h", "3d"]]
+        self.assertEqual(slurm.filters.compile("<1d").mask(cells), [True, False])
+
+        cells = [slurm.rich.String(i) for i in [">4", "5"]]
+        self.assertEqual(slurm.filters.compile(">4").mask(cells), [True, False])
+
+        cells = [0, 4, 8, "N/A", None]
+        self.assertEqual(
+            slurm.filters.compile(">=4").mask(cells), [False, True, True, False, False]
+        )
+
+    def test_apply(self):
+        lines = [
+            {"USER": slurm.rich.String("alice"), "CPUS": slurm.rich.Integer(4)},
+            {"USER": slurm.rich.String("bob"), "CPUS": slurm.rich.Integer(16)},
+            {"USER": slurm.rich.String("alice"), "CPUS": slurm.rich.Integer(32)},
+        ]
+        selection = {"USER": ["^alice$"], "CPUS": [">8"], "JOBID": None}
+        self.assertEqual(slurm.filters.mask(lines, selection), [False, False, True])
+        self.assertEqual(slurm.filters.apply(lines, selection), [lines[2]])
+        self.assertEqual(slurm.filters.apply(lines, {}), lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
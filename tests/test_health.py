@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import dummyslurm
+import GooseSLURM as slurm
+
+
+def records():
+    ret = []
+
+    for i in range(20):
+        ret += [{"NodeList": f"node0[{i % 4:d}-{i % 4 + 1:d}]", "State": "COMPLETED"}]
+
+    for i in range(6):
+        ret += [{"NodeList": "node09", "State": "FAILED", "ExitCode": f"{i % 2 + 1:d}:0"}]
+
+    ret += [{"NodeList": "node09", "State": "COMPLETED", "ExitCode": "0:0"}]
+    ret += [{"NodeList": "node01", "State": "NODE_FAIL", "ExitCode": "0:0"}]
+    ret += [{"NodeList": "None assigned", "State": "PENDING"}]
+    ret += [{"NodeList": "node08", "State": "FAILED", "ExitCode": "1:0"}]
+    return ret
+
+
+class MyTests(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.environ = os.environ.get("GOOSESLURM_CACHE")
+        os.environ["GOOSESLURM_CACHE"] = self.tempdir.name
+
+    def tearDown(self):
+        if self.environ is None:
+            del os.environ["GOOSESLURM_CACHE"]
+        else:
+            os.environ["GOOSESLURM_CACHE"] = self.environ
+        self.tempdir.cleanup()
+
+    def test_nodelist(self):
+        nodelist = slurm.health.nodelist
+        self.assertEqual(nodelist("node1"), ["node1"])
+        self.assertEqual(
+            nodelist("node[01-03,07],gpu1"), ["node01", "node02", "node03", "node07", "gpu1"]
+        )
+        self.assertEqual(nodelist("n[8-10],m[1]"), ["n8", "n9", "n10", "m1"])
+
+    def test_exclude(self):
+        exclude = slurm.health.exclude
+        self.assertEqual(exclude(None, []), None)
+        self.assertEqual(exclude(None, ["node07"]), "node07")
+        self.assertEqual(exclude("node[01-02]", ["node01", "node07"]), "node[01-02],node07")
+
+    def test_analyse(self):
+        ret = slurm.health.analyse(records())
+        self.assertEqual([line["NODE"] for line in ret if line["BAD"]], ["node09"])
+        self.assertEqual(ret[0]["NODE"], "node08")
+        self.assertEqual(
+            ret[1],
+            {
+                "NODE": "node09",
+                "JOBS": 7,
+                "FAILED": 6,
+                "RATE": 6 / 7,
+                "EXIT": "1:0,2:0",
+                "BAD": True,
+            },
+        )
+
+        ret = slurm.health.analyse(records(), minimum=1)
+        self.assertEqual([line["NODE"] for line in ret if line["BAD"]], ["node08", "node09"])
+
+        ret = slurm.health.analyse(records(), threshold=0.9)
+        self.assertEqual([line["NODE"] for line in ret if line["BAD"]], [])
+
+    def test_bad(self):
+        if os.path.isfile(dummyslurm.logfile):
+            os.remove(dummyslurm.logfile)
+
+        state = {"COMPLETED": "CD", "FAILED": "F", "NODE_FAIL": "NF", "PENDING": "PD"}
+        log = [
+            {"jobid": i + 1, "nodelist": line["NodeList"], "state": state[line["State"]]}
+            for i, line in enumerate(records())
+        ]
+        slurm.fileio.YamlDump(dummyslurm.logfile, log)
+        self.assertEqual(slurm.health.bad(now=100.0), ["node09"])
+        self.assertEqual(os.listdir(self.tempdir.name), ["badnodes.json"])
+
+        # from the cache (until it expires, or if other options are used)
+        slurm.fileio.YamlDump(dummyslurm.logfile, [dict(job, state="CD") for job in log])
+        self.assertEqual(slurm.health.bad(now=200.0), ["node09"])
+        self.assertEqual(slurm.health.bad(now=200.0, minimum=1), [])
+        self.assertEqual(slurm.health.bad(now=200.0 + slurm.health.ttl, minimum=1), [])
+        self.assertEqual(slurm.health.bad(now=200.0 + slurm.health.ttl), [])
+
+        os.remove(dummyslurm.logfile)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+import GooseSLURM as slurm
+
+
+def _append(filename, name, n):
+    log = slurm.journal.Journal(filename, compact=7)
+    for i in range(n):
+        log.append(name, i)
+    log.close()
+
+
+class MyTests(unittest.TestCase):
+    def test_journal(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, "log.yaml")
+
+            with slurm.journal.Journal(filename, compact=3) as log:
+                log.append("a.slurm", 1)
+                log.append("b.slurm", 2)
+                self.assertFalse(os.path.isfile(filename))
+                self.assertEqual(slurm.journal.read(filename), {"a.slurm": [1], "b.slurm": [2]})
+                log.append("a.slurm", 3)
+                self.assertFalse(os.path.isfile(log.path))
+                self.assertEqual(
+                    slurm.fileio.YamlRead(filename), {"a.slurm": [1, 3], "b.slurm": [2]}
+                )
+                log.append("c.slurm", "4_0")
+
+            self.assertFalse(os.path.isfile(log.path))
+            expect = {"a.slurm": [1, 3], "b.slurm": [2], "c.slurm": ["4_0"]}
+            self.assertEqual(slurm.fileio.YamlRead(filename), expect)
+
+            # a crash after replacing the YAML file (but before removing the journal),
+            # and a crash while writing a line
+            with open(log.path, "w") as file:
+                file.write('{"file": "a.slurm", "jobid": 3}\n{"file": "a.slu')
+
+            self.assertEqual(slurm.journal.read(filename), expect)
+            log.compact()
+            self.assertEqual(slurm.fileio.YamlRead(filename), expect)
+
+    def test_concurrent(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, "log.yaml")
+            names = ["a.slurm", "b.slurm", "c.slurm"]
+            processes = [
+                multiprocessing.Process(target=_append, args=(filename, name, 50)) for name in names
+            ]
+
+            for process in processes:
+                process.start()
+
+            for process in processes:
+                process.join()
+
+            log = slurm.fileio.YamlRead(filename)
+            self.assertEqual(log, {name: list(range(50)) for name in names})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import subprocess
+import unittest
+from unittest import mock
+
+import dummyslurm
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_wait(self):
+        myjob = "myjob.slurm"
+
+        for filename in [dummyslurm.logfile, myjob]:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        with open(myjob, "w") as file:
+            file.write(slurm.scripts.plain(myjob))
+
+        for _ in range(3):
+            subprocess.check_output(["sbatch", myjob])
+
+        log = slurm.fileio.YamlRead(dummyslurm.logfile)
+        for job, state in zip(log, ["R", "CD", "F"]):
+            job["state"] = state
+        slurm.fileio.YamlDump(dummyslurm.logfile, log)
+
+        sleeps = []
+        polls = []
+
+        def sleep(seconds):
+            # the running job finishes after the second poll
+            sleeps.append(seconds)
+            if len(sleeps) == 2:
+                log[0]["state"] = "TO"
+                slurm.fileio.YamlDump(dummyslurm.logfile, log)
+
+        def callback(done, pending):
+            polls.append((dict(done), set(pending)))
+
+        ret = slurm.wait(
+            [1, 2, 3, 999], interval=1, factor=2, grace=3, sleep=sleep, callback=callback
+        )
+
+        self.assertEqual(ret, {"1": "TIMEOUT", "2": "COMPLETED", "3": "FAILED", "999": None})
+        self.assertEqual(sleeps, [1, 2, 4])
+        self.assertEqual(polls[0][0], {"2": "COMPLETED", "3": "FAILED"})
+        self.assertEqual(polls[0][1], {"1", "999"})
+
+        with self.assertRaises(TimeoutError):
+            log[0]["state"] = "R"
+            slurm.fileio.YamlDump(dummyslurm.logfile, log)
+            slurm.wait([1], interval=1, timeout=3, sleep=lambda seconds: None)
+
+        os.remove(dummyslurm.logfile)
+        os.remove(myjob)
+
+    def test_transient(self):
+        error = subprocess.CalledProcessError(1, "squeue", b"", b"Socket timed out on send/recv")
+        squeue = [error, []]
+        sacct = [error, [{"JobID": "1", "State": "COMPLETED"}]]
+        sleeps = []
+
+        with mock.patch.object(slurm.squeue, "read", side_effect=squeue), mock.patch.object(
+            slurm.sacct, "read_jobs", side_effect=sacct
+        ):
+            ret = slurm.wait([1], sleep=sleeps.append)
+
+        self.assertEqual(ret, {"1": "COMPLETED"})
+        self.assertEqual(len(sleeps), 2)
+
+        error = subprocess.CalledProcessError(1, "squeue", b"", b"Invalid user")
+
+        with mock.patch.object(slurm.squeue, "read", side_effect=[error, []]):
+            with self.assertRaises(subprocess.CalledProcessError):
+                slurm.wait([1], sleep=sleeps.append)
+
+    def test_Gsub(self):
+        myjob = "myjob.slurm"
+
+        for filename in [dummyslurm.logfile, myjob]:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        with open(myjob, "w") as file:
+            file.write(slurm.scripts.plain(myjob))
+
+        env = dict(os.environ, DUMMYSLURM_STATE="CD")
+        ret = subprocess.run(["Gsub", "--quiet", "--wait", "-r", "2", myjob], env=env)
+        self.assertEqual(ret.returncode, 0)
+
+        log = slurm.fileio.YamlRead(dummyslurm.logfile)
+        self.assertEqual(len(log), 2)
+        self.assertNotIn("wait", log[0])
+
+        env = dict(os.environ, DUMMYSLURM_STATE="F")
+        ret = subprocess.run(["Gsub", "--quiet", "--wait", myjob], env=env)
+        self.assertEqual(ret.returncode, 1)
+
+        os.remove(dummyslurm.logfile)
+        os.remove(myjob)
+
+    def test_batch(self):
+        myjob = "myjob.slurm"
+
+        for filename in [dummyslurm.logfile, myjob]:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        with open(myjob, "w") as file:
+            file.write(slurm.scripts.plain(myjob))
+
+        for _ in range(5):
+            subprocess.check_output(["sbatch", myjob])
+
+        log = slurm.fileio.YamlRead(dummyslurm.logfile)
+        for job, state in zip(log, ["R", "PD", "CD", "F", "R"]):
+            job["state"] = state
+        slurm.fileio.YamlDump(dummyslurm.logfile, log)
+
+        with mock.patch.object(slurm.sacct, "batch", 2), mock.patch.object(
+            slurm.squeue, "batch", 2
+        ):
+            with mock.patch("subprocess.check_output", wraps=subprocess.check_output) as call:
+                lines = slurm.sacct.read_jobs([1, 2, 3, 4, 5])
+            self.assertEqual(call.call_count, 3)
+            self.assertEqual([line["JobID"] for line in lines], ["1", "2", "3", "4", "5"])
+
+            with mock.patch("subprocess.run", wraps=subprocess.run) as call:
+                lines = slurm.squeue.read(jobs=[1, 2, 3, 4, 5])
+            self.assertEqual(call.call_count, 3)
+            self.assertEqual([line["JOBID"] for line in lines], ["1", "2", "5"])
+
+        os.remove(dummyslurm.logfile)
+        os.remove(myjob)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_state(self):
+        self.assertEqual(slurm.retry.state("TO"), "TIMEOUT")
+        self.assertEqual(slurm.retry.state("timeout"), "TIMEOUT")
+        self.assertEqual(slurm.retry.state("CANCELLED by 1234"), "CANCELLED")
+        self.assertEqual(slurm.retry.state("COMPLETED+"), "COMPLETED")
+
+    def test_select(self):
+        select = slurm.retry.select
+        self.assertTrue(select({"State": "FAILED", "ExitCode": "1:0"}))
+        self.assertTrue(select({"State": "TIMEOUT", "ExitCode": "0:0"}))
+        self.assertFalse(select({"State": "COMPLETED", "ExitCode": "0:0"}))
+        self.assertFalse(select({"State": "CANCELLED by 1234", "ExitCode": "0:0"}))
+        self.assertTrue(select({"State": "CANCELLED by 1234"}, ["CA"]))
+        self.assertFalse(select({"State": "TIMEOUT", "ExitCode": "0:0"}, ["F"]))
+        self.assertTrue(select({"State": "COMPLETED", "ExitCode": "3:0"}, [], [3]))
+        self.assertFalse(select({"State": "FAILED", "ExitCode": "1:0"}, [], [3]))
+        self.assertTrue(select({"State": "OUT_OF_MEMORY"}, None, [3]))
+
+    def test_escalate(self):
+        escalate = slurm.retry.escalate
+        seconds = slurm.duration.asSeconds
+        self.assertEqual(escalate("1:00:00", "x2", seconds), 7200)
+        self.assertEqual(escalate("1:00:00", "1.5", seconds), 5400)
+        self.assertEqual(escalate("1:00:00", "+30m", seconds), 5400)
+        self.assertEqual(escalate("UNLIMITED", "x2", seconds), None)
+
+        with self.assertRaises(ValueError):
+            escalate("1:00:00", "twice", seconds)
+
+        with self.assertRaises(ValueError):
+            escalate("1:00:00", "+forever", seconds)
+
+    def test_resources(self):
+        resources = slurm.retry.resources
+        record = {"State": "TIMEOUT", "Timelimit": "1-00:00:00", "ReqMem": "4000Mn"}
+        self.assertEqual(resources(record), [])
+        self.assertEqual(resources(record, "x1.5", "x2"), ["--time", "1-12:00:00"])
+        self.assertEqual(resources(record, "+1s"), ["--time", "1-00:01:00"])
+
+        record = {"State": "OUT_OF_MEMORY", "Timelimit": "1:00:00", "ReqMem": "4000Mn"}
+        self.assertEqual(resources(record, "x2", "x1.5"), ["--mem", "6G"])
+        self.assertEqual(resources(record, "x2", "+100K"), ["--mem", "4001M"])
+
+        record = {"State": "OUT_OF_MEMORY", "Timelimit": "1:00:00", "ReqMem": "4000Mc"}
+        self.assertEqual(resources(record, "x2", "x1.5"), ["--mem-per-cpu", "6G"])
+
+        record = {"State": "OUT_OF_MEMORY", "Timelimit": "1:00:00", "ReqMem": "4G"}
+        self.assertEqual(resources(record, "x2", "x1.5"), ["--mem", "6G"])
+
+
+if __name__ == "__main__":
+    unittest.main()
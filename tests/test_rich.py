@@ -0,0 +1,38 @@
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_Duration(self):
+        data = slurm.rich.Duration(90)
+        self.assertEqual(str(data), "1.5m")
+
+        data.data = 2 * 60 * 60
+        self.assertEqual(str(data), "2.0h")
+
+        data.precision = 2
+        self.assertEqual(str(data), "2.00h")
+
+    def test_Memory(self):
+        data = slurm.rich.Memory("2G")
+        self.assertEqual(str(data), "2.0G")
+
+        data.data = 1500
+        self.assertEqual(str(data), "1.5K")
+
+        data.precision = 2
+        self.assertEqual(str(data), "1.50K")
+
+    def test_Memory_asHumanArray(self):
+        data = [0, 1, 999, 1000, 9.5e6, 1e9, 3e12, 5e13]
+
+        for precision in [None, 1, 2]:
+            self.assertEqual(
+                slurm.memory.asHumanArray(data, precision),
+                [slurm.memory.asHuman(int(i), precision) for i in data],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_sortable(self):
+        lines = [
+            {"NCPUS": "128", "Elapsed": "1-00:00:00", "MaxRSS": "4G", "AveCPU": "00:01.500"},
+            {"NCPUS": "16", "Elapsed": "05:00", "MaxRSS": "", "AveCPU": "00:02"},
+            {"NCPUS": "4", "Elapsed": "2:00:00", "MaxRSS": "512M", "AveCPU": ""},
+        ]
+        keys = ["NCPUS", "Elapsed", "MaxRSS", "AveCPU"]
+        typed = slurm.sacct.sortable(lines, keys)
+
+        self.assertEqual(typed[0], {"NCPUS": 128, "Elapsed": 86400, "MaxRSS": 4e9, "AveCPU": 1.5})
+        self.assertEqual(lines[0]["NCPUS"], "128")
+
+        self.assertEqual(slurm.sort.argsort(typed, ["NCPUS"]), [2, 1, 0])
+        self.assertEqual(slurm.sort.argsort(typed, ["Elapsed"]), [1, 2, 0])
+        self.assertEqual(slurm.sort.argsort(typed, ["MaxRSS"]), [2, 0, 1])
+        self.assertEqual(slurm.sort.argsort(typed, ["MaxRSS"], reverse=True), [0, 2, 1])
+        self.assertEqual(slurm.sort.argsort(typed, ["AveCPU"]), [0, 1, 2])
+        self.assertEqual(slurm.sort.arghead(typed, ["NCPUS"], 2), [2, 1])
+        self.assertEqual(slurm.sort.argtail(typed, ["NCPUS"], 1), [0])
+        self.assertEqual(slurm.sort.arghead(typed, ["NCPUS"], 1, reverse=True), [0])
+
+        lines = [{"JobID": "12"}, {"JobID": "3.batch"}, {"JobID": "3"}]
+        self.assertEqual(slurm.sacct.sortable(lines, ["JobID"]), lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
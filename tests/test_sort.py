@@ -0,0 +1,70 @@
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_numeric(self):
+        cells = [slurm.rich.Integer(i) for i in [3, "N/A", 1, "-", 2, 1]]
+        lines = [{"A": cell, "I": i} for i, cell in enumerate(cells)]
+
+        ret = slurm.sort.sort(lines, ["A"])
+        self.assertEqual([line["I"] for line in ret], [2, 5, 4, 0, 3, 1])
+
+        ret = slurm.sort.sort(lines, ["A"], reverse=True)
+        self.assertEqual([line["I"] for line in ret], [0, 4, 2, 5, 1, 3])
+
+    def test_typed(self):
+        lines = [
+            {"T": slurm.rich.Duration("1d"), "M": slurm.rich.Memory("2G"), "F": 0.5},
+            {"T": slurm.rich.Duration("2h"), "M": slurm.rich.Memory("10G"), "F": 2.0},
+            {"T": slurm.rich.Duration("30m"), "M": slurm.rich.Memory("512M"), "F": 1.0},
+        ]
+        self.assertEqual(list(slurm.sort.argsort(lines, ["T"])), [2, 1, 0])
+        self.assertEqual(list(slurm.sort.argsort(lines, ["M"])), [2, 0, 1])
+        self.assertEqual(list(slurm.sort.argsort(lines, ["F"])), [0, 2, 1])
+
+        lines = [{"A": i} for i in [3, "N/A", 1, None, 2.5]]
+        self.assertEqual(list(slurm.sort.argsort(lines, ["A"])), [2, 4, 0, 3, 1])
+        self.assertEqual(list(slurm.sort.argsort(lines, ["A"], reverse=True)), [0, 4, 2, 1, 3])
+
+    def test_multikey(self):
+        lines = [
+            {"USER": slurm.rich.String("bob"), "CPUS": slurm.rich.Integer(4)},
+            {"USER": slurm.rich.String("alice"), "CPUS": slurm.rich.Integer(16)},
+            {"USER": slurm.rich.String("bob"), "CPUS": slurm.rich.Integer(8)},
+            {"USER": "alice", "CPUS": slurm.rich.Integer(4)},
+        ]
+
+        # last key is primary
+        self.assertEqual(list(slurm.sort.argsort(lines, ["CPUS", "USER"])), [3, 1, 0, 2])
+        self.assertEqual(list(slurm.sort.argsort(lines, ["USER", "CPUS"])), [3, 0, 2, 1])
+
+        # direction per key, stable for ties
+        self.assertEqual(
+            list(slurm.sort.argsort(lines, ["CPUS", "USER"], [True, False])), [1, 3, 2, 0]
+        )
+        self.assertEqual(list(slurm.sort.argsort(lines, ["USER"], True)), [0, 2, 1, 3])
+        self.assertEqual(list(slurm.sort.argsort(lines, [])), [0, 1, 2, 3])
+        self.assertEqual(slurm.sort.sort([], ["USER"]), [])
+
+    def test_head_tail(self):
+        cells = [3, "N/A", 1, "-", 2, 1, 5, 4, "N/A", 2]
+        lines = [{"A": slurm.rich.Integer(c), "B": str(i % 3), "I": i} for i, c in enumerate(cells)]
+
+        for keys in [["A"], ["B", "A"], ["A", "B"]]:
+            for reverse in [False, True, [True, False]]:
+                if isinstance(reverse, list) and len(keys) == 1:
+                    continue
+                full = [line["I"] for line in slurm.sort.sort(lines, keys, reverse)]
+                for n in [0, 1, 3, 9, 10, 20]:
+                    head = slurm.sort.head(lines, keys, n, reverse)
+                    tail = slurm.sort.tail(lines, keys, n, reverse)
+                    self.assertEqual([line["I"] for line in head], full[:n])
+                    self.assertEqual([line["I"] for line in tail], full[::-1][:n][::-1])
+
+        self.assertEqual([line["I"] for line in slurm.sort.head(lines, [], 2, True)], [9, 8])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_declared(self):
+        root = tempfile.mkdtemp()
+        job = os.path.join(root, "job.slurm")
+
+        with open(job, "w") as file:
+            file.write("#!/bin/bash\n#GSUB input=a.txt b.txt\n#GSUB output=out_*.h5\nrun\n")
+
+        for name in ["out_1.h5", "out_0.h5"]:
+            with open(os.path.join(root, name), "w") as file:
+                file.write("")
+
+        slurm.fileio.YamlDump(f"{job}.gsub", {"input": "c.txt", "output": ["log.txt"]})
+
+        files = slurm.stale.declared(job)
+        self.assertEqual(files["input"], [job] + [os.path.join(root, f"{i}.txt") for i in "abc"])
+        self.assertEqual(
+            files["output"], [os.path.join(root, i) for i in ["out_0.h5", "out_1.h5", "log.txt"]]
+        )
+
+        shutil.rmtree(root)
+
+    def test_is_stale(self):
+        root = tempfile.mkdtemp()
+        job = os.path.join(root, "job.slurm")
+        data = os.path.join(root, "input.txt")
+        out = os.path.join(root, "output.txt")
+
+        with open(job, "w") as file:
+            file.write("#!/bin/bash\n#GSUB input=input.txt\n#GSUB output=output.txt\nrun\n")
+
+        with open(data, "w") as file:
+            file.write("data")
+
+        cache = {}
+        slurm.stale.record(job, cache)
+        self.assertEqual(
+            sorted(cache[os.path.abspath(job)]), sorted(map(os.path.abspath, [job, data]))
+        )
+
+        # output missing / job not completed
+        self.assertTrue(slurm.stale.is_stale(job, True, cache))
+
+        with open(out, "w") as file:
+            file.write("result")
+
+        self.assertFalse(slurm.stale.is_stale(job, True, cache))
+        self.assertTrue(slurm.stale.is_stale(job, False, cache))
+
+        # input touched but not changed
+        stat = os.stat(out)
+        os.utime(data, (stat.st_atime, stat.st_mtime + 10))
+        self.assertFalse(slurm.stale.is_stale(job, True, cache))
+        self.assertTrue(slurm.stale.is_stale(job, True, {}))
+
+        # input changed
+        with open(data, "w") as file:
+            file.write("other")
+        os.utime(data, (stat.st_atime, stat.st_mtime + 20))
+        self.assertTrue(slurm.stale.is_stale(job, True, cache))
+
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that are too slow to import at startup, they are imported where they are needed
+heavy = ["numpy", "yaml", "click", "tqdm"]
+
+# generous budget (in seconds) for importing the module of an entry point (excluding Python)
+budget = 0.5
+
+
+def entry_points():
+    r"""
+    Modules of the console entry points listed under ``[project.scripts]`` in pyproject.toml.
+    """
+
+    ret = []
+    section = False
+
+    with open(os.path.join(root, "pyproject.toml")) as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith("["):
+                section = line == "[project.scripts]"
+            elif section and "=" in line:
+                target = line.split("=", 1)[1].strip().strip("\"'")
+                ret.append(target.split(":")[0])
+
+    return ret
+
+
+def importtime(module):
+    r"""
+    Modules imported by importing ``module``, and its cumulative import time (in seconds).
+    """
+
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+
+    timing = {}
+
+    for line in output.splitlines():
+        match = re.match(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(.*)", line)
+        if match:
+            timing[match.group(4).strip()] = int(match.group(2)) * 1e-6
+
+    return timing
+
+
+class MyTests(unittest.TestCase):
+    def test_entry_points(self):
+        modules = entry_points()
+        self.assertIn("GooseSLURM.cli_Gstat", modules)
+
+        for module in modules:
+            timing = importtime(module)
+            imported = {name.split(".")[0] for name in timing}
+            self.assertIn(module, timing)
+            self.assertLess(timing[module], budget, module)
+            for name in heavy:
+                self.assertNotIn(name, imported, module)
+
+    def test_package(self):
+        timing = importtime("GooseSLURM")
+        imported = {name.split(".")[0] for name in timing}
+        self.assertEqual(
+            {name for name in timing if name.startswith("GooseSLURM.")}, {"GooseSLURM._version"}
+        )
+        for name in heavy:
+            self.assertNotIn(name, imported)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_category(self):
+        category = slurm.status.category
+        self.assertEqual(category("PD"), "pending")
+        self.assertEqual(category("R"), "running")
+        self.assertEqual(category("CG"), "running")
+        self.assertEqual(category("COMPLETED"), "completed")
+        self.assertEqual(category("TIMEOUT"), "timeout")
+        self.assertEqual(category("CANCELLED by 1234"), "failed")
+        self.assertEqual(category("CANCELLED+"), "failed")
+        self.assertEqual(category("OUT_OF_MEMORY"), "failed")
+        self.assertEqual(category(None), "unknown")
+
+    def test_file_status(self):
+        from GooseSLURM.cli_Gsub import file_status
+
+        self.assertEqual(file_status([]), "new")
+        self.assertEqual(file_status(["failed", "running"]), "running")
+        self.assertEqual(file_status(["completed", "failed"]), "completed")
+        self.assertEqual(file_status(["failed", "timeout"]), "timeout")
+
+
+if __name__ == "__main__":
+    unittest.main()
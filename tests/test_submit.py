@@ -0,0 +1,226 @@
+import subprocess
+import threading
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_transient(self):
+        error = subprocess.CalledProcessError(1, "sbatch", "", "Socket timed out on send/recv")
+        self.assertTrue(slurm.submit.is_transient(error))
+
+        error = subprocess.CalledProcessError(1, "sbatch", "", "Invalid account")
+        self.assertFalse(slurm.submit.is_transient(error))
+
+        self.assertFalse(slurm.submit.is_transient(ValueError("Socket timed out")))
+
+        error = subprocess.CalledProcessError(1, "sbatch", "", "Socket timed out on send/recv")
+        self.assertTrue(slurm.submit.is_ambiguous(error))
+        self.assertTrue(slurm.submit.is_ambiguous(subprocess.TimeoutExpired("sbatch", 10)))
+
+        error = subprocess.CalledProcessError(1, "sbatch", "", "Unable to contact slurm controller")
+        self.assertFalse(slurm.submit.is_ambiguous(error))
+
+    def test_controller(self):
+        controller = slurm.submit.Controller(maximum=4, latency=1.0)
+
+        for _ in range(20):
+            controller.acquire()
+            controller.release(0.1)
+
+        self.assertEqual(controller.limit, 4)
+
+        controller.acquire()
+        controller.release(2.0)
+        self.assertEqual(controller.limit, 2)
+
+        controller.acquire()
+        controller.release(0.1, ok=False)
+        controller.acquire()
+        controller.release(0.1, ok=False)
+        self.assertEqual(controller.limit, 1)
+
+    def test_call(self):
+        controller = slurm.submit.Controller()
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) < 3:
+                raise subprocess.CalledProcessError(
+                    1, "sbatch", "", "Unable to contact slurm controller"
+                )
+            return 10
+
+        self.assertEqual(slurm.submit.call(func, controller, retries=5, base=0.0), 10)
+        self.assertEqual(len(calls), 3)
+
+        calls.clear()
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            slurm.submit.call(func, controller, retries=1, base=0.0)
+
+        def fail():
+            calls.append(1)
+            raise subprocess.CalledProcessError(1, "sbatch", "", "Invalid account")
+
+        calls.clear()
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            slurm.submit.call(fail, controller, retries=5, base=0.0)
+
+        self.assertEqual(len(calls), 1)
+
+        def timeout():
+            calls.append(1)
+            raise subprocess.CalledProcessError(
+                1, "sbatch", "", "Socket timed out on send/recv operation"
+            )
+
+        calls.clear()
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            slurm.submit.call(timeout, controller, retries=5, base=0.0)
+
+        self.assertEqual(len(calls), 1)
+
+    def test_rate(self):
+        self.assertAlmostEqual(slurm.submit.rate("10/m"), 10 / 60)
+        self.assertAlmostEqual(slurm.submit.rate("1/30s"), 1 / 30)
+        self.assertAlmostEqual(slurm.submit.rate("2"), 2)
+        self.assertAlmostEqual(slurm.submit.rate("2G/s", "500M"), 4)
+
+        with self.assertRaisesRegex(ValueError, "stagger-read"):
+            slurm.submit.rate("2G/s")
+
+        with self.assertRaisesRegex(ValueError, "stagger-read"):
+            slurm.submit.rate("2GB/s")
+
+        with self.assertRaisesRegex(ValueError, "Unable to interpret"):
+            slurm.submit.rate("foo/s")
+
+        self.assertEqual(slurm.submit.begin(0, 0, 1), slurm.submit.begin(0.5, 0, 1))
+        self.assertNotEqual(slurm.submit.begin(0, 0, 1), slurm.submit.begin(0, 1, 1))
+
+    def test_cap(self):
+        queue = [3]
+        polls = []
+        sleeps = []
+
+        def count():
+            polls.append(queue[0])
+            return queue[0]
+
+        def sleep(seconds):
+            # two jobs leave the queue while waiting
+            sleeps.append(seconds)
+            queue[0] -= 2
+
+        cap = slurm.submit.Cap(4, count, interval=10, sleep=sleep)
+        cap.acquire()
+        self.assertEqual(polls, [3])
+
+        # not yet in the queue: counted as pending
+        cap.acquire()
+        self.assertEqual(polls, [3, 3, 1])
+        self.assertEqual(sleeps, [10])
+        self.assertEqual(cap.queued, 3)
+
+        # submitted: in the queue
+        cap.release(2)
+        queue[0] += 2
+        self.assertEqual(cap.pending, 0)
+        cap.acquire()
+        self.assertEqual(polls, [3, 3, 1])
+        self.assertEqual(cap.queued, 4)
+
+        with self.assertRaises(ValueError):
+            cap.acquire(5)
+
+    def test_run(self):
+        lock = threading.Lock()
+        submitted = {}
+        log = []
+
+        def submit(job, dependency):
+            with lock:
+                jobid = len(submitted) + 1
+                submitted[jobid] = (job, dependency)
+            return jobid
+
+        def callback(job, jobid):
+            log.append((job, jobid))
+
+        chains = [["a1", "a2", "a3"], ["b1", "b2"], ["c1"]]
+        controller = slurm.submit.Controller(maximum=3)
+        slurm.submit.run(chains, submit, callback, controller=controller)
+
+        self.assertEqual(sorted(job for job, _ in log), ["a1", "a2", "a3", "b1", "b2", "c1"])
+
+        jobids = {job: jobid for job, jobid in log}
+
+        for chain in chains:
+            self.assertIsNone(submitted[jobids[chain[0]]][1])
+            for previous, job in zip(chain[:-1], chain[1:]):
+                self.assertEqual(submitted[jobids[job]][1], jobids[previous])
+
+        # the gate is passed by each job (not once per chain)
+        gated = []
+
+        def gate(job):
+            with lock:
+                gated.append(job)
+
+        slurm.submit.run(chains, submit, controller=controller, gate=gate)
+        self.assertEqual(sorted(gated), ["a1", "a2", "a3", "b1", "b2", "c1"])
+
+    def test_run_generator(self):
+        read = []
+
+        def chains():
+            for i in range(10):
+                read.append(i)
+                yield [i]
+
+        log = []
+        slurm.submit.run(chains(), lambda job, dependency: job, lambda job, jobid: log.append(job))
+        self.assertEqual(sorted(log), list(range(10)))
+        self.assertEqual(read, list(range(10)))
+
+        def error():
+            yield ["a"]
+            raise OSError("not found")
+
+        with self.assertRaises(OSError):
+            slurm.submit.run(error(), lambda job, dependency: job)
+
+    def test_run_error(self):
+        def submit(job, dependency):
+            if job == "a2":
+                raise subprocess.CalledProcessError(1, "sbatch", "", "Invalid account")
+            return 1
+
+        log = []
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            slurm.submit.run([["a1", "a2", "a3"]], submit, lambda job, jobid: log.append(job))
+
+        self.assertEqual(log, ["a1"])
+
+        def callback(job, jobid):
+            if job == 2:
+                raise OSError("No space left on device")
+            log.append(job)
+
+        log = []
+        controller = slurm.submit.Controller(maximum=1)
+
+        with self.assertRaises(OSError):
+            slurm.submit.run([[i] for i in range(1, 5)], lambda job, dep: job, callback, controller)
+
+        self.assertEqual(log, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_render_columns(self):
+        lines = [
+            {"A": slurm.rich.String("foo"), "B": slurm.rich.Duration(90), "C": "x"},
+            {"A": slurm.rich.String("foobar"), "B": slurm.rich.Duration(7200), "C": "y"},
+        ]
+        columns = [
+            {"key": "A", "width": 3, "align": "<", "priority": False},
+            {"key": "B", "width": 4, "align": ">", "priority": True},
+            {"key": "C", "width": 1, "align": "<", "priority": True},
+        ]
+        header = {"A": "a", "B": "b", "C": "c"}
+
+        ret = list(slurm.table.render_columns(lines, columns, header, sep=" ", width=10))
+        self.assertEqual(
+            ret,
+            [
+                "=== ==== =",
+                "a   b    c",
+                "=== ==== =",
+                "foo 1.5m x",
+                "foo 2.0h y",
+            ],
+        )
+
+        ret = list(slurm.table.render_columns(lines, columns, header, sep=" ", width=100))
+        self.assertEqual(ret[-1], "foobar 2.0h y")
+
+        ret = list(slurm.table.render_columns(lines, columns, header, sep=" ", no_truncate=True))
+        self.assertEqual(ret[-2], "foo    1.5m x")
+
+        # input is not modified
+        self.assertEqual(columns[0]["width"], 3)
+        self.assertEqual(header["A"], "a")
+        self.assertEqual(lines[0]["C"], "x")
+        self.assertIsNone(lines[0]["A"].width)
+
+    def test_render_columns_blocks(self):
+        lines = [
+            {"A": slurm.rich.String("a"), "B": slurm.rich.Memory(2e9), "C": "x"},
+            {"A": slurm.rich.String("b"), "B": slurm.rich.Memory(512), "C": "y"},
+            {"A": slurm.rich.String("c", color="1;31"), "B": slurm.rich.Memory("")},
+        ]
+        columns = [
+            {"key": "A", "width": 1, "align": "<"},
+            {"key": "B", "width": 4, "align": ">"},
+            {"key": "C", "width": 1, "align": "<"},
+        ]
+        header = {"A": "a", "B": "b", "C": "c"}
+        expect = list(slurm.table.render_columns(lines, columns, header, sep=" ", width=20))
+
+        # the cells are read in blocks: the result is the same
+        with mock.patch.object(slurm.table, "_block", 2):
+            ret = list(slurm.table.render_columns(lines, columns, header, sep=" ", width=20))
+
+        self.assertEqual(ret, expect)
+        self.assertEqual(ret[-3:], ["a 2.0G", "b 512B", "\x1b[1;31mc\x1b[0m     "])
+
+
+if __name__ == "__main__":
+    unittest.main()
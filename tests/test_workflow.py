@@ -0,0 +1,71 @@
+import unittest
+
+import GooseSLURM as slurm
+
+
+class MyTests(unittest.TestCase):
+    def test_normalize(self):
+        flow = slurm.workflow.normalize(
+            {
+                "a": {"script": "a.slurm"},
+                "b": {"script": "b/run.slurm", "afterok": "a", "options": ["--mem", "4G"]},
+            },
+            "root",
+        )
+
+        self.assertEqual(flow["a"]["script"], "root/a.slurm")
+        self.assertEqual(flow["b"]["script"], "root/b/run.slurm")
+        self.assertEqual(flow["b"]["afterok"], ["a"])
+        self.assertEqual(flow["b"]["afterany"], [])
+        self.assertEqual(flow["b"]["options"], ["--mem", "4G"])
+
+        with self.assertRaises(ValueError):
+            slurm.workflow.normalize({"a": {"script": "a.slurm", "before": "b"}})
+
+    def test_levels(self):
+        flow = slurm.workflow.normalize(
+            {
+                "d": {"afterany": ["b", "c"]},
+                "c": {"afterok": "a"},
+                "b": {"afterok": "a"},
+                "a": {},
+            }
+        )
+
+        self.assertEqual(slurm.workflow.levels(flow), [["a"], ["c", "b"], ["d"]])
+
+        flow = slurm.workflow.normalize({"a": {"afterok": "b"}, "b": {"afterok": "a"}, "c": {}})
+
+        with self.assertRaises(ValueError):
+            slurm.workflow.levels(flow)
+
+        with self.assertRaises(ValueError):
+            slurm.workflow.levels(slurm.workflow.normalize({"a": {"afterok": "b"}}))
+
+    def test_dependency(self):
+        flow = slurm.workflow.normalize({"a": {}, "b": {}, "c": {"afterok": "a", "afterany": "b"}})
+        deps = slurm.workflow.dependencies(flow["c"], {"a": 1, "b": 2})
+
+        self.assertEqual(deps, [("afterok", 1), ("afterany", 2)])
+        self.assertEqual(slurm.workflow.dependency(deps), "afterok:1,afterany:2")
+        self.assertEqual(slurm.workflow.dependency([("afterok", 1), ("afterok", 2)]), "afterok:1:2")
+
+    def test_reduce(self):
+        barriers = []
+
+        def barrier(dependency):
+            barriers.append(dependency)
+            return 100 + len(barriers)
+
+        deps = [("afterok", i) for i in range(5)]
+        self.assertEqual(slurm.workflow.reduce(deps, 5, barrier), deps)
+        self.assertEqual(barriers, [])
+
+        ret = slurm.workflow.reduce(deps, 2, barrier)
+        self.assertEqual(ret, [("afterok", 104), ("afterok", 105)])
+        self.assertEqual(barriers[:3], ["afterok:0:1", "afterok:2:3", "afterok:4"])
+        self.assertEqual(barriers[3:], ["afterok:101:102", "afterok:103"])
+
+
+if __name__ == "__main__":
+    unittest.main()